@@ -101,6 +101,16 @@ void FormWindFLOAPIConnections(WindFLOAPI *inWindFLO);
 extern "C" {
 void Python_WindFLO_API(char* infile, char* outfile, int n, double velocities[],
 						double power[], double ratedPower[], double outputs[]);
+
+//	Sessions: the WindFLOAPI is kept between runs, only the turbine positions and
+//	orientations are changed (see release/session.cpp)
+void* Python_WindFLO_NewSession(char* infile);
+void Python_WindFLO_RunSession(void* session, char* outfile, int n, double positions[],
+						double orientations[], double velocities[], double power[],
+						double ratedPower[], double outputs[]);
+void Python_WindFLO_RunSessionBatch(void* session, int nLayouts, int n, double positions[],
+						double orientations[], double outputs[]);
+void Python_WindFLO_DeleteSession(void* session);
 }
 
 
@@ -4,7 +4,12 @@ from ctypes import *
 import numpy as np
 import f90nml
 import tempfile
+import weakref
+import threading
+import copy
+import contextlib
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib.pyplot as plt
 from matplotlib  import cm
@@ -13,11 +18,129 @@ import mpl_toolkits.mplot3d.art3d as art3d
 import matplotlib.ticker as ticker
 
 
+def FormatNamelistValue(value):
+
+	if isinstance(value, (bool, np.bool_)):
+		return '.true.' if value else '.false.'
+	if isinstance(value, (int, np.integer)):
+		return str(int(value))
+	if isinstance(value, (float, np.floating)):
+		return repr(float(value))
+	if isinstance(value, str):
+		return "'" + value.replace("'", "''") + "'"
+	return ', '.join([FormatNamelistValue(i) for i in value])
+
+
+def FormatNamelist(group, variables):
+
+	lines = ['&' + group]
+	for name, value in variables.items():
+		if value is None:
+			continue
+		value = value.tolist() if isinstance(value, np.ndarray) else value
+		if isinstance(value, list) and len(value) > 0 and isinstance(value[0], list):
+			for i in range(0, len(value)):
+				lines.append('    ' + name + '(:,' + str(i+1) + ') = ' + FormatNamelistValue(value[i]))
+		else:
+			lines.append('    ' + name + ' = ' + FormatNamelistValue(value))
+	lines.append('/\n')
+
+	return '\n'.join(lines)
+
+
+#	State of each loaded library: the WindFLO whose session is alive (there can only be one,
+#	as the parsed input is kept in global Fortran data), the terrain currently loaded and the
+#	lock taken by the WindFLO objects while they use the library
+libraryStates = {}
+
+#	The Fortran I/O units are global to libgfortran, which is shared by all the copies of the
+#	library, so the input and result files are read and written by one thread at a time
+ioLock = threading.Lock()
+
+
+class MemoryFile:
+
+	def __init__(self, name):
+
+		self.memfd = hasattr(os, 'memfd_create')
+		if self.memfd:
+			self.fd = os.memfd_create(name)
+			self.path = '/proc/self/fd/' + str(self.fd)
+		else:
+			self.fd, self.path = tempfile.mkstemp(suffix = '_' + name)
+
+	def write(self, text):
+
+		data = text.encode() if isinstance(text, str) else text
+		os.ftruncate(self.fd, len(data))
+		os.pwrite(self.fd, data, 0)
+
+	def close(self):
+
+		os.close(self.fd)
+		if not self.memfd:
+			os.remove(self.path)
+
+
+#	Each copy of the library has its own global (Fortran and C++) data, so the sessions of
+#	different copies are independent and can run at the same time in different threads.
+#	The memory file must stay open while the copy is loaded, as dlopen identifies the
+#	libraries already loaded by their path
+def LoadLibraryCopy(libFile):
+
+	libraryFile = MemoryFile(os.path.basename(libFile))
+	with open(libFile, 'rb') as f:
+		libraryFile.write(f.read())
+
+	return cdll.LoadLibrary(libraryFile.path), libraryFile
+
+
+#	Results of the turbines of a farm, as arrays of shape (nTurbines, k) over the buffers
+#	filled by the library (or parsed from a results file). Each TurbineData of the farm
+#	reads its velocity, power and rated power from its row of these arrays when accessed
+class TurbineResults:
+
+	def __init__(self, turbines, positions, velocities, power, ratedPower):
+
+		self.positions = positions
+		self.velocities = velocities
+		self.power = power
+		self.ratedPower = ratedPower
+
+		for index, turbine in enumerate(turbines):
+			turbine.results = self
+			turbine.index = index
+
+
+#	Attribute of TurbineData that is a view of the results of the farm, if the turbine has
+#	any, or a value of its own otherwise
+def ResultView(name):
+
+	def Get(self):
+		if self.results is None:
+			return self.__dict__['_'+name]
+		return getattr(self.results, name)[self.index]
+
+	def Set(self, value):
+		if self.results is None:
+			self.__dict__['_'+name] = value
+		else:
+			getattr(self.results, name)[self.index] = value
+
+	return property(Get, Set)
+
+
 class TurbineData:
 
+	velocity = ResultView('velocities')
+	power = ResultView('power')
+	ratedPower = ResultView('ratedPower')
+
 	def __init__(self, **kwargs):
 	
 		params = kwargs.get('params', np.zeros(30))	
+		self.results = None
+		self.index = 0
 		self.turbineNum = params[0]
 
 		self.position = np.zeros(3)
@@ -46,35 +169,30 @@ class TurbineData:
 		self.yaw = True
 		self.cpCurve = np.zeros((10,2))
 
-		self.variables = {'position': self.position, 'V': self.velocity, 'H': self.height, 'R': self.radius, \
+	@property
+	def variables(self):
+		return {'position': self.position, 'V': self.velocity, 'H': self.height, 'R': self.radius, \
 		'D': self.diameter, 'A': self.area, 'P_r': self.ratedPower, 'P': self.power}
 
+#	The variables are read when accessed, there is nothing to update
 	def UpdateDict(self):
-		self.variables = {'position': self.position, 'V': self.velocity, 'H': self.height, 'R': self.radius, \
-		'D': self.diameter, 'A': self.area, 'P_r': self.ratedPower, 'P': self.power}
+		pass
 
-	def WriteInputFile(self, filename):
+	def NamelistVariables(self):
 
+		return {'turbinenum': self.turbineNum, 'position': self.position.tolist(), \
+		'orientation': self.orientation.tolist(), 'yaw': self.yaw, 'fictitious': self.fictitious, \
+		'height': self.height, 'diameter': self.radius * 2.0, 'cpcurve': self.cpCurve.tolist(), \
+		'ratedpower': self.ratedPower}
 
-		tmpFile = tempfile.NamedTemporaryFile(mode = 'w+', delete = True)
-		try:
-			tmpFile.write('&turbine_data \n /')
-			tmpFile.seek(0)			
-			namelist = f90nml.read(tmpFile.name)			
-		finally:
-			tmpFile.close()
-						
-		namelist['turbine_data']['turbinenum'] = self.turbineNum
-		namelist['turbine_data']['position'] = self.position.tolist()
-		namelist['turbine_data']['orientation'] = self.orientation.tolist()
-		namelist['turbine_data']['yaw'] = self.yaw
-		namelist['turbine_data']['fictitious'] = self.fictitious
-		namelist['turbine_data']['height'] = self.height
-		namelist['turbine_data']['diameter'] = self.radius * 2.0
-		namelist['turbine_data']['cpcurve'] = self.cpCurve.tolist()		
-		namelist['turbine_data']['ratedpower'] = self.ratedPower
-		
+	def WriteInputFile(self, filename):
+
+		namelist = f90nml.Namelist({'turbine_data': self.NamelistVariables()})
 		namelist.write(filename, force=True)
+
+	def NamelistText(self):
+
+		return FormatNamelist('turbine_data', self.NamelistVariables())
 		
 		
 	def SetFromNamelist(self, filename):
@@ -156,18 +274,21 @@ class WindFLO:
 		self.turbines = []
 		for i in range(0, self.nTurbines):
 			self.turbines.append( TurbineData( **kwargs ) )
+		self.turbineResults = None
+
 
+		self.inMemory = kwargs.get('inMemory', False)
+		self.inputBuffers = []
+
+		self.private = kwargs.get('private', False)
+		self.session = kwargs.get('session', self.private)
+		self.sessionHandle = None
+		self.sessionKey = None
 
 		inputFile = kwargs.get('inputFile', '')
 		if inputFile == '':
-			tmpFile = tempfile.NamedTemporaryFile(mode = 'w+', delete = True)
-			try:
-				tmpFile.write('&windflo_data \n /')
-				tmpFile.seek(0)			
-				self.namelist = f90nml.read(tmpFile.name)			
-			finally:
-				tmpFile.close()
-		else:	
+			self.namelist = f90nml.Namelist({'windflo_data': {}})
+		else:
 			self.namelist = f90nml.read(inputFile)
 			self.SetFromNamelist(**kwargs)
 
@@ -177,20 +298,32 @@ class WindFLO:
 			self.ReadResultsFile(resFile)
 			
 
+		self.workers = []
+		self.libraryFile = None
+
 		libPath = kwargs.get('libDir', '')
 		if libPath != '':
-			self.libWindFLO = cdll.LoadLibrary('./'+libPath+'libWindFLO_LINUX.so')
+			self.libFile = './'+libPath+'libWindFLO_LINUX.so'
+			if self.private:
+				self.libWindFLO, self.libraryFile = LoadLibraryCopy(self.libFile)
+			else:
+				self.libWindFLO = cdll.LoadLibrary(self.libFile)
 
 		self.montecarlopts = kwargs.get('monteCarloPts', 1000)
 
 	def __del__(self):
 	
 		try:
-			self.libWindFLO.CleanAll_()
+			self.CloseInputBuffers()
+			self.cleanall()
+			if self.libraryFile is not None:
+				del libraryStates[self.libWindFLO._handle]
 			dlclose_func = CDLL(None).dlclose
 			dlclose_func.argtypes = [c_void_p]
 			dlclose_func.restype = c_int
 			dlclose_func(self.libWindFLO._handle)
+			if self.libraryFile is not None:
+				self.libraryFile.close()
 		except:
 			pass
 
@@ -299,49 +432,253 @@ class WindFLO:
 
 
 
+	def NamelistVariables(self, turbineFiles):
+
+		return {'rho': self.rho, 'modelvelocity': np.asarray(self.modelvelocity).tolist(), \
+		'windmodel': self.windmodel, 'gaussorder': self.gaussorder, 'montecarlopts': self.montecarlopts, \
+		'referenceheight': self.referenceheight, 'surfaceroughness': self.surfaceroughness, \
+		'turbulenceintensity': self.turbulenceintensity, 'wakemodel': self.wakemodel, \
+		'wakemergemodel': self.wakemergemodel, 'wakeexpansioncoeff': np.asarray(self.wakeexpansioncoeff).tolist(), \
+		'coe': self.coe, 'terrainmodel': self.terrainmodel, 'terrainfile': self.terrainfile, \
+		'poweridw': self.poweridw, 'rbfkernel': self.rbfkernel, 'shapefactor': self.shapefactor, \
+		'octreemaxpts': self.octreemaxpts, 'octreedepth': self.octreedepth, 'windrosefile': self.windrosefile, \
+		'turbinefiles': turbineFiles}
+
+
 	def WriteInputFile(self, **kwargs):
-	
-		runDir = kwargs.get('runDir', self.runDir)		
-	
-		self.namelist['windflo_data']['rho'] = self.rho
-		self.namelist['windflo_data']['modelvelocity'] = self.modelvelocity.tolist()
-		self.namelist['windflo_data']['windmodel'] = self.windmodel
-		self.namelist['windflo_data']['gaussorder'] = self.gaussorder
-		self.namelist['windflo_data']['montecarlopts'] = self.montecarlopts
-		self.namelist['windflo_data']['referenceheight'] = self.referenceheight
-		self.namelist['windflo_data']['surfaceroughness'] = self.surfaceroughness
-		self.namelist['windflo_data']['turbulenceintensity'] = self.turbulenceintensity
-		self.namelist['windflo_data']['wakemodel'] = self.wakemodel
-		self.namelist['windflo_data']['wakemergemodel'] = self.wakemergemodel
-		self.namelist['windflo_data']['wakeexpansioncoeff'] = self.wakeexpansioncoeff.tolist()
-		self.namelist['windflo_data']['coe'] = self.coe
-		self.namelist['windflo_data']['terrainmodel'] = self.terrainmodel
-		self.namelist['windflo_data']['terrainfile'] = self.terrainfile
-		self.namelist['windflo_data']['poweridw'] = self.poweridw
-		self.namelist['windflo_data']['rbfkernel'] = self.rbfkernel
-		self.namelist['windflo_data']['shapefactor'] = self.shapefactor
-		self.namelist['windflo_data']['octreemaxpts'] = self.octreemaxpts
-		self.namelist['windflo_data']['octreedepth'] = self.octreedepth
-		self.namelist['windflo_data']['windrosefile'] = self.windrosefile
 
-	
-		self.namelist['windflo_data']['turbinefiles'] = []
+		runDir = kwargs.get('runDir', self.runDir)
+
+		turbineFiles = []
 		for i in range(0, self.nTurbines):
-			self.namelist['windflo_data']['turbinefiles'].append( runDir +'turbine'+str(i+1)+'.inp' )
-			self.turbines[i].WriteInputFile( runDir + 'turbine'+str(i+1)+'.inp' )
+			turbineFiles.append( runDir +'turbine'+str(i+1)+'.inp' )
+			self.turbines[i].WriteInputFile( turbineFiles[i] )
+
+		for name, value in self.NamelistVariables(turbineFiles).items():
+			self.namelist['windflo_data'][name] = value
 
 		filename = kwargs.get('inFile', 'WindFLO.inp')
 		self.namelist.write(runDir + filename, force=True)
 
-		
+
+#	Same input as WriteInputFile, but kept in memory files (memfd) that are rewritten in
+#	place at each run, so nothing is created on or removed from the disk
+	def WriteInputBuffers(self, **kwargs):
+
+		if len(self.inputBuffers) != self.nTurbines + 1:
+			self.CloseInputBuffers()
+			self.inputBuffers = [MemoryFile('WindFLO.inp')]
+			for i in range(0, self.nTurbines):
+				self.inputBuffers.append( MemoryFile('turbine'+str(i+1)+'.inp') )
+
+		for i in range(0, self.nTurbines):
+			self.inputBuffers[i+1].write( self.turbines[i].NamelistText() )
+
+		variables = dict(self.namelist['windflo_data'])
+		variables.update(self.NamelistVariables([i.path for i in self.inputBuffers[1:]]))
+		variables['terrainfile'] = kwargs.get('terrainFile', self.terrainfile)
+		self.inputBuffers[0].write( FormatNamelist('windflo_data', variables) )
+
+		return self.inputBuffers[0].path
+
+
+	def CloseInputBuffers(self):
+
+		for inputBuffer in self.inputBuffers:
+			inputBuffer.close()
+		self.inputBuffers = []
+
+
+#	Input of the analysis copied to the workers of runBatch
+	inputVariables = ['runDir', 'rho', 'turbulenceintensity', 'windmodel', 'modelvelocity', 'surfaceroughness', \
+	'referenceheight', 'wakemodel', 'wakemergemodel', 'wakeexpansioncoeff', 'gaussorder', 'montecarlopts', \
+	'coe', 'terrainmodel', 'poweridw', 'rbfkernel', 'shapefactor', 'octreemaxpts', 'octreedepth', \
+	'terrainfile', 'windrosefile', 'nTurbines', 'namelist']
+
+	def CopyInput(self, windFLO):
+
+		for name in self.inputVariables:
+			setattr(self, name, copy.deepcopy(getattr(windFLO, name)))
+		self.turbines = copy.deepcopy(windFLO.turbines)
 
 
+	def NewWorker(self):
+
+		worker = WindFLO(private = True)
+		worker.libFile = self.libFile
+		worker.libWindFLO, worker.libraryFile = LoadLibraryCopy(self.libFile)
+		return worker
+
+
+	def LibraryState(self):
+
+		handle = self.libWindFLO._handle
+		if handle not in libraryStates:
+			libraryStates.setdefault(handle, {'session': None, 'terrain': None, 'lock': threading.RLock()})
+		return libraryStates[handle]
+
+
+	def TerrainKey(self):
+
+		if self.terrainfile == '':
+			return None
+		return (os.path.abspath(self.terrainfile), self.terrainmodel, self.poweridw, self.rbfkernel, \
+		self.shapefactor, self.octreemaxpts, self.octreedepth)
+
+
+#	Everything in the input of a session but the positions and orientations of the turbines
+	def SessionKey(self):
+
+		variables = dict(self.namelist['windflo_data'])
+		variables.update(self.NamelistVariables([]))
+		turbines = []
+		for i in range(0, self.nTurbines):
+			turbineVariables = self.turbines[i].NamelistVariables()
+			del turbineVariables['position'], turbineVariables['orientation']
+			turbines.append(turbineVariables)
+
+		return repr((variables, turbines))
+
+
+#	A session keeps a WindFLOAPI alive in the library, so the input (turbine types, wind
+#	rose, parameters) is parsed once and each run only changes the turbine positions.
+#	The terrain model (and its octree) stays loaded until CleanAll_, so it is not read
+#	again when the session is rebuilt with the same terrain (e.g. for other monteCarloPts)
+	def StartSession(self):
+
+		self.ReleaseLibrary()
+
+		state = self.LibraryState()
+		terrainKey = self.TerrainKey()
+		if terrainKey is not None and terrainKey == state['terrain']:
+			inFile = self.WriteInputBuffers(terrainFile = '')
+		else:
+			inFile = self.WriteInputBuffers()
+
+		self.libWindFLO.Python_WindFLO_NewSession.argtypes = [POINTER(c_char)]
+		self.libWindFLO.Python_WindFLO_NewSession.restype = c_void_p
+
+		CinFile = np.asarray(inFile + '\0', dtype = c_char).ctypes.data_as(POINTER(c_char))
+		with ioLock:
+			self.sessionHandle = self.libWindFLO.Python_WindFLO_NewSession(CinFile)
+		self.sessionKey = self.SessionKey()
+
+		state['session'] = weakref.ref(self)
+		if terrainKey is not None:
+			state['terrain'] = terrainKey
+
+
+	def EndSession(self):
+
+		if self.sessionHandle is not None:
+			self.libWindFLO.Python_WindFLO_DeleteSession.argtypes = [c_void_p]
+			self.libWindFLO.Python_WindFLO_DeleteSession(self.sessionHandle)
+			self.sessionHandle = None
+			self.sessionKey = None
+			self.LibraryState()['session'] = None
+
+
+#	Ends the session alive in the library, if any (of this or of another WindFLO object)
+	def ReleaseLibrary(self):
+
+		owner = self.LibraryState()['session']
+		if owner is not None and owner() is not None:
+			owner().EndSession()
+
+
+#	Evaluates the layouts (array of shape (nLayouts, nTurbines, 2), or 3 with the z coordinate)
+#	with the session of this WindFLO, in one call to the library. With nThreads > 1 the batch
+#	is split among this WindFLO and nThreads - 1 workers, each with its own copy of the
+#	library where the terrain is loaded once. Returns the farm power, AEP and efficiency of
+#	each layout
+	def runBatch(self, layouts, **kwargs):
+
+		self.ParseKwargsForAnalysisParams(**kwargs)
+
+		layouts = np.asarray(layouts, dtype = c_double)
+		nLayouts = layouts.shape[0]
+		nThreads = max(1, min(kwargs.get('nThreads', 1), nLayouts))
+
+		while len(self.workers) < nThreads - 1:
+			self.workers.append( self.NewWorker() )
+		windFLOs = [self] + self.workers[:nThreads-1]
+		for worker in windFLOs[1:]:
+			worker.CopyInput(self)
+
+		chunks = np.array_split(np.arange(nLayouts), nThreads)
+		if nThreads == 1:
+			outputs = self.RunSessionBatch(layouts)
+		else:
+			with ThreadPoolExecutor(max_workers = nThreads) as executor:
+				outputs = np.concatenate(list(executor.map(lambda windFLO, chunk: windFLO.RunSessionBatch(layouts[chunk]), \
+														   windFLOs, chunks)))
+
+		return outputs[:,1], outputs[:,0], outputs[:,2]
+
+
+	def RunSessionBatch(self, layouts):
+
+		with self.LibraryState()['lock']:
+			return self.RunSessionBatchLocked(layouts)
+
+
+	def RunSessionBatchLocked(self, layouts):
+
+		if self.sessionHandle is None or self.SessionKey() != self.sessionKey:
+			self.StartSession()
+
+		nLayouts = layouts.shape[0]
+		positions = np.empty((nLayouts, self.nTurbines, 3), dtype = c_double)
+		positions[:,:,:layouts.shape[2]] = layouts
+		if layouts.shape[2] == 2:
+			positions[:,:,2] = [i.position[2] for i in self.turbines]
+		Cpositions = positions.ctypes.data_as(POINTER(c_double))
+
+		orientations = np.array([i.orientation for i in self.turbines], dtype = c_double)
+		Corientations = orientations.ctypes.data_as(POINTER(c_double))
+
+		outputs = np.zeros((nLayouts, 5), dtype = c_double)
+		Coutputs = outputs.ctypes.data_as(POINTER(c_double))
+
+		self.libWindFLO.Python_WindFLO_RunSessionBatch.argtypes = [c_void_p,	# session
+																   (c_int) ,			# nlayouts
+																   (c_int) ,			# nturbines
+																   POINTER(c_double),	# positions
+																   POINTER(c_double),	# orientations
+																   POINTER(c_double)]	# outputs
+
+		self.libWindFLO.Python_WindFLO_RunSessionBatch(self.sessionHandle, c_int(nLayouts), c_int(self.nTurbines), \
+													   Cpositions, Corientations, Coutputs)
+
+		return outputs
+
+
+#	The WindFLO objects sharing a library run one at a time, while the private ones (each with
+#	its own copy of the library) run in parallel from different threads, as ctypes releases
+#	the GIL during the calls
 	def run(self,**kwargs):
+
+		with self.LibraryState()['lock']:
+			self.RunLocked(**kwargs)
+
+
+	def RunLocked(self,**kwargs):
 		self.ParseKwargsForAnalysisParams(**kwargs)
-		
-		self.runDir = kwargs.get('runDir', self.runDir)			
-		self.WriteInputFile(**kwargs)
-			
+
+		self.runDir = kwargs.get('runDir', self.runDir)
+		session = kwargs.get('session', self.session)
+		inMemory = kwargs.get('inMemory', self.inMemory) or session
+		if session:
+			if self.sessionHandle is None or self.SessionKey() != self.sessionKey:
+				self.StartSession()
+		elif inMemory:
+			self.ReleaseLibrary()
+			inFile = self.WriteInputBuffers()
+		else:
+			self.ReleaseLibrary()
+			self.WriteInputFile(**kwargs)
+			inFile = self.runDir + kwargs.get('inFile', 'WindFLO.inp')
+
 		self.libWindFLO.Python_WindFLO_API.argtypes = [POINTER(c_char),		# infilename
 												 	  POINTER(c_char),		# infilename
 												  	  (c_int) ,				# nturbines
@@ -352,14 +689,11 @@ class WindFLO:
 		
 		
 		
-		inFile = self.runDir + kwargs.get('inFile', 'WindFLO.inp')
-		CinFile = np.asarray(inFile + '\0', dtype = c_char).ctypes.data_as(POINTER(c_char))
-
 		resFile = self.runDir + kwargs.get('resFile', '')
 		CoutFile = np.asarray(resFile + '\0', dtype = c_char).ctypes.data_as(POINTER(c_char))
 
 		
-		velocities = np.zeros(self.nTurbines*3, dtype = c_double)
+		velocities = np.zeros((self.nTurbines, 3), dtype = c_double)
 		Cvelocities = velocities.ctypes.data_as(POINTER(c_double))
 		
 		power = np.zeros(self.nTurbines, dtype = c_double)		
@@ -372,7 +706,32 @@ class WindFLO:
 		outputs = np.zeros(100, dtype = c_double)				
 		Coutputs = outputs.ctypes.data_as(POINTER(c_double))
 
-		self.libWindFLO.Python_WindFLO_API(CinFile, CoutFile, c_int(self.nTurbines), Cvelocities, Cpower,Cratedpower, Coutputs)
+		positions = np.array([i.position for i in self.turbines], dtype = c_double).reshape(self.nTurbines, 3)
+		Cpositions = positions.ctypes.data_as(POINTER(c_double))
+
+		if session:
+			self.libWindFLO.Python_WindFLO_RunSession.argtypes = [c_void_p,	# session
+																  POINTER(c_char),		# outfilename
+																  (c_int) ,				# nturbines
+																  POINTER(c_double),	# positions
+																  POINTER(c_double),	# orientations
+																  POINTER(c_double),	# velocities
+																  POINTER(c_double),	# power
+																  POINTER(c_double),	# rated power
+																  POINTER(c_double)]	# outputs
+
+			orientations = np.array([i.orientation for i in self.turbines], dtype = c_double)
+			Corientations = orientations.ctypes.data_as(POINTER(c_double))
+
+			with ioLock if kwargs.get('resFile', '') != '' else contextlib.nullcontext():
+				self.libWindFLO.Python_WindFLO_RunSession(self.sessionHandle, CoutFile, c_int(self.nTurbines), Cpositions, Corientations, \
+														  Cvelocities, Cpower, Cratedpower, Coutputs)
+		else:
+			CinFile = np.asarray(inFile + '\0', dtype = c_char).ctypes.data_as(POINTER(c_char))
+			with ioLock:
+				self.libWindFLO.Python_WindFLO_API(CinFile, CoutFile, c_int(self.nTurbines), Cvelocities, Cpower,Cratedpower, Coutputs)
+			if self.TerrainKey() is not None:
+				self.LibraryState()['terrain'] = self.TerrainKey()
 
 		self.AEP = outputs[0]
 		self.farmPower = outputs[1]
@@ -384,90 +743,57 @@ class WindFLO:
 		self.normalizedAEP = self.AEP / (self.totalRatedPower * 365.0 * 24.0)
 		
 		self.UpdateDict()
+
+		self.turbineResults = TurbineResults(self.turbines, positions, velocities, power, ratedpower)
 		
-		clean = kwargs.get('clean', True)		
-		k = 0
-		for i in range(0, self.nTurbines):
-			for j in range(0, 3):
-				self.turbines[i].velocity[j] = velocities[k]
-				k = k + 1
-			self.turbines[i].power = power[i]
-			self.turbines[i].ratedPower = ratedpower[i]
-			self.turbines[i].UpdateDict()			
-			if clean:			
+		clean = kwargs.get('clean', True) and not inMemory
+		if clean:
+			for i in range(0, self.nTurbines):
 				os.remove(self.namelist['windflo_data']['turbinefiles'][i])
-		if clean:		
 			os.remove(inFile)
 
 			
 	def clean(self):
-		self.libWindFLO.Clean_()
+		with self.LibraryState()['lock']:
+			self.ReleaseLibrary()
+			self.libWindFLO.Clean_()
 	def cleanall(self):
-		self.libWindFLO.CleanAll_()
+		with self.LibraryState()['lock']:
+			self.ReleaseLibrary()
+			self.libWindFLO.CleanAll_()
+			self.LibraryState()['terrain'] = None
 	
 
 	def ReadResultsFile(self, inFile):
 	
-		f = open(inFile,'r')
-		line = f.readline()
+		with open(inFile,'r') as f:
+			lines = [line.strip() for line in f]
 		
 		
 		# Get the farm performance
-		for i in range(0,6):
-			line = f.readline()
-
-			varName = line.split('=')[0].strip()
-			varVal = float(line.split('=')[1])
-
-			if(varName == 'nTurbines'):
-				self.nTurbines = int(varVal)
-			if(varName == 'AEP'):
-				self.AEP = varVal
-			if(varName == 'Power'):
-				self.farmPower = varVal
-			if(varName == 'Efficiency'):
-				self.farmEfficiency = varVal
-			if(varName == 'Cost'):
-				self.farmCost = varVal
-			if(varName == 'Land Used'):
-				self.landUsed = varVal
-
-
-		# Get turbines in farm
-		line = f.readline()
-		line = f.readline()
-		self.turbines = []
-		for i in range(0, self.nTurbines):
-			line = f.readline()
-			
-			if(line.strip() == '$ConvexHull'):
-				break
-			
-			turbineParams = [float(i) for i in line.split(',')]
-			self.turbines.append( TurbineData( params = turbineParams ) )
+		farm = dict((line.split('=')[0].strip(), float(line.split('=')[1])) for line in lines[1:7])
+		self.nTurbines = int(farm['nTurbines'])
+		self.AEP = farm['AEP']
+		self.farmPower = farm['Power']
+		self.farmEfficiency = farm['Efficiency']
+		self.farmCost = farm['Cost']
+		self.landUsed = farm['Land Used']
+
+
+		# Get turbines in farm (the table may end before nTurbines rows)
+		hullStart = lines.index('$ConvexHull')
+		table = np.loadtxt(lines[9:min(9 + self.nTurbines, hullStart)], delimiter = ',', ndmin = 2)
+		self.turbines = [TurbineData( params = params ) for params in table]
+		self.turbineResults = TurbineResults(self.turbines, table[:,1:4], table[:,7:10], table[:,14], table[:,13])
 		
 		# Get convex hull params		
-		line = f.readline()
-		line = f.readline()
-
-		self.convexHull = np.zeros((self.nTurbines,2))
-		j = 0
-		for i in range(0,self.nTurbines):
-			line = f.readline()
-			if(line.strip() == '$End'):
-				break
-		
-			points = line.split(',')
-			self.convexHull[j,0] = points[1]
-			self.convexHull[j,1] = points[2]
-			j = j + 1
-	
-		self.convexHull.resize((j,2))
+		hullEnd = lines.index('$End')
+		hullLines = lines[hullStart+2:min(hullStart + 2 + self.nTurbines, hullEnd)]
+		self.convexHull = np.loadtxt(hullLines, delimiter = ',', usecols = (1, 2), ndmin = 2).reshape(-1, 2)
 		
 		
-		ratedPower = np.array([i.ratedPower for i in self.turbines])
-		self.totalRatedPower = np.sum(ratedPower)
-		self.farmPower = np.sum(np.array([i.power for i in self.turbines]))
+		self.totalRatedPower = np.sum(self.turbineResults.ratedPower)
+		self.farmPower = np.sum(self.turbineResults.power)
 		self.farmEfficiency = self.farmPower / self.totalRatedPower
 		self.normalizedAEP = self.AEP / (self.totalRatedPower * 365.0 * 24.0)
 
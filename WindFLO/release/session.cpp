@@ -0,0 +1,94 @@
+/*
+
+	Sessions of the Python API: a WindFLOAPI object is created once from an input
+	file and then used for many runs, changing only the positions and orientations
+	of the turbines, as in Examples/Example2.
+
+*/
+
+
+#include <vector>
+#include <string>
+#include <cstring>
+
+#include "API.hpp"
+
+
+
+extern "C" {
+
+
+void* Python_WindFLO_NewSession(char* infile){
+
+	return new WindFLOAPI(std::string(infile));
+}
+
+
+void Python_WindFLO_RunSession(void* session, char* outfile, int n, double positions[],
+						double orientations[], double velocities[], double power[],
+						double ratedPower[], double outputs[]){
+
+	WindFLOAPI *windFLO = (WindFLOAPI*) session;
+
+	for(int i = 0; i < n; i++){
+		for(int j = 0; j < 3; j++){
+			(*windFLO->turbines[i].position)[j] = positions[3*i+j];
+			(*windFLO->turbines[i].orientation)[j] = orientations[3*i+j];
+		}
+	}
+
+	windFLO->run();
+
+	if(std::strlen(outfile) > 0)
+		windFLO->write(std::string(outfile));
+
+	for(int i = 0; i < n; i++){
+		for(int j = 0; j < 3; j++){
+			velocities[3*i+j] = (*windFLO->turbines[i].velocity)[j];
+		}
+		power[i] = *windFLO->turbines[i].power;
+		ratedPower[i] = *windFLO->turbines[i].ratedPower;
+	}
+
+	outputs[0] = *windFLO->AEP;
+	outputs[1] = *windFLO->farmPower;
+	outputs[2] = *windFLO->farmEfficiency;
+	outputs[3] = *windFLO->farmCost;
+	outputs[4] = *windFLO->landUsed;
+}
+
+
+//	Runs nLayouts layouts (positions[nLayouts][n][3]) in one call, the farm outputs of
+//	each layout are stored in outputs[nLayouts][5]
+void Python_WindFLO_RunSessionBatch(void* session, int nLayouts, int n, double positions[],
+						double orientations[], double outputs[]){
+
+	WindFLOAPI *windFLO = (WindFLOAPI*) session;
+
+	for(int k = 0; k < nLayouts; k++){
+
+		for(int i = 0; i < n; i++){
+			for(int j = 0; j < 3; j++){
+				(*windFLO->turbines[i].position)[j] = positions[3*(k*n+i)+j];
+				(*windFLO->turbines[i].orientation)[j] = orientations[3*i+j];
+			}
+		}
+
+		windFLO->run();
+
+		outputs[5*k] = *windFLO->AEP;
+		outputs[5*k+1] = *windFLO->farmPower;
+		outputs[5*k+2] = *windFLO->farmEfficiency;
+		outputs[5*k+3] = *windFLO->farmCost;
+		outputs[5*k+4] = *windFLO->landUsed;
+	}
+}
+
+
+void Python_WindFLO_DeleteSession(void* session){
+
+	delete (WindFLOAPI*) session;
+}
+
+
+}
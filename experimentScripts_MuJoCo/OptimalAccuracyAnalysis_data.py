@@ -84,6 +84,11 @@ def learn(ctxt=None, gymEnvName=None, action_space=None, max_episode_length=None
     n_episodes = 0 # Counter that indicates which episode we are in.
     n_generations=0 # Counter that indicates which generation we are in.
 
+    # Per-seed history of the accuracies and variances stored in df (avoids rebuilding df every generation).
+    global list_accuracies,list_variances
+    list_accuracies=[]
+    list_variances=[]
+
     # Definition of parameters for the CMA-ES algorithm.
     global popsize,batch_size_ep,total_generations
     popsize= 20 # Population size in CMA-ES.
@@ -406,6 +411,8 @@ def rollout(self):
         best_policy=list_gen_policies[list_gen_policies_rewards.index(max(list_gen_policies_rewards))]
         reward=evaluate_policy_test(best_policy,test_env,test_n_eval_episodes)
         df.append([global_heuristic_param,seed,n_generations,reward,optimal_acc,np.var(list_gen_policies_rewards),heuristic_accepted,n_steps_proc,n_steps_acc,n_steps_proc+n_steps_acc])
+        list_accuracies.append(optimal_acc)
+        list_variances.append(np.var(list_gen_policies_rewards))
         
     return self.collect_episode()
 
@@ -457,10 +464,6 @@ def train(self, trainer):
             if global_heuristic=='I' and (n_steps_proc+n_steps_acc)-last_time_heuristic_accepted>=heuristic_freq: 
                 obtain_population()
             elif global_heuristic=='II':
-                df_seed=pd.DataFrame(df)
-                df_seed=df_seed[df_seed[1]==seed]
-                list_variances=list(df_seed[5])
-
                 # Calculate the confidence interval.
                 variance_q05=np.mean(list_variances[(-1-global_heuristic_param[0]):-1])-2*np.std(list_variances[(-1-global_heuristic_param[0]):-1])
                 variance_q95=np.mean(list_variances[(-1-global_heuristic_param[0]):-1])+2*np.std(list_variances[(-1-global_heuristic_param[0]):-1])
@@ -480,9 +483,7 @@ def train(self, trainer):
             optimal_acc=execute_heuristic(n_generations,optimal_acc,df_policy_train_bisection_info,[],[],global_heuristic,global_heuristic_param)
             stop_heuristic=False
         else:
-            df_seed=pd.DataFrame(df)
-            df_seed=df_seed[df_seed[1]==seed]
-            optimal_acc=execute_heuristic(n_generations,optimal_acc,df_policy_train_bisection_info,list(df_seed[4]),list(df_seed[5]),global_heuristic,global_heuristic_param)
+            optimal_acc=execute_heuristic(n_generations,optimal_acc,df_policy_train_bisection_info,list_accuracies,list_variances,global_heuristic,global_heuristic_param)
         
         train_env = GymEnv(gymEnvName, max_episode_length=int(max_episode_length*optimal_acc))
         train_env._env.unwrapped.model.opt.timestep=default_frametime/optimal_acc
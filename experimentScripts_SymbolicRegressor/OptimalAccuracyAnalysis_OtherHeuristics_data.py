@@ -21,6 +21,8 @@ import pandas as pd
 from tqdm import tqdm
 import scipy as sc
 import random
+import sqlite3
+import time as tm
 
 # For modifications made to borrowed code..
 import itertools
@@ -235,11 +237,9 @@ def generation_score_list(list_surfaces,df_pts,
     # Evaluate each surface that forms the generation with the indicated accuracy.
     for expr_surf in list_surfaces:
 
-        # Calculate the value of the third coordinates with the selected surface.
-        y_pred=expr_surf.execute(X)
-
-        # Calculate score associated to the set of points for the selected surface.
-        score=mean_abs_err(y, y_pred)
+        # Calculate score associated to the set of points for the selected surface (served from the 
+        # replay store if it has already been calculated in a previous execution).
+        score=replayed_score('mae',expr_surf,len(y),lambda: mean_abs_err(y, expr_surf.execute(X)))
 
         # Add score to the list.
         list_scores.append(score)
@@ -259,6 +259,62 @@ def generation_score_list(list_surfaces,df_pts,
     else:
         return list_scores
 
+#--------------------------------------------------------------------------------------------------
+# Functions to replay the evaluations made in previous executions.
+#--------------------------------------------------------------------------------------------------
+def open_replay_store(path):
+    '''
+    Load in memory the evaluations (surface, number of points, score and time) recorded in the replay store. The 
+    executions of all the heuristics share this store, so that the scores of the surfaces that appear again with the 
+    same number of points are not calculated again. The budget counters are not affected (the evaluations are counted 
+    in the same way), so the results are the same as without the store.
+    '''
+    global replay_path,replay_evaluations,new_replay_evaluations
+    replay_path=path
+    replay_evaluations={}
+    new_replay_evaluations=[]
+    connection=sqlite3.connect(replay_path,timeout=60)
+    connection.execute('CREATE TABLE IF NOT EXISTS evaluations (surface TEXT, n_pts INTEGER, score REAL, time REAL, PRIMARY KEY (surface, n_pts))')
+    for surface,n_pts,score,eval_time in connection.execute('SELECT surface, n_pts, score, time FROM evaluations'):
+        replay_evaluations[(surface,n_pts)]=(score,eval_time)
+    connection.close()
+
+def flush_replay_store():
+    '''Write in the replay store the evaluations recorded since the last call.'''
+    global new_replay_evaluations
+    if len(new_replay_evaluations)>0:
+        connection=sqlite3.connect(replay_path,timeout=60)
+        with connection:
+            connection.executemany('INSERT OR IGNORE INTO evaluations VALUES (?, ?, ?, ?)',new_replay_evaluations)
+        connection.close()
+        new_replay_evaluations=[]
+
+def replayed_score(metric,program,n_pts,compute_score):
+    '''
+    Return the score of a surface evaluated on the first `n_pts` points of the training set.
+
+    Parameters
+    ==========
+    metric: Identifier of the way in which the score is calculated ('mae' or 'raw_fitness').
+    program: Surface (gplearn program).
+    n_pts: Number of points on which the surface is evaluated.
+    compute_score: Function without arguments that calculates the score if it is not in the replay store.
+    '''
+    if replay_evaluations is None:
+        return compute_score()
+
+    # The surface is identified by its nodes (the constants with all their decimals).
+    surface=metric+repr([node.name if isinstance(node,_Function) else node for node in program.program])
+    if (surface,n_pts) in replay_evaluations:
+        return replay_evaluations[(surface,n_pts)][0]
+
+    t=tm.time()
+    score=compute_score()
+    eval_time=tm.time()-t
+    replay_evaluations[(surface,n_pts)]=(score,eval_time)
+    new_replay_evaluations.append((surface,n_pts,float(score),eval_time))
+    return score
+
 #--------------------------------------------------------------------------------------------------
 # Functions associated with the bisection method for test heuristics 
 #--------------------------------------------------------------------------------------------------
@@ -1263,10 +1319,17 @@ def execute_heuristic(heuristic,heuristic_param,train_seed,gen,population,init_a
 #==================================================================================================
 def new_raw_fitness(self, X, y, sample_weight):
     '''This function replaces the existing raw_fitness function.'''
-    y_pred = self.execute(X)
-    if self.transformer:
-        y_pred = self.transformer(y_pred)
-    raw_fitness = self.metric(y, y_pred, sample_weight)
+    def compute_raw_fitness():
+        y_pred = self.execute(X)
+        if self.transformer:
+            y_pred = self.transformer(y_pred)
+        return self.metric(y, y_pred, sample_weight)
+
+    # MODIFICATION: serve the score from the replay store (only when all the points have the same weight).
+    if sample_weight is None or np.all(sample_weight==1):
+        raw_fitness = replayed_score('raw_fitness',self,X.shape[0],compute_raw_fitness)
+    else:
+        raw_fitness = compute_raw_fitness()
     
     # MODIFICATION: Add the number of evaluations performed (as many as the number of points in the training set).
     if count_evaluations:
@@ -1751,6 +1814,9 @@ BaseSymbolic.fit=new_fit
 # Original surface.
 expr_surf_real='x**2-y**2+y-1'
 
+# Replay store (it is opened in each process of the parallel execution).
+replay_evaluations=None
+
 # List of train seeds.
 list_train_seeds=range(1,101,1)
 
@@ -1779,9 +1845,13 @@ def parallel_processing(arg):
     # Initial accuracy.
     init_acc=1/default_train_n_pts# The one corresponding to a set formed by a single point.
 
+    # Replay store shared by all heuristics.
+    open_replay_store('results/data/SymbolicRegressor/OptimalAccuracyAnalysis_OtherHeuristics/replay_evaluations.db')
+
     # Fill in database.
     for train_seed in tqdm(list_train_seeds):
         learn(init_acc,train_seed,df_test_pts,heuristic,param)     
+        flush_replay_store()
 
     # Save constructed database.
     df_train=pd.DataFrame(df_train,columns=['heuristic_param','train_seed','threshold','variance','acc','n_gen','score','elapsed_time','time_gen','n_eval_proc','n_eval_acc','n_eval'])
@@ -48,6 +48,11 @@ from gplearn.genetic import BaseSymbolic
 import multiprocessing as mp
 from itertools import combinations
 import os
+import sys
+
+# For the results store.
+sys.path.append('library_OPTECOT')
+from results_store import ResultsStore
 
 #==================================================================================================
 # NEW FUNCTIONS
@@ -1032,37 +1037,20 @@ pool.map(parallel_processing,list_arg)
 pool.close()
 
 # Group databases.
-def concat_same_heuristic_df(list_arg):
-    heuristic_param_dict={}
-    for arg in list_arg:
-        heuristic=arg[0]
-        parameter=arg[1]
-        if heuristic not in heuristic_param_dict:
-            heuristic_param_dict[heuristic]=[parameter]
-        else:
-            heuristic_param_dict[heuristic].append(parameter)
-
-    dict_keys=list(heuristic_param_dict.keys())
-
-    for key in dict_keys:
-        list_param=heuristic_param_dict[key]
-        first=True
-        for param in list_param:
-
-            if first:
-                df=pd.read_csv('results/data/SymbolicRegressor/OptimalAccuracyAnalysis/df_train_OptimalAccuracy_heuristic'+str(key)+'_param'+str(param)+'.csv', index_col=0)
-                os.remove('results/data/SymbolicRegressor/OptimalAccuracyAnalysis/df_train_OptimalAccuracy_heuristic'+str(key)+'_param'+str(param)+'.csv')
-                first=False
-            else:
-                df_new=pd.read_csv('results/data/SymbolicRegressor/OptimalAccuracyAnalysis/df_train_OptimalAccuracy_heuristic'+str(key)+'_param'+str(param)+'.csv', index_col=0)
-                os.remove('results/data/SymbolicRegressor/OptimalAccuracyAnalysis/df_train_OptimalAccuracy_heuristic'+str(key)+'_param'+str(param)+'.csv')
-                df=pd.concat([df,df_new],ignore_index=True)
-
-
-        df.to_csv('results/data/SymbolicRegressor/OptimalAccuracyAnalysis/df_train_OptimalAccuracy_heuristic'+str(key)+'.csv')
-
-
-concat_same_heuristic_df(list_arg)
+def append_same_heuristic_df(list_arg):
+    '''
+    Append the database of each heuristic and parameter to the results store (results/store), in the partition of the heuristic. 
+    The databases already appended are skipped, and the files of the parameters are neither deleted nor rewritten.
+    '''
+    store=ResultsStore('results/store')
+    for heuristic,param in list_arg:
+        df_stored=store.read(columns=['heuristic_param'],filters=[('heuristic_param','==',str(param))],problem='SymbolicRegressor',experiment='OptimalAccuracyAnalysis',heuristic=heuristic)
+        if len(df_stored)==0:
+            df=pd.read_csv('results/data/SymbolicRegressor/OptimalAccuracyAnalysis/df_train_OptimalAccuracy_heuristic'+str(heuristic)+'_param'+str(param)+'.csv', index_col=0)
+            df['heuristic_param']=df['heuristic_param'].astype(str)
+            store.append(df,'SymbolicRegressor','OptimalAccuracyAnalysis',heuristic=heuristic,seed_column='train_seed')
+
+append_same_heuristic_df(list_arg)
 
 
 
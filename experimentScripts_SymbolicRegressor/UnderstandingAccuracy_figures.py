@@ -20,7 +20,10 @@ import seaborn as sns
 import matplotlib.cm as cm
 from matplotlib.colors import ListedColormap
 import scipy as sc
-from itertools import combinations
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'../library_OPTECOT'))
+from ranking import rank,sort_by_reference,kendall
 
 #==================================================================================================
 # FUNCTIONS
@@ -44,40 +47,9 @@ def bootstrap_mean_and_confidence_interval(data,bootstrap_iterations=1000):
         mean_list.append(np.mean(sample))
     return np.mean(data),np.quantile(mean_list, 0.05),np.quantile(mean_list, 0.95)
 
-def from_argsort_to_ranking(list):
-    '''Obtain ranking from a list get after applying "np.argsort" on an original list.'''
-    new_list=[0]*len(list)
-    i=0
-    for j in list:
-        new_list[j]=i
-        i+=1
-    return new_list
-
-def custom_sort(list,argsort):
-    '''Sort list according to the order for each position defined in argsort.'''
-    new_list=[]
-    for index in argsort:
-        new_list.append(list[index])
-    return new_list
-
 def inverse_normalized_tau_kendall(x,y):
     '''Calculation of the normalized inverse tau kendall distance between two rankings.'''
-    # Number of pairs with reverse order.
-    pairs_reverse_order=0
-    for i in range(len(x)):
-        for j in range(i+1,len(x)):
-            case1 = x[i] < x[j] and y[i] > y[j]
-            case2 = x[i] > x[j] and y[i] < y[j]
-
-            if case1 or case2:
-                pairs_reverse_order+=1  
-    
-    # Number of total pairs.
-    total_pairs=len(list(combinations(x,2)))
-    # Normalized tau kendall distance.
-    tau_kendall=pairs_reverse_order/total_pairs
-
-    return 1-tau_kendall
+    return (1+kendall(y,x))/2
 
 def remove_element_in_idx(list_elements,list_idx):
     '''Delete items at certain positions in a list.'''
@@ -144,27 +116,8 @@ def from_data_to_figures(df):
     #----------------------------------------------------------------------------------------------
     ax=plt.subplot(223)
     
-    def ranking_matrix_sorted_by_max_acc(ranking_matrix):
-        '''Reorder ranking matrix according to the order established by the original ranking.'''
-
-        # Indexes associated with the maximum accuracy ranking ordered from lowest to highest.
-        argsort_max_acc=np.argsort(ranking_matrix[-1])
-
-        # Reorder matrix rows.
-        sorted_ranking_list=[]
-        for i in range(len(ranking_list)):
-            sorted_ranking_list.append(custom_sort(ranking_list[i],argsort_max_acc))
-
-        return sorted_ranking_list
-
-    ranking_list=[]
-
-    for accuracy in list_acc:
-        df_acc=df[df['accuracy']==accuracy]
-        ranking=from_argsort_to_ranking(list(df_acc['score'].argsort()))
-        ranking_list.append(ranking)
-    
-    ranking_matrix=np.matrix(ranking_matrix_sorted_by_max_acc(ranking_list))
+    ranking_list=rank(np.array([df[df['accuracy']==accuracy]['score'].to_numpy() for accuracy in list_acc])).tolist()
+    ranking_matrix=np.matrix(sort_by_reference(ranking_list,ranking_list[-1]))
 
     color = sns.cubehelix_palette(start=2, rot=0, dark=0, light=.95, reverse=True, as_cmap=True)
     color=cm.get_cmap(color)
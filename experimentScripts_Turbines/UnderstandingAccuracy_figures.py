@@ -13,7 +13,10 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 from mpl_toolkits.axes_grid1.inset_locator import zoomed_inset_axes,mark_inset
-from itertools import combinations
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'../library_OPTECOT'))
+from ranking import rank,sort_by_reference,kendall
 import matplotlib.cm as cm
 from matplotlib.colors import ListedColormap
 
@@ -76,41 +79,9 @@ def form_str_col_to_float_list_col(str_col,type_elems):
 
     return float_list_col
 
-def from_argsort_to_ranking(list):
-    '''Obtain ranking from a list get after applying "np.argsort" on an original list.'''
-    new_list=[0]*len(list)
-    i=0
-    for j in list:
-        new_list[j]=i
-        i+=1
-    return new_list
-
-def custom_sort(list,argsort):
-    '''Sort list according to the order for each position defined in argsort.'''
-    new_list=[]
-    for index in argsort:
-        new_list.append(list[index])
-    return new_list
-
 def inverse_normalized_tau_kendall(x,y):
     '''Calculation of the normalized inverse tau kendall distance between two rankings.'''
-
-    # Number of pairs with reverse order.
-    pairs_reverse_order=0
-    for i in range(len(x)):
-        for j in range(i+1,len(x)):
-            case1 = x[i] < x[j] and y[i] > y[j]
-            case2 = x[i] > x[j] and y[i] < y[j]
-
-            if case1 or case2:
-                pairs_reverse_order+=1  
-    
-    # Total number of pairs.
-    total_pairs=len(list(combinations(x,2)))
-    # Normalized tau Kendall distance.
-    tau_kendall=pairs_reverse_order/total_pairs
-
-    return 1-tau_kendall
+    return (1+kendall(y,x))/2
 
 def remove_element_in_idx(list_elements,list_idx):
     '''Delete items at certain positions in a list.'''
@@ -372,39 +343,15 @@ def from_data_to_figures_bladenumber(df,blade_number):
     # GRAPH 2: loss of quality in the evaluations when considering minor accuracys and existence
     # of a minor accuracy with which maximum quality is obtained
     #----------------------------------------------------------------------------------------------
-    def ranking_matrix_sorted_by_max_acc(ranking_matrix):
-        '''Reorder ranking matrix according to the order established by the original ranking.'''
-
-        # Indexes associated with the maximum accuracy ranking ordered from lowest to highest.
-        argsort_max_acc=np.argsort(ranking_matrix[-1])
-
-        # Reorder matrix rows.
-        sorted_ranking_list=[]
-        for i in range(len(ranking_list)):
-            sorted_ranking_list.append(custom_sort(ranking_list[i],argsort_max_acc))
-
-        return sorted_ranking_list
-
     def absolute_distance_matrix_between_rankings(ranking_matrix):
-        abs_dist_matrix=[]
-        for i in range(len(ranking_matrix)):
-            abs_dist_matrix.append(np.abs(list(np.array(ranking_matrix[i])-np.array(ranking_matrix[-1]))))
-
-        max_value=max(max(i) for i in abs_dist_matrix)
-        norm_abs_dist_matrix=list(np.array(abs_dist_matrix)/max_value)
-        
-        return norm_abs_dist_matrix
+        '''Calculate matrix of normalized absolute distances between the positions of the rankings and the original ranking (the last one).'''
+        abs_dist_matrix=np.abs(ranking_matrix-ranking_matrix[-1])
+        return abs_dist_matrix/np.max(abs_dist_matrix)
 
     ax=subfigs[3].subplots()
 
-    ranking_list=[]
-
-    for accuracy in list_acc:
-        df_acc=df[df['accuracy']==accuracy]
-        ranking=from_argsort_to_ranking(list(df_acc['score'].argsort()))
-        ranking_list.append(ranking)
-
-    ranking_matrix=np.matrix(absolute_distance_matrix_between_rankings(ranking_matrix_sorted_by_max_acc(ranking_list)))
+    ranking_matrix=rank(np.array([df[df['accuracy']==accuracy]['score'].to_numpy() for accuracy in list_acc]))
+    ranking_matrix=np.matrix(absolute_distance_matrix_between_rankings(sort_by_reference(ranking_matrix,ranking_matrix[-1])))
     color = sns.cubehelix_palette(start=2, rot=0, dark=0, light=.95, reverse=False, as_cmap=True)
 
     ax = sns.heatmap(ranking_matrix, cmap=color,linewidths=.5, linecolor='lightgray')
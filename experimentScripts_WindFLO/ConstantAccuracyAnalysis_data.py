@@ -28,7 +28,7 @@ from WindFLO import WindFLO
 # FUNCTIONS
 #==================================================================================================
 
-def get_windFLO_with_accuracy(momentary_folder='',accuracy=1):
+def get_windFLO_with_accuracy(accuracy=1):
     '''Initialize the characteristics of the terrain and turbines on which the optimization will be applied.'''
 
     # Configuration and parameters.
@@ -37,10 +37,10 @@ def get_windFLO_with_accuracy(momentary_folder='',accuracy=1):
     libDir = 'WindFLO/release/', # Path to the shared library libWindFLO.so.
     turbineFile = 'WindFLO/Examples/Example1/V90-3MW.dat',# Turbine parameters.
     terrainfile = 'WindFLO/Examples/Example1/terrain.dat', # File associated with the terrain.
-    runDir=momentary_folder,
     nTurbines = 25, # Number of turbines.
 
-    monteCarloPts = round(1000*accuracy)# Parameter whose accuracy will be modified.
+    monteCarloPts = round(1000*accuracy),# Parameter whose accuracy will be modified.
+    private = True # Own copy of the library, kept loaded with the terrain and the turbines between evaluations.
     )
 
     # Change the default terrain model from RBF to IDW.
@@ -48,8 +48,8 @@ def get_windFLO_with_accuracy(momentary_folder='',accuracy=1):
 
     return windFLO
 
-def EvaluateFarm(x, windFLO):
-    '''Evaluating the performance of a single solution.'''
+def EvaluateFarm(x, windFLO, accuracy=None):
+    '''Evaluating the performance of a single solution (with the accuracy of windFLO or with the given one).'''
 
     k = 0
     for i in range(0, windFLO.nTurbines):
@@ -58,8 +58,11 @@ def EvaluateFarm(x, windFLO):
             windFLO.turbines[i].position[j] = x[k]
             k = k + 1
 
-    # Run WindFLO analysis.
-    windFLO.run(clean = True) 
+    # Run WindFLO analysis (a new accuracy only rebuilds the session, the terrain stays loaded).
+    if accuracy is None:
+        windFLO.run(clean = True)
+    else:
+        windFLO.run(clean = True, monteCarloPts = round(1000*accuracy))
 
     return -windFLO.farmPower
 
@@ -70,10 +73,7 @@ def learn(seed, accuracy,maxfeval=500,popsize=50):
     max_n_eval=maxfeval 
 
     # Initialize the terrain and the turbines to be placed on it.
-    folder_name='File'+str(accuracy)
-    os.makedirs(folder_name)
-    windFLO = get_windFLO_with_accuracy(momentary_folder=folder_name+'/',accuracy=accuracy)
-    default_windFLO= get_windFLO_with_accuracy(momentary_folder=folder_name+'/')
+    windFLO = get_windFLO_with_accuracy(accuracy=accuracy)
     
     # Function to transform the scaled value of the parameters into the real values.
     def transform_to_problem_dim(list_coord):
@@ -92,7 +92,7 @@ def learn(seed, accuracy,maxfeval=500,popsize=50):
 
     # Apply CMA-ES algorithm for solution search.
     np.random.seed(seed)
-    es = cma.CMAEvolutionStrategy(np.random.random(default_windFLO.nTurbines*2), 0.33, inopts={'bounds': [0, 1],'seed':seed,'maxiter':1e9, 'maxfevals':maxfeval, 'popsize':popsize})
+    es = cma.CMAEvolutionStrategy(np.random.random(windFLO.nTurbines*2), 0.33, inopts={'bounds': [0, 1],'seed':seed,'maxiter':1e9, 'maxfevals':maxfeval, 'popsize':popsize})
     
     while not es.stop():
 
@@ -107,7 +107,7 @@ def learn(seed, accuracy,maxfeval=500,popsize=50):
         for sol in real_solutions:
 
             t=time.time()
-            fitness=EvaluateFarm(sol,windFLO)
+            fitness=EvaluateFarm(sol,windFLO,accuracy)
             eval_time+=time.time()-t
 
             list_scores.append(fitness)
@@ -117,12 +117,10 @@ def learn(seed, accuracy,maxfeval=500,popsize=50):
         es.tell(solutions, list_scores)
 
         # Accumulate data of interest.
-        score = EvaluateFarm(transform_to_problem_dim(es.result.xbest),default_windFLO)
+        score = EvaluateFarm(transform_to_problem_dim(es.result.xbest),windFLO,1)
         df_acc.append([accuracy,seed,n_gen,-score,eval_time])
 
         n_gen+=1
-  
-    os.rmdir(folder_name)
 
     if accuracy==1:
         return eval_time
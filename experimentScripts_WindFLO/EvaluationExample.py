@@ -33,7 +33,8 @@ def get_windFLO_with_accuracy(accuracy=1):
     terrainfile = 'WindFLO/Examples/Example1/terrain.dat', # File associated with the terrain.
     nTurbines = 25, # Number of turbines.
 
-    monteCarloPts = round(1000*accuracy)# Parameter whose accuracy will be modified.
+    monteCarloPts = round(1000*accuracy),# Parameter whose accuracy will be modified.
+    session = True # Keep the terrain and the turbines loaded in the library between evaluations.
     )
 
     # Change the default terrain model from RBF to IDW.
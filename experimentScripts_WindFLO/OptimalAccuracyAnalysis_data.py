@@ -30,6 +30,9 @@ import multiprocessing as mp
 sys.path.append('WindFLO/API')
 from WindFLO import WindFLO
 
+sys.path.append('library_OPTECOT')
+from results_store import ResultsStore
+
 #==================================================================================================
 # FUNCTIONC
 #==================================================================================================
@@ -69,14 +72,11 @@ def generation_score_list(population,accuracy,count_time_acc=True,count_time_gen
     '''
     global time_acc,time_proc
 
-    # Generate an environment with indicated accuracy.
-    windFLO=get_windFLO_with_accuracy(momentary_folder=folder_name+'/',accuracy=accuracy)
-
-    # Evaluate population.
+    # Evaluate population (with the WindFLO of the execution set to the indicated accuracy).
     list_scores=[]
     for sol in population:
         t=time.time()
-        score=EvaluateFarm(sol,windFLO)
+        score=EvaluateFarm(sol,windFLO,accuracy)
         elapsed_time=time.time()-t
         if count_time_acc and not count_time_gen:
             time_acc+=elapsed_time
@@ -278,7 +278,7 @@ def execute_heuristic(gen,acc,population,train_seed,list_accuracies,list_varianc
 # Functions for the search of the optimal solution.
 #--------------------------------------------------------------------------------------------------
 
-def get_windFLO_with_accuracy(momentary_folder='',accuracy=1):
+def get_windFLO_with_accuracy(accuracy=1):
     '''Initialize the characteristics of the terrain and turbines on which the optimization will be applied.'''
 
     # Configuration and parameters.
@@ -287,10 +287,10 @@ def get_windFLO_with_accuracy(momentary_folder='',accuracy=1):
     libDir = 'WindFLO/release/', # Path to the shared library libWindFLO.so.
     turbineFile = 'WindFLO/Examples/Example1/V90-3MW.dat',# Turbine parameters.
     terrainfile = 'WindFLO/Examples/Example1/terrain.dat', # File associated with the terrain.
-    runDir=momentary_folder,
     nTurbines = 25, #  Number of turbines.
 
-    monteCarloPts = round(1000*accuracy)# Parameter whose accuracy will be modified.
+    monteCarloPts = round(1000*accuracy),# Parameter whose accuracy will be modified.
+    private = True # Own copy of the library, kept loaded with the terrain and the turbines between evaluations.
     )
 
     # Change the default terrain model from RBF to IDW.
@@ -298,8 +298,8 @@ def get_windFLO_with_accuracy(momentary_folder='',accuracy=1):
 
     return windFLO
 
-def EvaluateFarm(x, windFLO):
-    '''Evaluating the performance of a single solution.'''
+def EvaluateFarm(x, windFLO, accuracy=None):
+    '''Evaluating the performance of a single solution (with the accuracy of windFLO or with the given one).'''
     
     k = 0
     for i in range(0, windFLO.nTurbines):
@@ -308,22 +308,21 @@ def EvaluateFarm(x, windFLO):
             windFLO.turbines[i].position[j] = x[k]
             k = k + 1
 
-    # Run WindFLO analysis.
-    windFLO.run(clean = True) 
+    # Run WindFLO analysis (a new accuracy only rebuilds the session, the terrain stays loaded).
+    if accuracy is None:
+        windFLO.run(clean = True)
+    else:
+        windFLO.run(clean = True, monteCarloPts = round(1000*accuracy))
 
     return -windFLO.farmPower
 
 def learn(seed,heuristic,heuristic_param,maxfeval=500,popsize=50): 
     '''Finding the optimal solution using the CMA-ES algorithm.'''
     global heuristic_accepted, stop_heuristic
-    global folder_name
-
-    # Directory where the auxiliary files that are created during the execution will be stored.
-    folder_name='File_'+str(heuristic)
-    os.makedirs(folder_name)
+    global windFLO
 
     # Initialize the terrain and the turbines to be placed on it.
-    default_windFLO = get_windFLO_with_accuracy(momentary_folder=folder_name+'/')
+    windFLO = get_windFLO_with_accuracy()
 
     # Maximum execution time.
     global max_time
@@ -331,8 +330,8 @@ def learn(seed,heuristic,heuristic_param,maxfeval=500,popsize=50):
     
     # Function to transform the scaled value of the parameters into the real values.
     def transform_to_problem_dim(list_coord):
-        lbound = np.zeros(default_windFLO.nTurbines*2) # Real lower limit.
-        ubound = np.ones(default_windFLO.nTurbines*2)*2000 # Real upper limit.
+        lbound = np.zeros(windFLO.nTurbines*2) # Real lower limit.
+        ubound = np.ones(windFLO.nTurbines*2)*2000 # Real upper limit.
         return lbound + list_coord*(ubound - lbound)
 
     # Initialize time counters.
@@ -344,10 +343,12 @@ def learn(seed,heuristic,heuristic_param,maxfeval=500,popsize=50):
     gen=0
     accuracy=1
     stop_heuristic=False
+    list_accuracies=[] # Accuracies used so far in this seed (column 'accuracy' of df).
+    list_variances=[] # Variances of the scores obtained so far in this seed (column 'variance' of df).
 
     # Apply CMA-ES algorithm for solution search.
     np.random.seed(seed)
-    es = cma.CMAEvolutionStrategy(np.random.random(default_windFLO.nTurbines*2), 0.33, inopts={'bounds': [0, 1],'seed':seed,'maxiter':1e9, 'maxfevals':maxfeval, 'popsize':popsize})
+    es = cma.CMAEvolutionStrategy(np.random.random(windFLO.nTurbines*2), 0.33, inopts={'bounds': [0, 1],'seed':seed,'maxiter':1e9, 'maxfevals':maxfeval, 'popsize':popsize})
     
     while time_proc+time_acc<max_time:
 
@@ -362,20 +363,19 @@ def learn(seed,heuristic,heuristic_param,maxfeval=500,popsize=50):
             accuracy,list_scores=execute_heuristic(gen,accuracy,real_solutions,seed,[],[],heuristic,heuristic_param)
 
         else:
-            df_seed=pd.DataFrame(df)
-            df_seed=df_seed[df_seed[1]==seed]
-            accuracy,list_scores=execute_heuristic(gen,accuracy,real_solutions,seed,list(df_seed[4]),list(df_seed[5]),heuristic,heuristic_param)
+            accuracy,list_scores=execute_heuristic(gen,accuracy,real_solutions,seed,list_accuracies,list_variances,heuristic,heuristic_param)
 
         # To build the next generation.
         es.tell(solutions,list_scores)
 
         # Accumulate data of interest.
-        score = EvaluateFarm(transform_to_problem_dim(es.result.xbest),default_windFLO)
+        score = EvaluateFarm(transform_to_problem_dim(es.result.xbest),windFLO,1)
         df.append([heuristic_param,seed,gen,-score,accuracy,np.var(list_scores),heuristic_accepted,time_proc,time_acc,time_acc+time_proc])
+        list_accuracies.append(accuracy)
+        list_variances.append(np.var(list_scores))
 
         gen+=1
 
-    os.rmdir(folder_name)
 
 #==================================================================================================
 # MAIN PROGRAM
@@ -404,32 +404,17 @@ list_arg=[['I',0.8],['I',0.95],['II',[5,3]],['II',[10,3]]]
 # os.remove(os.path.sep.join(sys.path[0].split(os.path.sep)[:-1])+'/terrain.dat')
 
 # Join databases associated with the same heuristics considering different parameters.
-def concat_same_heuristic_df(list_arg):
-    heuristic_param_dict={}
-    for arg in list_arg:
-        heuristic=arg[0]
-        parameter=arg[1]
-        if heuristic not in heuristic_param_dict:
-            heuristic_param_dict[heuristic]=[parameter]
-        else:
-            heuristic_param_dict[heuristic].append(parameter)
-
-    dict_keys=list(heuristic_param_dict.keys())
-
-    for key in dict_keys:
-        list_param=heuristic_param_dict[key]
-        first=True
-        for param in list_param:
-            
-            if first:
-                df=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_OptimalAccuracyAnalysis_h'+str(key)+'_param'+str(param)+'.csv', index_col=0)
-                os.remove('results/data/WindFLO/OptimalAccuracyAnalysis/df_OptimalAccuracyAnalysis_h'+str(key)+'_param'+str(param)+'.csv')
-                first=False
-            else:
-                df_new=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_OptimalAccuracyAnalysis_h'+str(key)+'_param'+str(param)+'.csv', index_col=0)
-                os.remove('results/data/WindFLO/OptimalAccuracyAnalysis/df_OptimalAccuracyAnalysis_h'+str(key)+'_param'+str(param)+'.csv')
-                df=pd.concat([df,df_new],ignore_index=True)
-
-        df.to_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_h'+str(key)+'.csv')
-
-concat_same_heuristic_df([['I',0.8],['I',0.95],['II','[5, 3]'],['II','[10, 3]']])
+def append_same_heuristic_df(list_arg):
+    '''
+    Append the database of each heuristic and parameter to the results store (results/store), in the partition of the heuristic. 
+    The databases already appended are skipped, and the files of the parameters are neither deleted nor rewritten.
+    '''
+    store=ResultsStore('results/store')
+    for heuristic,param in list_arg:
+        df_stored=store.read(columns=['heuristic_param'],filters=[('heuristic_param','==',str(param))],problem='WindFLO',experiment='OptimalAccuracyAnalysis',heuristic=heuristic)
+        if len(df_stored)==0:
+            df=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_OptimalAccuracyAnalysis_h'+str(heuristic)+'_param'+str(param)+'.csv', index_col=0)
+            df['heuristic_param']=df['heuristic_param'].astype(str)
+            store.append(df,'WindFLO','OptimalAccuracyAnalysis',heuristic=heuristic)
+
+append_same_heuristic_df([['I',0.8],['I',0.95],['II','[5, 3]'],['II','[10, 3]']])
@@ -16,11 +16,27 @@ import random
 import pandas as pd
 from mpl_toolkits.axes_grid1.inset_locator import zoomed_inset_axes,mark_inset
 import plotly.express as px
+import sys
+sys.path.append('library_OPTECOT')
+from results_store import ResultsStore
 
 #==================================================================================================
 # FUNCTIONS
 #==================================================================================================
 
+def read_heuristic_df(heuristic,param=None):
+    '''
+    Read the database of a heuristic (only the rows of the parameter `param`, if it is given) from the results store (results/store), 
+    or from the joined database of the heuristic if its partition of the store is empty.
+    '''
+    if len(store.files(problem='WindFLO',experiment='OptimalAccuracyAnalysis',heuristic=heuristic))>0:
+        filters=None if param is None else [('heuristic_param','==',str(param))]
+        return store.read(filters=filters,sort_by=['seed','n_gen'],problem='WindFLO',experiment='OptimalAccuracyAnalysis',heuristic=heuristic)
+
+    df=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_h'+str(heuristic)+'.csv', index_col=0)
+    df['heuristic_param']=df['heuristic_param'].astype(str)
+    return df if param is None else df[df['heuristic_param']==str(param)]
+
 def bootstrap_mean_and_confidence_interval(data,bootstrap_iterations=1000):
     '''
     The 95% confidence interval of a given data sample is calculated.
@@ -116,7 +132,7 @@ def draw_and_save_figures_per_heuristic(heuristic):
     ax=plt.subplot(132)
 
     # Reading of databases to be used.
-    df_optimal_acc=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_h'+str(heuristic)+'.csv', index_col=0) # Accuracy ascendente.
+    df_optimal_acc=read_heuristic_df(heuristic)
 
     # Initialize number of curves.
     curve=0
@@ -217,8 +233,8 @@ def draw_comparative_figure(heuristic_param_list):
     for heuristic_param in heuristic_param_list:
         heuristic=heuristic_param[0]
         param=heuristic_param[1]
-        df=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_h'+str(heuristic)+'.csv', index_col=0)
-        all_mean,all_q05,all_q95,list_train_time=train_data_to_figure_data(df[df['heuristic_param']==param],'elapsed_time')
+        df=read_heuristic_df(heuristic,param)
+        all_mean,all_q05,all_q95,list_train_time=train_data_to_figure_data(df,'elapsed_time')
         ax.fill_between(list_train_time,all_q05,all_q95, alpha=.5, linewidth=0,color=colors[curve])
         plt.plot(list_train_time, all_mean, linewidth=2,label='Optimal h'+str(heuristic)+' ('+str(param)+')',color=colors[curve])
         curve+=1
@@ -240,8 +256,8 @@ def draw_comparative_figure(heuristic_param_list):
     for heuristic_param in heuristic_param_list:
         heuristic=heuristic_param[0]
         param=heuristic_param[1]
-        df=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_h'+str(heuristic)+'.csv', index_col=0)
-        draw_accuracy_behaviour(df[df['heuristic_param']==param],'elapsed_time',curve)
+        df=read_heuristic_df(heuristic,param)
+        draw_accuracy_behaviour(df,'elapsed_time',curve)
         curve+=1
     ax.set_xlabel("Train time")
     ax.set_ylabel("Accuracy value")
@@ -259,8 +275,9 @@ colors=px.colors.qualitative.D3
 
 # Define training times to be drawn.
 df_max_acc=pd.read_csv('results/data/WindFLO/ConstantAccuracyAnalysis/df_ConstantAccuracyAnalysis1.0.csv', index_col=0)
-df_hI=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_hI.csv', index_col=0)
-df_hII=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_hII.csv', index_col=0)
+store=ResultsStore('results/store')
+df_hI=read_heuristic_df('I')
+df_hII=read_heuristic_df('II')
 min_time_acc_max=max(df_max_acc.groupby('seed')['elapsed_time'].min())
 min_time_hI=max(df_hI.groupby('seed')['elapsed_time'].min())
 min_time_hII=max(df_hII.groupby('seed')['elapsed_time'].min())
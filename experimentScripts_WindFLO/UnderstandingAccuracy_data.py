@@ -31,7 +31,7 @@ from WindFLO import WindFLO
 # FUNCTIONS
 #==================================================================================================
 
-def get_windFLO_with_accuracy(momentary_folder='',accuracy=1):
+def get_windFLO_with_accuracy(accuracy=1):
     '''Initialize the characteristics of the terrain and turbines on which the optimization will be applied.'''
 
     # Configuration and parameters.
@@ -40,10 +40,10 @@ def get_windFLO_with_accuracy(momentary_folder='',accuracy=1):
     libDir = 'WindFLO/release/', # Path to the shared library libWindFLO.so.
     turbineFile = 'WindFLO/Examples/Example1/V90-3MW.dat',# Turbine parameters.
     terrainfile = 'WindFLO/Examples/Example1/terrain.dat', # File associated with the terrain.
-    runDir=momentary_folder,
     nTurbines = 25, # Number of turbines.
 
-    monteCarloPts = round(1000*accuracy)# Parameter whose accuracy will be modified.
+    monteCarloPts = round(1000*accuracy),# Parameter whose accuracy will be modified.
+    private = True # Own copy of the library, kept loaded with the terrain and the turbines between evaluations.
     )
 
     # Change the default terrain model from RBF to IDW.
@@ -88,13 +88,8 @@ def EvaluateFarm(x, windFLO):
 def evaluate_solution_set(solution_set,accuracy):
     '''Evaluate a set of solutions given the accuracy of the monteCarloPts parameter.'''
 
-    # Create auxiliary folder to save in each parallel execution its own auxiliary files, so that 
-    # they are not mixed with those of the other executions.
-    folder_name='File'+str(accuracy)
-    os.makedirs(folder_name)
-
     # Generate an environment with indicated accuracy.
-    windFLO = get_windFLO_with_accuracy(momentary_folder=folder_name+'/',accuracy=accuracy)
+    windFLO = get_windFLO_with_accuracy(accuracy=accuracy)
 
     # Evaluate solutions and save relevant information.
     for i in tqdm(range(len(solution_set))):
@@ -106,9 +101,6 @@ def evaluate_solution_set(solution_set,accuracy):
         # save information.
         df.append([accuracy,i+1,score,elapsed])
 
-    # Delete auxiliary folder.
-    os.rmdir(folder_name)
-
 #==================================================================================================
 # MAIN PROGRAM
 #==================================================================================================
@@ -15,19 +15,14 @@ import matplotlib.colors as mcolors
 import matplotlib.markers as markers
 import random
 import pandas as pd
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'../library_OPTECOT'))
+from bootstrap import bootstrap_mean_and_confidence_interval
 
 #==================================================================================================
 # FUNCTIONS
 #==================================================================================================
-
-def bootstrap_mean_and_confidence_interval(data,bootstrap_iterations=1000):
-    '''The 95% confidence interval of a given data sample is calculated.'''
-    mean_list=[]
-    for i in range(bootstrap_iterations):
-        sample = np.random.choice(data, len(data), replace=True) 
-        mean_list.append(np.mean(sample))
-    return np.mean(data),np.quantile(mean_list, 0.05),np.quantile(mean_list, 0.95)
-
 def train_data_to_figure_data(df_train_acc,list_train_steps):
     '''
     The database associated with a parameter value is summarized to the data needed to construct 
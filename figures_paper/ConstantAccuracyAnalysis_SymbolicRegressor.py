@@ -16,19 +16,14 @@ import random
 import pandas as pd
 from mpl_toolkits.axes_grid1.inset_locator import zoomed_inset_axes,mark_inset
 import plotly.express as px
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'../library_OPTECOT'))
+from bootstrap import bootstrap_mean_and_confidence_interval as bootstrap_mean_and_confiance_interval
 
 #==================================================================================================
 # FUNCTIONS
 #==================================================================================================
-
-def bootstrap_mean_and_confiance_interval(data,bootstrap_iterations=1000):
-    '''The 95% confidence interval of a given data sample is calculated.'''
-    mean_list=[]
-    for i in range(bootstrap_iterations):
-        sample = np.random.choice(data, len(data), replace=True) 
-        mean_list.append(np.mean(sample))
-    return np.mean(data),np.quantile(mean_list, 0.05),np.quantile(mean_list, 0.95)
-
 def train_data_to_figure_data(df_train_acc,list_train_n_eval):
     '''
     The database associated with a parameter value is summarized to the data needed to construct 
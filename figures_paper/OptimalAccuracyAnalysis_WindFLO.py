@@ -17,19 +17,15 @@ import pandas as pd
 from mpl_toolkits.axes_grid1.inset_locator import zoomed_inset_axes,mark_inset
 import plotly.express as px
 from matplotlib.patches import Rectangle
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'../library_OPTECOT'))
+from bootstrap import bootstrap_mean_and_confidence_interval
+from results_store import ResultsStore
 
 #==================================================================================================
 # FUNCTIONS
 #==================================================================================================
-
-def bootstrap_mean_and_confidence_interval(data,bootstrap_iterations=1000):
-    '''The 95% confidence interval of a given data sample is calculated.'''
-    mean_list=[]
-    for i in range(bootstrap_iterations):
-        sample = np.random.choice(data, len(data), replace=True) 
-        mean_list.append(np.mean(sample))
-    return np.mean(data),np.quantile(mean_list, 0.05),np.quantile(mean_list, 0.95)
-
 def train_data_to_figure_data(df_train,type_eval):
     '''
     The database associated with the heuristic execution information is summarized to the data
@@ -258,7 +254,11 @@ list_markers = ["o", "^", "s", "P", "v", 'D', "x", "1", "|", "+"]
 
 # Define training times to be drawn.
 df_max_acc=pd.read_csv('results/data/WindFLO/ConstantAccuracyAnalysis/df_ConstantAccuracyAnalysis1.0.csv', index_col=0)
-df_optimal_acc=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_hII.csv', index_col=0)
+store=ResultsStore('results/store')
+if len(store.files(problem='WindFLO',experiment='OptimalAccuracyAnalysis',heuristic='II'))>0:
+    df_optimal_acc=store.read(filters=[('heuristic_param','==','[5, 3]')],sort_by=['seed','n_gen'],problem='WindFLO',experiment='OptimalAccuracyAnalysis',heuristic='II')
+else:
+    df_optimal_acc=pd.read_csv('results/data/WindFLO/OptimalAccuracyAnalysis/df_train_OptimalAccuracyAnalysis_hII.csv', index_col=0)
 min_time_acc_max=max(df_max_acc.groupby('seed')['elapsed_time'].min())
 min_time_hII=max(df_optimal_acc.groupby('seed')['elapsed_time'].min())
 max_time_acc_max=min(df_max_acc.groupby('seed')['elapsed_time'].max())
@@ -20,35 +20,15 @@ import seaborn as sns
 import matplotlib.cm as cm
 from matplotlib.colors import ListedColormap
 import scipy as sc
-from itertools import combinations
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'../library_OPTECOT'))
+from ranking import rank,sort_by_reference
+from bootstrap import bootstrap_mean_and_confidence_interval
 
 #==================================================================================================
 # FUNCTIONS
 #==================================================================================================
-def bootstrap_mean_and_confidence_interval(data,bootstrap_iterations=1000):
-    '''The 95% confidence interval of a given data sample is calculated.'''
-    mean_list=[]
-    for i in range(bootstrap_iterations):
-        sample = np.random.choice(data, len(data), replace=True) 
-        mean_list.append(np.mean(sample))
-    return np.mean(data),np.quantile(mean_list, 0.05),np.quantile(mean_list, 0.95)
-
-def from_argsort_to_ranking(list):
-    '''Obtain ranking from a list get after applying "np.argsort" on an original list.'''
-    new_list=[0]*len(list)
-    i=0
-    for j in list:
-        new_list[j]=i
-        i+=1
-    return new_list
-
-def custom_sort(list,argsort):
-    '''Sort list according to the order for each position defined in argsort.'''
-    new_list=[]
-    for index in argsort:
-        new_list.append(list[index])
-    return new_list
-
 def from_data_to_figures_paper(df):
     '''Construct the desired graphs from the database.'''
 
@@ -133,38 +113,13 @@ def from_data_to_figures_paper(df):
     #----------------------------------------------------------------------------------------------
     ax=plt.subplot(2,2,(3,4))
 
-    def ranking_matrix_sorted_by_max_acc(ranking_matrix):
-        '''Reorder ranking matrix according to the order established by the original ranking.'''
-
-        # Indexes associated with the maximum accuracy ranking ordered from lowest to highest.
-        argsort_max_acc=np.argsort(ranking_matrix[-1])
-
-        # Reorder matrix rows.
-        sorted_ranking_list=[]
-        for i in range(len(ranking_list)):
-            sorted_ranking_list.append(custom_sort(ranking_list[i],argsort_max_acc))
-
-        return sorted_ranking_list
-
     def absolute_distance_matrix_between_rankings(ranking_matrix):
-        '''Calculate matrix of normalized absolute distances between the positions of the rankings.'''
-        abs_dist_matrix=[]
-        for i in range(len(ranking_matrix)):
-            abs_dist_matrix.append(np.abs(list(np.array(ranking_matrix[i])-np.array(ranking_matrix[-1]))))
-
-        max_value=max(max(i) for i in abs_dist_matrix)
-        norm_abs_dist_matrix=list(np.array(abs_dist_matrix)/max_value)
-        
-        return norm_abs_dist_matrix
-
-    ranking_list=[]
-
-    for accuracy in list_acc:
-        df_acc=df[df['accuracy']==accuracy]
-        ranking=from_argsort_to_ranking(list(df_acc['reward'].argsort()))
-        ranking_list.append(ranking)
+        '''Calculate matrix of normalized absolute distances between the positions of the rankings and the original ranking (the last one).'''
+        abs_dist_matrix=np.abs(ranking_matrix-ranking_matrix[-1])
+        return abs_dist_matrix/np.max(abs_dist_matrix)
 
-    ranking_matrix=np.matrix(absolute_distance_matrix_between_rankings(ranking_matrix_sorted_by_max_acc(ranking_list)))
+    ranking_matrix=rank(np.array([df[df['accuracy']==accuracy]['reward'].to_numpy() for accuracy in list_acc]))
+    ranking_matrix=np.matrix(absolute_distance_matrix_between_rankings(sort_by_reference(ranking_matrix,ranking_matrix[-1])))
     color = sns.cubehelix_palette(start=2, rot=0, dark=0, light=.95, reverse=False, as_cmap=True)
 
     ax = sns.heatmap(ranking_matrix, cmap=color,linewidths=.5, linecolor='lightgray')
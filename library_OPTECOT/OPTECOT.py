@@ -11,7 +11,7 @@ optimization problem. In these problems, the cost of the objective function is s
 
 Content
 -------
-The library is formed by three classes:
+The library is formed by the following classes:
 
 `OPTECOT`: This is the main class. It brings together the methods that implements the OPTECOT 
 heuristic for mono-objective problems. Theoretically, the heuristic is designed to be applied on any
@@ -23,7 +23,28 @@ using the original objective function versus the use of approximate objective fu
 cost or tracked by OPTECOT. In addition, before proceeding to the execution of the optimization algorithm, 
 it is possible to construct a graph that allows assessing the possible effectiveness of the application
 of OPTECOT to solve the optimization problem.\n
-`AuxiliaryFunctions`: This class defines the auxiliary static methods to be used in the other classes. 
+`AuxiliaryFunctions`: This class defines the auxiliary static methods to be used in the other classes. \n
+`PopulationEvaluator`: This class defines the backends (serial, thread pool or process pool) used to evaluate 
+a set of solutions, returning the scores and the time per evaluation directly to the main process.\n
+`ObjectiveCache`: This class defines an optional bounded cache (with LRU eviction) of the scores of the objective 
+function, indexed by the solution and the value of the parameter theta.\n
+`ReplayStore`: This class defines a persistent store of the evaluations (solution, theta, score and time) made during 
+an execution, from which later executions are served instead of evaluating the objective function again.\n
+`CalibrationCache`: This class defines a persistent cache of the calibration (the time per evaluation of each accuracy, 
+|S|, t^{period} and the interruption threshold), indexed by a fingerprint of the definition of the problem.\n
+`RunHistory`: This class defines the append-only history of the data stored per generation, keeping for each seed 
+the last optimal accuracies and variances that OPTECOT needs to readjust the accuracy.\n
+`BisectionSearch`: This class defines the state of the bisection method on the interval of times per evaluation, so that 
+the midpoints can be evaluated sequentially or asynchronously.\n
+`BracketSearch`: This class defines the state of the bracketing search warm-started from the previous optimal accuracy, 
+with the same interface as `BisectionSearch`.
+
+The rankings and their correlations are computed with the functions of the module `ranking`, and the confidence intervals of 
+the graphs with the bootstrap engine of the module `bootstrap` (both located in the same directory), which work on whole 
+matrices of data at once. The databases of the executions can be saved in the columnar store of the module `results_store` 
+(parameter `results_store`) instead of in CSV files. The runs of the executions with more than one seed are streamed to the store 
+(or to a store of CSV checkpoints in the data path) while they are executed, so that an interrupted execution is resumed running only 
+the (cost, seed) runs that were not completed.
 
 How to use the library
 ----------------------
@@ -91,6 +112,10 @@ hand, the experiments must be performed with more than one seed for the comparis
     # interest obtained during execution.
     optecot.execute_CMAES_with_OPTECOT(n_seeds=100)
 
+The rows of each run (cost, seed) of these executions are written while it is executed, in the directory `checkpoints` of the data 
+path (or in the store given with the parameter `results_store`). If an execution is interrupted, making the same call again executes 
+only the runs that were not completed.
+
 With the necessary databases available, it is possible to construct the graphs: ::
 
     # Import class to construct the graphs.
@@ -138,7 +163,6 @@ representing the curves of only some costs. ::
 import numpy as np
 import random
 import time
-import scipy as sc
 import pandas as pd
 import math
 import cma
@@ -150,8 +174,17 @@ import plotly.express as px
 from matplotlib.patches import Rectangle
 import sys
 import os
-from joblib import Parallel, delayed, cpu_count
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import threading
+from collections import OrderedDict, deque
+import sqlite3
+import csv
+import hashlib
+import json
 import shutil
+from ranking import rank,rank_from_argsort,sort_by_reference,spearman
+from bootstrap import bootstrap_mean_and_confidence_interval,bootstrap_groups
+from results_store import ResultsStore,RunWriter
 
 import warnings
 warnings.filterwarnings("ignore")
@@ -166,38 +199,35 @@ class AuxiliaryFunctions:
     @staticmethod
     def from_argsort_to_ranking(list):
         '''Obtain ranking from a list get after applying "np.argsort" on an original list.'''
-        new_list=[0]*len(list)
-        i=0
-        for j in list:
-            new_list[j]=i
-            i+=1
-        return new_list
+        return rank_from_argsort(list).tolist()
 
     @staticmethod
     def custom_sort(list,argsort):
         '''Sort list according to the order for each position defined in argsort.'''
-        new_list=[]
-        for index in argsort:
-            new_list.append(list[index])
-        return new_list
+        return np.asarray(list)[np.asarray(argsort)].tolist()
     
     @staticmethod
     def spearman_corr(x,y):
         '''Calculation of Spearman's correlation between two lists.'''
-        return sc.stats.spearmanr(x,y)[0]
+        return spearman(x,y)
 
     @staticmethod
     def from_scores_to_ranking(list_scores):
         '''Convert score list to ranking list.'''
 
-        list_pos_ranking=np.argsort(np.array(list_scores))
-        ranking=[0]*len(list_pos_ranking)
-        i=0
-        for j in list_pos_ranking:
-            ranking[j]=i
-            i+=1
-        return ranking
+        return rank(list_scores).tolist()
     
+    @staticmethod
+    def solution_key(solution):
+        '''Convert a solution into a hashable key (used to store the scores already obtained for a solution).'''
+        solution=np.asarray(solution)
+        if solution.dtype==object:
+            try:
+                solution=solution.astype(float)
+            except (TypeError,ValueError):
+                pass
+        return tuple(solution.ravel().tolist())
+
     @staticmethod
     def from_cost_to_theta(cost,theta0,theta1):
         '''Calculate the value and accuracy of the theta parameter associated with a cost.'''
@@ -209,10 +239,15 @@ class AuxiliaryFunctions:
             return acc,int(theta1/acc)
 
     @staticmethod
-    def extract_info_evaluating_set_with_equidistant_accuracies(set_solutions,objective_function,theta0,theta1,path):
+    def extract_info_evaluating_set_with_equidistant_accuracies(set_solutions,objective_function,theta0,theta1,path,evaluator=None,tolerance=None,batch_size=10,fingerprint=None):
         '''
         Build data frames from information obtained after evaluating a set of solutions with 10 different theta values associated 
-        with equidistant costs.
+        with equidistant costs. Each evaluation is written in the file `df_info_set.csv` as soon as it is completed, so that if the 
+        process is interrupted, the evaluations already stored in the file are not repeated when it is executed again. The file is 
+        only resumed if the `fingerprint` of the calibration stored next to it (in `df_info_set.fingerprint`) is the given one, 
+        otherwise it is discarded and the calibration starts from scratch. If a `tolerance` 
+        is given, the solutions of the set are added in batches until the estimations of the mean time per evaluation and of the 
+        Spearman correlation with the maximum accuracy are precise enough for all the accuracies (see `calibration_converged`).
         
         Parameters
         ==========
@@ -221,6 +256,12 @@ class AuxiliaryFunctions:
         `theta0`: Value of the theta parameter associated with the minimum cost of the objective function.
         `theta1`: Value of the theta parameter associated with the maximum cost of the objective function (original value of the parameter).
         `path`: Path to save auxiliary data.
+        `evaluator`: Evaluator (`PopulationEvaluator`) used to compute the evaluations, for example in parallel (by default None, 
+        the evaluations are computed sequentially measuring the wall time).
+        `tolerance`: Tolerance of the adaptive calibration (by default None, all the solutions of the set are evaluated).
+        `batch_size`: Number of solutions added in each step of the adaptive calibration (by default 10).
+        `fingerprint`: Fingerprint of the calibration (see `CalibrationCache.fingerprint`) that identifies the problem whose evaluations 
+        are stored in the file (by default None, the evaluations of a previous execution are not reused).
 
         Returns
         =======
@@ -228,38 +269,112 @@ class AuxiliaryFunctions:
         different accuracies for the parameter theta (equivalently, different evaluation costs).
         '''
 
-        # Initialize database.
-        df_info_set=[]
-
         # List with equidistant cost values.
         list_cost=np.arange(0,1+1/10,1/9) # As cost and theta accuracy are linearly proportional, to equidistant values of cost corresponds equidistant values of accuracy.
 
-        # Evaluate de set of solutions using all costs.
-        total_it=len(list_cost)*len(set_solutions)
-        it=0
+        # All the evaluations (cost, solution) to be computed.
+        list_acc=[]
+        list_theta=[]
         for cost in list_cost:
             acc,theta=AuxiliaryFunctions.from_cost_to_theta(cost,theta0,theta1)
-            for n_sol in range(len(set_solutions)):
-                t=time.time()
-                score=objective_function(set_solutions[n_sol],theta=theta)
-                elapsed_time=time.time()-t
-                df_info_set.append([acc,n_sol,score,elapsed_time])
+            list_acc.append(acc)
+            list_theta.append(theta)
+        list_pairs=[(n_acc,n_sol) for n_acc in range(len(list_acc)) for n_sol in range(len(set_solutions))]
+
+        # Read the evaluations completed in a previous interrupted execution (of the same calibration).
+        file_name=path+'/df_info_set.csv'
+        fingerprint_file=path+'/df_info_set.fingerprint'
+        previous_fingerprint=None
+        if os.path.isfile(fingerprint_file):
+            with open(fingerprint_file) as file:
+                previous_fingerprint=file.read().strip()
+        completed={}
+        if os.path.isfile(file_name) and fingerprint is not None and previous_fingerprint==fingerprint:
+            df_previous=pd.read_csv(file_name,index_col=0).dropna()
+            for acc,n_sol,score,elapsed_time in df_previous.itertuples(index=False):
+                n_acc=int(np.argmin(np.abs(np.array(list_acc)-acc)))
+                if np.isclose(list_acc[n_acc],acc) and 0<=n_sol<len(set_solutions):
+                    completed[(n_acc,int(n_sol))]=[list_acc[n_acc],int(n_sol),score,elapsed_time]
+
+        # Evaluate the rest of the set of solutions using all costs, writing each evaluation in the file when it is completed.
+        total_it=len(list_pairs)
+        if evaluator is None:
+            evaluator=PopulationEvaluator(objective_function)
+
+        # The file is rewritten with the previous evaluations (discarding a possibly incomplete last line) before adding the new ones.
+        if fingerprint is not None:
+            with open(fingerprint_file,'w') as file:
+                file.write(fingerprint)
+        elif os.path.isfile(fingerprint_file):
+            os.remove(fingerprint_file)
+        with open(file_name,'w',newline='') as file:
+            writer=csv.writer(file)
+            writer.writerow(['','accuracy','n_solution','score','time_per_eval'])
+            for i,row in enumerate(completed.values()):
+                writer.writerow([i]+row)
+            file.flush()
+
+            # Number of solutions of the set considered (all of them, or the first batch in the adaptive calibration).
+            n_solutions=len(set_solutions) if tolerance is None else min(batch_size,len(set_solutions))
+            while True:
+                list_pairs=[(n_acc,n_sol) for n_acc in range(len(list_acc)) for n_sol in range(n_solutions)]
+                pending=[pair for pair in list_pairs if pair not in completed]
+
+                def save_evaluation(i,score,elapsed_time):
+                    n_acc,n_sol=pending[i]
+                    completed[(n_acc,n_sol)]=[list_acc[n_acc],n_sol,score,elapsed_time]
+                    writer.writerow([len(completed)-1]+completed[(n_acc,n_sol)])
+                    file.flush()
+
+                    print('    Computing |S| and t^{period}... '+colored(str(round((len(completed)/total_it)*100,2))+'%','light_cyan'),end='\r')
+                    sys.stdout.flush()
 
-                print('    Computing |S| and t^{period}... '+colored(str(round((it/total_it)*100,2))+'%','light_cyan'),end='\r')
-                sys.stdout.flush()
-                it+=1
+                evaluator.evaluate_pairs([set_solutions[n_sol] for n_acc,n_sol in pending],[list_theta[n_acc] for n_acc,n_sol in pending],callback=save_evaluation)
+
+                if n_solutions==len(set_solutions) or AuxiliaryFunctions.calibration_converged(completed,len(list_acc),n_solutions,tolerance):
+                    break
+                n_solutions=min(n_solutions+batch_size,len(set_solutions))
 
-        # Save databases in directory for auxiliary data.
-        df_info_set=pd.DataFrame(df_info_set,columns=['accuracy','n_solution','score','time_per_eval'])
+        if tolerance is not None:
+            print('    Adaptive calibration: '+str(n_solutions)+' solutions, '+str(len(list_pairs))+' evaluations ('+str(total_it-len(list_pairs))+' saved of '+str(total_it)+')')
+            sys.stdout.flush()
+
+        # Save databases in directory for auxiliary data (the evaluations are sorted by cost and solution).
+        df_info_set=pd.DataFrame([completed[pair] for pair in list_pairs],columns=['accuracy','n_solution','score','time_per_eval'])
         df_acc_time=df_info_set[['accuracy','time_per_eval']]
         df_acc_time=df_acc_time.groupby('accuracy').mean()
         df_acc_time=df_acc_time.reset_index()
 
-        df_info_set.to_csv(path+'/df_info_set.csv')
+        df_info_set.to_csv(file_name)
         df_acc_time.to_csv(path+'/df_acc_time.csv')
 
         return df_acc_time
 
+    @staticmethod
+    def calibration_converged(completed,n_accuracies,n_solutions,tolerance):
+        '''
+        Check if the evaluations of the first `n_solutions` solutions are enough to estimate, for all the accuracies, the mean time 
+        per evaluation (the 95% confidence interval has a half width lower than `tolerance` times the mean time per evaluation with the 
+        maximum accuracy, the scale with which the times are charged to the budget) and the Spearman correlation between the scores obtained with the accuracy and with the maximum accuracy (the 95% confidence interval, computed with the Fisher 
+        transformation, has a half width lower than `tolerance`).
+        '''
+        if n_solutions<=3:
+            return False
+
+        # Matrices of scores and times (one row per accuracy).
+        scores=np.array([[completed[(n_acc,n_sol)][2] for n_sol in range(n_solutions)] for n_acc in range(n_accuracies)],dtype=float)
+        times=np.array([[completed[(n_acc,n_sol)][3] for n_sol in range(n_solutions)] for n_acc in range(n_accuracies)],dtype=float)
+
+        if np.any(1.96*np.std(times,axis=1,ddof=1)/np.sqrt(n_solutions)>tolerance*np.mean(times[-1])):
+            return False
+
+        corr=spearman(scores[:-1],scores[-1])
+        if np.any(np.isnan(corr)):
+            return False
+        z=np.arctanh(np.clip(corr,-0.9999,0.9999))
+        half_width=(np.tanh(z+1.96/np.sqrt(n_solutions-3))-np.tanh(z-1.96/np.sqrt(n_solutions-3)))/2
+        return bool(np.all(half_width<=tolerance))
+
     @staticmethod
     def SampleSize_TimePeriod_bisection_method(popsize,min_sample_size,perc_cost,df_acc_time):
 
@@ -409,7 +524,14 @@ class AuxiliaryFunctions:
 
 class ExperimentalGraphs:
 
-    '''This class defines the methods for building experimental graphs.'''
+    '''
+    This class defines the methods for building experimental graphs. The confidence intervals are computed with the bootstrap 
+    engine of the module `bootstrap`, using the generator (or seed) `bootstrap_rng` and, if it is not None, the `BootstrapCache` 
+    `bootstrap_cache` (both can be set on the class before building the graphs).
+    '''
+
+    bootstrap_rng=None
+    bootstrap_cache=None
 
     @staticmethod
     def bootstrap_mean_and_confidence_interval(data,bootstrap_iterations=1000):
@@ -425,11 +547,13 @@ class ExperimentalGraphs:
         ======
         The mean of the original data together with the percentiles of the means obtained from the subsampling of the data. 
         '''
-        mean_list=[]
-        for i in range(bootstrap_iterations):
-            sample = np.random.choice(data, len(data), replace=True) 
-            mean_list.append(np.mean(sample))
-        return np.mean(data),np.quantile(mean_list, 0.05),np.quantile(mean_list, 0.95)
+        return bootstrap_mean_and_confidence_interval(data,bootstrap_iterations,ExperimentalGraphs.bootstrap_rng,ExperimentalGraphs.bootstrap_cache)
+
+    @staticmethod
+    def bootstrap_groups(groups,bootstrap_iterations=1000):
+        '''The same as `bootstrap_mean_and_confidence_interval` for a list of data samples, returning three lists.'''
+        all_mean,all_q05,all_q95=bootstrap_groups(groups,bootstrap_iterations,ExperimentalGraphs.bootstrap_rng,ExperimentalGraphs.bootstrap_cache)
+        return list(all_mean),list(all_q05),list(all_q95)
     
     @staticmethod
     def train_data_to_figure_data(df_train_cost,list_train_times):
@@ -448,30 +572,18 @@ class ExperimentalGraphs:
 
         '''
 
-        # Initialize lists for the graph.
-        all_mean=[]
-        all_q05=[]
-        all_q95=[]
-
-        # Fill in lists.
-        for train_time in list_train_times:
-
-            # Indexes of rows with a training time less than train_time.
-            ind_train=df_train_cost["elapsed_time"] <= train_time
-            
-            # Group the previous rows by seed and keep the row per group that has the highest score value associated with it.
-            interest_rows=df_train_cost[ind_train].groupby("seed")["score"].idxmax()
-
-            # Calculate the mean and confidence interval of the score.
-            interest=list(df_train_cost['score'][interest_rows])
-            mean,q05,q95=ExperimentalGraphs.bootstrap_mean_and_confidence_interval(interest)
-
-            # Save data.
-            all_mean.append(mean)
-            all_q05.append(q05)
-            all_q95.append(q95)
-
-        return all_mean,all_q05,all_q95
+        # For each seed and train time, the highest score among the rows with a training time less than train time (nan 
+        # if there are none).
+        list_train_times=np.asarray(list_train_times)
+        df_seeds=list(df_train_cost.groupby("seed"))
+        best_scores=np.full((len(df_seeds),len(list_train_times)),np.nan)
+        for i,(seed,df_seed) in enumerate(df_seeds):
+            df_seed=df_seed.sort_values("elapsed_time",kind='stable')
+            n_rows=np.searchsorted(df_seed["elapsed_time"].to_numpy(),list_train_times,side='right')
+            best_scores[i,n_rows>0]=np.maximum.accumulate(df_seed["score"].to_numpy())[n_rows[n_rows>0]-1]
+
+        # Calculate the mean and confidence interval of the score for all the train times at once.
+        return ExperimentalGraphs.bootstrap_groups([scores[~np.isnan(scores)] for scores in best_scores.T])
     
     @staticmethod
     def draw_accuracy_behaviour(ax,df_train,type_time,list_train_time,colors,list_markers):
@@ -484,28 +596,19 @@ class ExperimentalGraphs:
         a_0=0.001 
         a_1=1
 
-        # Initialize lists for the graph.
-        all_mean=[]
-        all_q05=[]
-        all_q95=[]
-
-        # Fill in lists.
-        for train_time in list_train_time:
-
-            # Row indexes with the closest training time to train_time.
-            ind_down=df_train[type_time] <= train_time
-            ind_per_seed=df_train[ind_down].groupby('seed')[type_time].idxmax()
-
-            # Group the previous rows by seeds and keep the accuracy values.
-            list_acc=list(df_train[ind_down].loc[ind_per_seed]['accuracy'])
-
-            # Calculate the mean and confidence interval of the accuracy.
-            mean,q05,q95=ExperimentalGraphs.bootstrap_mean_and_confidence_interval(list_acc)
-
-            # Save data.
-            all_mean.append(mean)
-            all_q05.append(q05)
-            all_q95.append(q95)
+        # For each seed and train time, the accuracy of the (first) row with the closest training time to train_time 
+        # (nan if there are none).
+        df_seeds=list(df_train.groupby('seed'))
+        accuracies=np.full((len(df_seeds),len(list_train_time)),np.nan)
+        for i,(seed,df_seed) in enumerate(df_seeds):
+            df_seed=df_seed.sort_values(type_time,kind='stable')
+            times=df_seed[type_time].to_numpy()
+            n_rows=np.searchsorted(times,np.asarray(list_train_time),side='right')
+            ind_rows=np.searchsorted(times,times[n_rows[n_rows>0]-1],side='left')
+            accuracies[i,n_rows>0]=df_seed['accuracy'].to_numpy()[ind_rows]
+
+        # Calculate the mean and confidence interval of the accuracy for all the train times at once.
+        all_mean,all_q05,all_q95=ExperimentalGraphs.bootstrap_groups([acc[~np.isnan(acc)] for acc in accuracies.T])
         
         # Draw graph.
         all_q05=[round(a_c(i,a_0,a_1),2)for i in all_q05]
@@ -570,15 +673,7 @@ class ExperimentalGraphs:
         list_acc_float=[round(a_c(acc,a_0,a_1),2) for acc in list_acc]
 
         # Execution times per evaluation.
-        all_means=[]
-        all_q05=[]
-        all_q95=[]
-
-        for accuracy in list_acc:
-            mean,q05,q95=ExperimentalGraphs.bootstrap_mean_and_confidence_interval(list(df[df['accuracy']==accuracy]['time_per_eval']))
-            all_means.append(mean)
-            all_q05.append(q05)
-            all_q95.append(q95)
+        all_means,all_q05,all_q95=ExperimentalGraphs.bootstrap_groups([df[df['accuracy']==accuracy]['time_per_eval'].to_numpy() for accuracy in list_acc])
 
         # Extra evaluations.
         list_extra_eval=[]
@@ -627,39 +722,18 @@ class ExperimentalGraphs:
 
         ax=plt.subplot(2,2,(3,4))
 
-        def ranking_matrix_sorted_by_max_acc(ranking_matrix):
-            '''Reorder ranking matrix according to the order established by the original ranking.'''
-
-            # Indexes associated with the maximum accuracy ranking ordered from lowest to highest.
-            argsort_max_acc=np.argsort(ranking_matrix[-1])
-
-            # Reorder matrix rows.
-            sorted_ranking_list=[]
-            for i in range(len(ranking_list)):
-                sorted_ranking_list.append(AuxiliaryFunctions.custom_sort(ranking_list[i],argsort_max_acc))
-
-            return sorted_ranking_list
-
         def absolute_distance_matrix_between_rankings(ranking_matrix):
-            '''Calculate matrix of normalized absolute distances between the positions of the rankings.'''
-            abs_dist_matrix=[]
-            for i in range(len(ranking_matrix)):
-                abs_dist_matrix.append(np.abs(list(np.array(ranking_matrix[i])-np.array(ranking_matrix[-1]))))
+            '''Calculate matrix of normalized absolute distances between the positions of the rankings and the original ranking (the last one).'''
+            abs_dist_matrix=np.abs(ranking_matrix-ranking_matrix[-1])
+            return abs_dist_matrix/np.max(abs_dist_matrix)
 
-            max_value=max(max(i) for i in abs_dist_matrix)
-            norm_abs_dist_matrix=list(np.array(abs_dist_matrix)/max_value)
-            
-            return norm_abs_dist_matrix
-
-        # Build the matrix with the rankings obtained with each evaluation cost.
-        ranking_list=[]
-        for accuracy in list_acc:
-            df_acc=df[df['accuracy']==accuracy]
-            ranking=AuxiliaryFunctions.from_argsort_to_ranking(list(df_acc['score'].argsort()))
-            ranking_list.append(ranking)
+        # Build the matrix with the rankings obtained with each evaluation cost (one row per cost), with the solutions
+        # reordered according to the order established by the original ranking.
+        ranking_matrix=rank(np.array([df[df['accuracy']==accuracy]['score'].to_numpy() for accuracy in list_acc]))
+        ranking_matrix=sort_by_reference(ranking_matrix,ranking_matrix[-1])
 
         # Build graph.
-        ranking_matrix=np.matrix(absolute_distance_matrix_between_rankings(ranking_matrix_sorted_by_max_acc(ranking_list)))
+        ranking_matrix=np.matrix(absolute_distance_matrix_between_rankings(ranking_matrix))
         color = sns.cubehelix_palette(start=2, rot=0, dark=0, light=.95, reverse=False, as_cmap=True)
 
         ax = sns.heatmap(ranking_matrix, cmap=color,linewidths=.5, linecolor='lightgray')
@@ -693,8 +767,8 @@ class ExperimentalGraphs:
             sys.stdout.flush()
 
             # Define list with limits of training times to be drawn.
-            df_train_cost_min=pd.read_csv(optecot.data_path+'/df_ConstantAnalysis_cost'+'{:.02f}'.format(min(list_costs))+".csv", index_col=0)
-            df_train_cost_max=pd.read_csv(optecot.data_path+'/df_ConstantAnalysis_cost'+'{:.02f}'.format(max(list_costs))+".csv", index_col=0)
+            df_train_cost_min=optecot.load_database('ConstantAnalysis','df_ConstantAnalysis_cost'+'{:.02f}'.format(min(list_costs)),cost=min(list_costs))
+            df_train_cost_max=optecot.load_database('ConstantAnalysis','df_ConstantAnalysis_cost'+'{:.02f}'.format(max(list_costs)),cost=max(list_costs))
             min_time=max(df_train_cost_max.groupby('seed')['elapsed_time'].min())
             split_time=max(df_train_cost_min.groupby('seed')['elapsed_time'].min())
             list_train_times=np.arange(min_time,optecot.max_time,split_time)
@@ -715,7 +789,7 @@ class ExperimentalGraphs:
             for cost in list_costs:
 
                 # Read database.
-                df_train_cost=pd.read_csv(optecot.data_path+'/df_ConstantAnalysis_cost'+'{:.02f}'.format(cost)+".csv", index_col=0)
+                df_train_cost=optecot.load_database('ConstantAnalysis','df_ConstantAnalysis_cost'+'{:.02f}'.format(cost),cost=cost)
 
                 # Extract relevant information from the database.
                 all_mean_scores,all_q05_scores,all_q95_scores =ExperimentalGraphs.train_data_to_figure_data(df_train_cost,list_train_times)
@@ -770,8 +844,8 @@ class ExperimentalGraphs:
         colors2=['#C7C9C8' ,'#AFB0AF','#F4E47B','#DBC432' ]
 
         # Define training times to be drawn.
-        df_max_acc=pd.read_csv(optecot.data_path+'/df_ConstantAnalysis_cost1.00.csv', index_col=0)
-        df_optimal_acc=pd.read_csv(optecot.data_path+'/df_OPTECOT_Analysis.csv', index_col=0)
+        df_max_acc=optecot.load_database('ConstantAnalysis','df_ConstantAnalysis_cost1.00',cost=1)
+        df_optimal_acc=optecot.load_database('OPTECOT_Analysis','df_OPTECOT_Analysis',heuristic='OPTECOT')
         min_time_acc_max=max(df_max_acc.groupby('seed')['elapsed_time'].min())
         min_time_h=max(df_optimal_acc.groupby('seed')['elapsed_time'].min())
 
@@ -933,7 +1007,722 @@ class ExperimentalGraphs:
         print(colored('Results drawn.','light_yellow',attrs=["bold"]))
         sys.stdout.flush()
 
-    
+
+class PopulationEvaluator:
+
+    '''
+    This class defines the backends used to evaluate a set of solutions. The scores are returned directly to the main
+    process together with the wall time of each evaluation, so no auxiliary file is written to disk. Three backends are
+    available: `'serial'` (the solutions are evaluated one after another in the main process), `'thread'` (pool of threads)
+    and `'process'` (pool of processes). The pools are created the first time they are needed and are reused in the
+    following evaluations until the `close` method is called. When an `initializer` is given, each worker of the pool builds
+    its own copy of the objective function only once, when the worker is started. The evaluation times can be measured 
+    as wall time (`'wall'` clock) or as CPU time consumed by the evaluation (`'cpu'` clock). When a `batch_function` is given, 
+    the set of solutions is evaluated with a single call (or with one call per worker of the pool, each one with a part of the 
+    set), and the time of each call is split evenly between the solutions it evaluates.
+    '''
+
+    # Objective function available in each worker of the process pool.
+    worker_objective_function=None
+
+    # Functions used to measure the evaluation times with each clock.
+    clocks={'wall':time.time,'cpu':time.process_time}
+
+    def __init__(self,objective_function,backend='serial',n_jobs=None,initializer=None,clock='wall',batch_function=None):
+        '''
+        Parameters
+        ==========
+        `objective_function`: Function with the objective function implementation.\n
+        `backend`: Name of the backend to be used, `'serial'`, `'thread'` or `'process'` (by default `'serial'`).\n
+        `n_jobs`: Number of workers of the pool (by default the number of CPUs available).\n
+        `initializer`: Function without arguments that returns the objective function. It is called once in each worker 
+        of the pool, so that the heavy state of the objective function (loaded files, libraries, models...) is built only 
+        once per worker and not in each evaluation (by default None, the `objective_function` is sent to the workers).\n
+        `clock`: Clock used to measure the evaluation times, `'wall'` or `'cpu'` (by default `'wall'`). With the `'cpu'` clock
+        the time consumed by a set of solutions is the sum of the CPU times of its evaluations, whatever the backend is.\n
+        `batch_function`: Function with two arguments, `population` and `theta`, that returns the list of scores of a whole set 
+        of solutions (by default None, the solutions are evaluated one by one with `objective_function`).
+        '''
+        if backend not in ['serial','thread','process']:
+            raise ValueError("The backend must be 'serial', 'thread' or 'process', but '"+str(backend)+"' was given.")
+        if clock not in PopulationEvaluator.clocks:
+            raise ValueError("The clock must be 'wall' or 'cpu', but '"+str(clock)+"' was given.")
+
+        self.objective_function=objective_function
+        self.backend=backend
+        self.n_jobs=n_jobs if n_jobs is not None else os.cpu_count()
+        self.initializer=initializer
+        self.clock=clock
+        self.batch_function=batch_function
+        self.pool=None
+        self.thread_data=threading.local()
+
+    @staticmethod
+    def initialize_worker(objective_function,initializer):
+        '''Store the objective function in a worker of the process pool.'''
+        if initializer is not None:
+            PopulationEvaluator.worker_objective_function=initializer()
+        else:
+            PopulationEvaluator.worker_objective_function=objective_function
+
+    @staticmethod
+    def warm_up_worker():
+        '''Empty task used to force the start of the workers of the pool.'''
+        return os.getpid()
+
+    def initialize_thread(self):
+        '''Store the objective function in a worker of the thread pool.'''
+        self.thread_data.objective_function=self.initializer()
+
+    @staticmethod
+    def evaluate_in_worker(solution,theta,clock='wall'):
+        '''Evaluate a solution in a worker of the process pool and measure its evaluation time.'''
+        time_function=PopulationEvaluator.clocks[clock]
+        t=time_function()
+        score=PopulationEvaluator.worker_objective_function(solution,theta=theta)
+        return score,time_function()-t
+
+    @staticmethod
+    def evaluate_batch(batch_function,population,theta,clock='wall'):
+        '''Evaluate a set of solutions with a single call to the batch function and split the measured time evenly between them.'''
+        time_function=PopulationEvaluator.clocks[clock]
+        t=time_function()
+        list_scores=list(batch_function(population,theta))
+        batch_time=time_function()-t
+        return list_scores,[batch_time/len(population)]*len(population)
+
+    def evaluate_solution(self,solution,theta):
+        '''Evaluate a solution in the current process and measure its evaluation time.'''
+        objective_function=getattr(self.thread_data,'objective_function',self.objective_function)
+
+        # The threads share the CPU time of the process, so each one measures only its own.
+        if self.backend=='thread' and self.clock=='cpu':
+            time_function=time.thread_time
+        else:
+            time_function=PopulationEvaluator.clocks[self.clock]
+
+        t=time_function()
+        score=objective_function(solution,theta=theta)
+        return score,time_function()-t
+
+    def get_pool(self):
+        '''Return the pool of workers, creating it if it does not exist yet.'''
+        if self.pool is None:
+            if self.backend=='thread':
+                self.pool=ThreadPoolExecutor(max_workers=self.n_jobs,initializer=self.initialize_thread if self.initializer is not None else None)
+            else:
+                self.pool=ProcessPoolExecutor(max_workers=self.n_jobs,initializer=PopulationEvaluator.initialize_worker,initargs=(self.objective_function,self.initializer))
+        return self.pool
+
+    def warm_up(self):
+        '''Start all the workers of the pool, so that their initialization is not included in the evaluation times.'''
+        if self.backend!='serial':
+            pool=self.get_pool()
+            for future in [pool.submit(PopulationEvaluator.warm_up_worker) for i in range(self.n_jobs)]:
+                future.result()
+
+    def submit(self,solution,theta):
+        '''Submit the evaluation of a solution to the pool of workers and return the future of its score and its evaluation time.'''
+        if self.backend=='serial':
+            raise ValueError("The evaluations can only be submitted to the 'thread' or 'process' backends.")
+        pool=self.get_pool()
+        if self.backend=='thread':
+            return pool.submit(self.evaluate_solution,solution,theta)
+        return pool.submit(PopulationEvaluator.evaluate_in_worker,solution,theta,self.clock)
+
+    def evaluate(self,population,theta,callback=None):
+        '''
+        Evaluate a set of solutions with the same value of the parameter `theta`.
+
+        Parameters
+        ==========
+        `population`: List of solutions to be evaluated.\n
+        `theta`: Value of the parameter of the objective function that allows us to control its cost.\n
+        `callback`: Function called each time an evaluation is completed, which receives as argument the time elapsed so far
+        (by default None).
+
+        Returns
+        =======
+        `list_scores`: List with the scores associated to each solution.\n
+        `list_times`: List with the time of each evaluation.\n
+        `elapsed_time`: Time consumed to evaluate the whole set. In the serial backend (or with the `'cpu'` clock) it is the sum of the 
+        times of each evaluation, and with the pools it is the wall time since the first evaluation is submitted until the last one is completed.
+        '''
+
+        list_scores=[None]*len(population)
+        list_times=[0]*len(population)
+
+        if self.batch_function is not None and len(population)>0:
+            return self.evaluate_with_batch_function(population,theta,callback=callback)
+
+        if self.backend=='serial':
+            elapsed_time=0
+            for i in range(len(population)):
+                list_scores[i],list_times[i]=self.evaluate_solution(population[i],theta)
+                elapsed_time+=list_times[i]
+                if callback is not None:
+                    callback(elapsed_time)
+            return list_scores,list_times,elapsed_time
+
+        pool=self.get_pool()
+        t=time.time()
+        if self.backend=='thread':
+            futures={pool.submit(self.evaluate_solution,population[i],theta):i for i in range(len(population))}
+        else:
+            futures={pool.submit(PopulationEvaluator.evaluate_in_worker,population[i],theta,self.clock):i for i in range(len(population))}
+        for future in as_completed(futures):
+            i=futures[future]
+            list_scores[i],list_times[i]=future.result()
+            if callback is not None:
+                callback(time.time()-t if self.clock=='wall' else sum(list_times))
+
+        return list_scores,list_times,time.time()-t if self.clock=='wall' else sum(list_times)
+
+    def evaluate_pairs(self,population,list_theta,callback=None):
+        '''
+        Evaluate each solution of a set with its own value of the parameter theta.
+
+        Parameters
+        ==========
+        `population`: List of solutions to be evaluated.\n
+        `list_theta`: List with the value of theta with which each solution is evaluated.\n
+        `callback`: Function called each time an evaluation is completed, which receives as arguments the index of the solution, its 
+        score and its evaluation time (by default None).
+
+        Returns
+        =======
+        `list_scores`: List with the scores associated to each solution.\n
+        `list_times`: List with the time of each evaluation.
+        '''
+        list_scores=[None]*len(population)
+        list_times=[0]*len(population)
+
+        if self.backend=='serial':
+            for i in range(len(population)):
+                list_scores[i],list_times[i]=self.evaluate_solution(population[i],list_theta[i])
+                if callback is not None:
+                    callback(i,list_scores[i],list_times[i])
+            return list_scores,list_times
+
+        pool=self.get_pool()
+        if self.backend=='thread':
+            futures={pool.submit(self.evaluate_solution,population[i],list_theta[i]):i for i in range(len(population))}
+        else:
+            futures={pool.submit(PopulationEvaluator.evaluate_in_worker,population[i],list_theta[i],self.clock):i for i in range(len(population))}
+        for future in as_completed(futures):
+            i=futures[future]
+            list_scores[i],list_times[i]=future.result()
+            if callback is not None:
+                callback(i,list_scores[i],list_times[i])
+
+        return list_scores,list_times
+
+    def evaluate_with_batch_function(self,population,theta,callback=None):
+        '''Evaluate a set of solutions with the batch function, in a single call or splitting the set between the workers of the pool.'''
+        if self.backend=='serial':
+            list_scores,list_times=PopulationEvaluator.evaluate_batch(self.batch_function,population,theta,self.clock)
+            elapsed_time=sum(list_times)
+            if callback is not None:
+                for i in range(len(population)):
+                    callback(elapsed_time)
+            return list_scores,list_times,elapsed_time
+
+        # Split the set in (at most) one part per worker.
+        list_parts=[list(part) for part in np.array_split(np.arange(len(population)),min(self.n_jobs,len(population)))]
+
+        list_scores=[None]*len(population)
+        list_times=[0]*len(population)
+        pool=self.get_pool()
+        t=time.time()
+        futures={pool.submit(PopulationEvaluator.evaluate_batch,self.batch_function,[population[i] for i in part],theta,self.clock):part for part in list_parts}
+        for future in as_completed(futures):
+            part=futures[future]
+            part_scores,part_times=future.result()
+            for i,score,part_time in zip(part,part_scores,part_times):
+                list_scores[i]=score
+                list_times[i]=part_time
+            if callback is not None:
+                for i in part:
+                    callback(time.time()-t if self.clock=='wall' else sum(list_times))
+
+        return list_scores,list_times,time.time()-t if self.clock=='wall' else sum(list_times)
+
+    def close(self):
+        '''Shut down the pool of workers (if it exists).'''
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool=None
+
+
+class ObjectiveCache:
+
+    '''
+    This class defines a cache of the scores obtained with the objective function, indexed by the (transformed) solution 
+    and the value of the parameter theta. When the cache is full, the least recently used scores are removed first. The 
+    size of the cache can be bounded by the number of stored scores, by the memory they use (estimated) or by both. It 
+    should only be used with deterministic objective functions.
+    '''
+
+    def __init__(self,max_size=None,max_memory=None,lookup_cost=None):
+        '''
+        Parameters
+        ==========
+        `max_size`: Maximum number of scores stored in the cache (by default None, no limit).\n
+        `max_memory`: Maximum memory (in bytes) used by the stored scores (by default None, no limit).\n
+        `lookup_cost`: Time (in seconds) charged against the computational budget each time a score is read from the 
+        cache instead of evaluating the objective function (by default None, the measured time of the lookup is charged).
+        '''
+        self.max_size=max_size
+        self.max_memory=max_memory
+        self.lookup_cost=lookup_cost
+        self.scores=OrderedDict()
+        self.memory=0
+        self.hits=0
+        self.misses=0
+
+    @staticmethod
+    def entry_memory(key,score):
+        '''Estimate the memory (in bytes) used by a stored score.'''
+        return sys.getsizeof(key)+sys.getsizeof(key[0])+sum(sys.getsizeof(i) for i in key[0])+sys.getsizeof(score)
+
+    def get(self,solution,theta):
+        '''Return True and the stored score if the evaluation of `solution` with `theta` is in the cache, otherwise False and None.'''
+        key=(AuxiliaryFunctions.solution_key(solution),theta)
+        if key in self.scores:
+            self.scores.move_to_end(key)
+            self.hits+=1
+            return True,self.scores[key]
+        self.misses+=1
+        return False,None
+
+    def put(self,solution,theta,score):
+        '''Store the score of the evaluation of `solution` with `theta`, removing the least recently used scores if necessary.'''
+        key=(AuxiliaryFunctions.solution_key(solution),theta)
+        if key in self.scores:
+            self.scores.move_to_end(key)
+            return
+        self.scores[key]=score
+        self.memory+=ObjectiveCache.entry_memory(key,score)
+
+        while (self.max_size is not None and len(self.scores)>self.max_size) or (self.max_memory is not None and self.memory>self.max_memory and len(self.scores)>0):
+            old_key,old_score=self.scores.popitem(last=False)
+            self.memory-=ObjectiveCache.entry_memory(old_key,old_score)
+
+    def statistics(self):
+        '''Return a dictionary with the number of hits and misses, the hit rate, the number of stored scores and the memory used.'''
+        total=self.hits+self.misses
+        return {'hits':self.hits,'misses':self.misses,'hit_rate':self.hits/total if total>0 else 0,
+                'size':len(self.scores),'memory':self.memory}
+
+
+class ReplayStore:
+
+    '''
+    This class defines a persistent store (SQLite database indexed by solution and theta) of the evaluations made with the 
+    objective function, recording for each one its score and its evaluation time. The stored evaluations are loaded in memory 
+    when the store is opened, and the new ones are kept in memory until `flush` is called, when they are written in a single 
+    transaction. Several processes can share the same file. It should only be used with deterministic objective functions.
+    '''
+
+    def __init__(self,path):
+        '''
+        Parameters
+        ==========
+        `path`: Path of the database file (it is created if it does not exist).
+        '''
+        self.path=path
+        self.evaluations={}
+        self.new_evaluations=[]
+        self.hits=0
+        self.misses=0
+        self.connection=None
+        self.load()
+
+    @staticmethod
+    def key(solution,theta):
+        '''Build the index of the evaluation of `solution` with `theta`.'''
+        return repr(AuxiliaryFunctions.solution_key(solution)),repr(theta)
+
+    def get_connection(self):
+        '''Return the connection to the database file, opening it if necessary.'''
+        if self.connection is None:
+            self.connection=sqlite3.connect(self.path,timeout=60)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS evaluations (solution TEXT, theta TEXT, score REAL, time REAL, PRIMARY KEY (solution, theta))')
+        return self.connection
+
+    def load(self):
+        '''Load in memory all the evaluations stored in the database file.'''
+        for solution,theta,score,evaluation_time in self.get_connection().execute('SELECT solution, theta, score, time FROM evaluations'):
+            self.evaluations[(solution,theta)]=(score,evaluation_time)
+
+    def get(self,solution,theta):
+        '''Return True, the score and the recorded time if the evaluation of `solution` with `theta` is stored, otherwise False, None and None.'''
+        key=ReplayStore.key(solution,theta)
+        if key in self.evaluations:
+            self.hits+=1
+            score,evaluation_time=self.evaluations[key]
+            return True,score,evaluation_time
+        self.misses+=1
+        return False,None,None
+
+    def record(self,solution,theta,score,evaluation_time):
+        '''Record a new evaluation of `solution` with `theta`.'''
+        key=ReplayStore.key(solution,theta)
+        if key not in self.evaluations:
+            self.evaluations[key]=(float(score),float(evaluation_time))
+            self.new_evaluations.append(key+(float(score),float(evaluation_time)))
+
+    def flush(self):
+        '''Write in the database file the evaluations recorded since the last call.'''
+        if len(self.new_evaluations)>0:
+            with self.get_connection() as connection:
+                connection.executemany('INSERT OR IGNORE INTO evaluations VALUES (?, ?, ?, ?)',self.new_evaluations)
+            self.new_evaluations=[]
+
+    def close(self):
+        '''Write the pending evaluations and close the database file.'''
+        self.flush()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection=None
+
+    def statistics(self):
+        '''Return a dictionary with the number of hits and misses, the hit rate and the number of stored evaluations.'''
+        total=self.hits+self.misses
+        return {'hits':self.hits,'misses':self.misses,'hit_rate':self.hits/total if total>0 else 0,'size':len(self.evaluations)}
+
+    def __getstate__(self):
+        # The connection can not be sent to other processes, each copy opens its own connection.
+        state=self.__dict__.copy()
+        state['connection']=None
+        return state
+
+
+class CalibrationCache:
+
+    '''
+    This class defines a persistent cache of the results of the calibration made when an instance of OPTECOT is created. 
+    Each entry is a directory named with the fingerprint (SHA-256) of the definition of the problem (`xbounds`, `theta0`, `theta1`, 
+    the objective function and a version tag given by the user, and the settings of the calibration), that stores the databases 
+    `df_acc_time.csv`, `df_info_set.csv` and `df_ExtraCost_SavePopEvalCost.csv` and a file `calibration.json` with the sample size 
+    |S|, the time period t^{period} and the interruption threshold computed for each population size.
+    '''
+
+    artifacts=['df_acc_time.csv','df_info_set.csv','df_ExtraCost_SavePopEvalCost.csv']
+
+    def __init__(self,path):
+        '''
+        Parameters
+        ==========
+        `path`: Path of the directory of the cache (it is created if it does not exist).
+        '''
+        self.path=path
+        os.makedirs(self.path,exist_ok=True)
+
+    @staticmethod
+    def code_digest(code):
+        '''Build a representation of the bytecode and constants of `code` that does not depend on the memory addresses.'''
+        constants=[CalibrationCache.code_digest(constant) if hasattr(constant,'co_code') else repr(constant) for constant in code.co_consts]
+        return [code.co_code.hex(),constants,list(code.co_names)]
+
+    @staticmethod
+    def fingerprint(xbounds,theta0,theta1,objective_function,objective_version=None,settings=None):
+        '''
+        Compute the fingerprint of the definition of the problem. The objective function is identified by its module, its name 
+        and its bytecode (when it is available), and `objective_version` allows to invalidate the entries when the objective function 
+        changes in a way that is not reflected in its code (for example, the data or the libraries it uses).
+        '''
+        bounds=[sorted(bounds,key=repr) if type(bounds)==set else list(bounds) for bounds in xbounds]
+        function=objective_function.func if hasattr(objective_function,'func') else objective_function
+        definition={'xbounds':repr(bounds),'theta0':repr(theta0),'theta1':repr(theta1),
+                    'objective_function':getattr(function,'__module__','')+'.'+getattr(function,'__qualname__',type(function).__qualname__),
+                    'objective_code':CalibrationCache.code_digest(function.__code__) if hasattr(function,'__code__') else None,
+                    'objective_version':repr(objective_version),'settings':repr(settings)}
+        return hashlib.sha256(json.dumps(definition,sort_keys=True).encode()).hexdigest()
+
+    def entry_path(self,fingerprint):
+        '''Return the path of the directory of the entry associated with `fingerprint`.'''
+        return os.path.join(self.path,fingerprint)
+
+    def load_df_acc_time(self,fingerprint,auxiliary_data_path):
+        '''
+        Return the database `df_acc_time` stored for `fingerprint` (None if the entry does not exist or is incomplete), copying 
+        the stored databases into `auxiliary_data_path`.
+        '''
+        entry=self.entry_path(fingerprint)
+        if not all(os.path.isfile(os.path.join(entry,name)) for name in CalibrationCache.artifacts[:2]):
+            return None
+        for name in CalibrationCache.artifacts:
+            if os.path.isfile(os.path.join(entry,name)) and os.path.abspath(entry)!=os.path.abspath(auxiliary_data_path):
+                shutil.copy(os.path.join(entry,name),os.path.join(auxiliary_data_path,name))
+        return pd.read_csv(os.path.join(entry,'df_acc_time.csv'),index_col=0)
+
+    def load_parameters(self,fingerprint,popsize,min_sample_size,perc_cost):
+        '''Return the sample size, the time period and the interruption threshold stored for `fingerprint` and the given settings (None if they are not stored).'''
+        file_name=os.path.join(self.entry_path(fingerprint),'calibration.json')
+        if not os.path.isfile(file_name):
+            return None
+        try:
+            with open(file_name) as file:
+                parameters=json.load(file)
+        except ValueError:
+            return None
+        return parameters.get(repr((popsize,min_sample_size,perc_cost)))
+
+    def store(self,fingerprint,auxiliary_data_path,popsize,min_sample_size,perc_cost,sample_size,heuristic_freq,interruption_threshold):
+        '''Store the databases of `auxiliary_data_path` and the parameters computed with the given settings in the entry of `fingerprint`.'''
+        entry=self.entry_path(fingerprint)
+        os.makedirs(entry,exist_ok=True)
+        for name in CalibrationCache.artifacts:
+            if os.path.isfile(os.path.join(auxiliary_data_path,name)) and os.path.abspath(entry)!=os.path.abspath(auxiliary_data_path):
+                shutil.copy(os.path.join(auxiliary_data_path,name),os.path.join(entry,name))
+
+        file_name=os.path.join(entry,'calibration.json')
+        parameters={}
+        if os.path.isfile(file_name):
+            try:
+                with open(file_name) as file:
+                    parameters=json.load(file)
+            except ValueError:
+                parameters={}
+        parameters[repr((popsize,min_sample_size,perc_cost))]=[int(sample_size),float(heuristic_freq),float(interruption_threshold)]
+
+        # The file is replaced atomically so that the processes sharing the cache never read an incomplete file.
+        with open(file_name+'.'+str(os.getpid()),'w') as file:
+            json.dump(parameters,file,indent=4)
+        os.replace(file_name+'.'+str(os.getpid()),file_name)
+
+
+class RunHistory:
+
+    '''
+    This class defines an append-only history of the data stored per generation during the execution of the CMA-ES. 
+    The rows are accumulated in a list and the database is built only once at the end of the execution, or they are 
+    passed to a `RunWriter` that writes them in batches while the run is executed. In addition, 
+    for each seed, the last optimal accuracies and variances of the scores are kept in ring buffers, so that OPTECOT 
+    can consult them in each generation without rebuilding and filtering the whole database.
+    '''
+
+    def __init__(self,columns,accuracy_window,variance_window,writer=None):
+        '''
+        Parameters
+        ==========
+        `columns`: List with the names of the columns of the database.
+
+        `accuracy_window`: Number of last optimal accuracies kept per seed.
+
+        `variance_window`: Number of last variances of the scores kept per seed.
+
+        `writer`: Optional `RunWriter` to which the rows are passed instead of being kept in the history.
+        '''
+        self.columns=columns
+        self.accuracy_window=accuracy_window
+        self.variance_window=variance_window
+        self.writer=writer
+        self.rows=[]
+        self.accuracies={}
+        self.variances={}
+
+    def append(self,row,seed,accuracy,variance):
+        '''Add the row of a generation executed with `seed` and update the ring buffers of that seed.'''
+        if self.writer is not None:
+            self.writer.append(row)
+        else:
+            self.rows.append(row)
+        if seed not in self.accuracies:
+            self.accuracies[seed]=deque(maxlen=self.accuracy_window)
+            self.variances[seed]=deque(maxlen=self.variance_window)
+        self.accuracies[seed].append(accuracy)
+        self.variances[seed].append(variance)
+
+    def last_accuracies(self,seed):
+        '''Return the list with the last optimal accuracies stored for `seed`.'''
+        return list(self.accuracies.get(seed,[]))
+
+    def last_variances(self,seed):
+        '''Return the list with the last variances of the scores stored for `seed`.'''
+        return list(self.variances.get(seed,[]))
+
+    def to_dataframe(self):
+        '''Build the database with all the stored rows.'''
+        return pd.DataFrame(self.rows,columns=self.columns)
+
+
+class BisectionSearch:
+
+    '''
+    This class defines the state of the bisection method applied on the interval of times per evaluation [`lower_time`, `upper_time`]. 
+    In each iteration the accuracy associated with the midpoint of the interval is evaluated, and the interval is bounded above (if the 
+    ranking obtained with the accuracy is accepted) or below (otherwise) until its range is lower than 10% of the initial one.
+    '''
+
+    def __init__(self,lower_time,upper_time,interpolation_time,interpolation_acc,stop_threshold=None):
+        '''
+        Parameters
+        ==========
+        `lower_time`, `upper_time`: Limits of the interval of times per evaluation.\n
+        `interpolation_time`, `interpolation_acc`: Times per evaluation and accuracies used to interpolate the accuracy of a time.\n
+        `stop_threshold`: Range of the interval with which the search is finished (by default None, 10% of the initial range).
+        '''
+        self.time0=lower_time
+        self.time1=upper_time
+        self.interpolation_time=interpolation_time
+        self.interpolation_acc=interpolation_acc
+        self.prev_m=lower_time
+        self.m=(lower_time+upper_time)/2
+        self.stop_threshold=(upper_time-lower_time)*0.1 if stop_threshold is None else stop_threshold
+
+    @staticmethod
+    def number_of_iterations(lower_time,upper_time):
+        '''Return the number of midpoints evaluated by the bisection method on [`lower_time`, `upper_time`] (it does not depend on the results).'''
+        search=BisectionSearch(lower_time,upper_time,[lower_time,upper_time],[0,1])
+        n_iterations=0
+        while not search.finished():
+            search.update(True)
+            n_iterations+=1
+        return n_iterations
+
+    def finished(self):
+        '''Return True if the interval has a sufficiently small range.'''
+        return not self.time1-self.time0>self.stop_threshold
+
+    def accuracy(self):
+        '''Return the accuracy associated with the current midpoint.'''
+        return np.interp(self.m,self.interpolation_time,self.interpolation_acc)
+
+    def update(self,accepted):
+        '''Reset the limits of the interval depending on whether the accuracy of the current midpoint has been `accepted`.'''
+        if accepted:
+            self.time1=self.m
+        else:
+            self.time0=self.m
+        self.prev_m=self.m
+        self.m=(self.time0+self.time1)/2
+
+    def speculative_accuracies(self,levels):
+        '''
+        Return the list with the accuracies associated with all the midpoints that can be evaluated in the next `levels` iterations 
+        (at most 2^`levels`-1), whatever the result of each iteration is. The first one is the accuracy of the current midpoint.
+        '''
+        list_acc=[]
+        intervals=[(self.time0,self.time1)]
+        for level in range(levels):
+            new_intervals=[]
+            for time0,time1 in intervals:
+                if time1-time0>self.stop_threshold:
+                    m=(time0+time1)/2
+                    list_acc.append(np.interp(m,self.interpolation_time,self.interpolation_acc))
+                    new_intervals+=[(time0,m),(m,time1)]
+            intervals=new_intervals
+        return list_acc
+
+    def result(self):
+        '''Return the accuracy selected as optimal (the last midpoint evaluated).'''
+        return np.interp(self.prev_m,self.interpolation_time,self.interpolation_acc)
+
+
+class BracketSearch:
+
+    '''
+    This class defines the state of a bracketing search of the optimal time per evaluation, warm-started from the time associated 
+    with the previous optimal accuracy (`start_time`). The search gallops from `start_time` downwards (if its accuracy is accepted) or 
+    upwards (otherwise), doubling the step in each iteration, until the acceptance changes. Then the bisection method is applied on the 
+    bracket found until its range is lower than 10% of the range of [`lower_time`, `upper_time`]. The maximum accuracy (`upper_time`) is 
+    always accepted without being evaluated, and the accuracy selected as optimal is the one associated with the lowest accepted time. 
+    When the optimal accuracy changes slowly, the bracket is found with two evaluations and the search finishes without bisection.
+    '''
+
+    def __init__(self,lower_time,upper_time,start_time,interpolation_time,interpolation_acc):
+        '''
+        Parameters
+        ==========
+        `lower_time`, `upper_time`: Limits of the interval of times per evaluation.\n
+        `start_time`: Time per evaluation of the previous optimal accuracy.\n
+        `interpolation_time`, `interpolation_acc`: Times per evaluation and accuracies used to interpolate the accuracy of a time.
+        '''
+        self.lower_time=lower_time
+        self.upper_time=upper_time
+        self.interpolation_time=interpolation_time
+        self.interpolation_acc=interpolation_acc
+        self.stop_threshold=(upper_time-lower_time)*0.1
+        self.time0=None # Highest rejected time.
+        self.time1=None # Lowest accepted time.
+        self.m=min(max(start_time,lower_time),upper_time)
+        self.step=self.stop_threshold
+        self.direction=None
+        self.bisection=None
+        self.done=False
+
+        # The maximum accuracy is accepted without being evaluated, so the search gallops downwards from it.
+        if self.m>=upper_time:
+            self.update(True)
+
+    def finished(self):
+        '''Return True if the search is finished.'''
+        if self.bisection is not None:
+            return self.bisection.finished()
+        return self.done
+
+    def accuracy(self):
+        '''Return the accuracy associated with the current time to be evaluated.'''
+        m=self.bisection.m if self.bisection is not None else self.m
+        return np.interp(m,self.interpolation_time,self.interpolation_acc)
+
+    def update(self,accepted):
+        '''Continue the search depending on whether the accuracy of the current time has been `accepted`.'''
+        if self.bisection is not None:
+            self.bisection.update(accepted)
+            return
+
+        if accepted:
+            self.time1=self.m
+        else:
+            self.time0=self.m
+        if self.direction is None:
+            self.direction=-1 if accepted else 1
+
+        # Gallop in the same direction until the acceptance changes or a limit of the interval is reached.
+        if self.time0 is None:
+            if self.m<=self.lower_time:
+                self.done=True
+                return
+            self.m=max(self.m-self.step,self.lower_time)
+        elif self.time1 is None:
+            if self.m+self.step>=self.upper_time:
+                self.time1=self.upper_time
+            else:
+                self.m=self.m+self.step
+        self.step*=2
+
+        # Apply the bisection method on the bracket.
+        if self.time0 is not None and self.time1 is not None:
+            self.bisection=BisectionSearch(self.time0,self.time1,self.interpolation_time,self.interpolation_acc,stop_threshold=self.stop_threshold)
+
+    def speculative_accuracies(self,levels):
+        '''
+        Return the list with the accuracies that can be evaluated in the next `levels` iterations. While galloping, only the 
+        iterations in which the acceptance does not change are considered.
+        '''
+        if self.bisection is not None:
+            return self.bisection.speculative_accuracies(levels)
+        list_time=[self.m]
+        if self.direction is not None:
+            m=self.m
+            step=self.step
+            for level in range(levels-1):
+                m=max(m-step,self.lower_time) if self.direction==-1 else m+step
+                if m>=self.upper_time or m in list_time:
+                    break
+                list_time.append(m)
+                step*=2
+        return [np.interp(m,self.interpolation_time,self.interpolation_acc) for m in list_time]
+
+    def result(self):
+        '''Return the accuracy selected as optimal (the one associated with the lowest accepted time).'''
+        time1=self.bisection.time1 if self.bisection is not None else self.time1
+        return np.interp(time1,self.interpolation_time,self.interpolation_acc)
+
+
 class OPTECOT:
 
     '''
@@ -944,7 +1733,11 @@ class OPTECOT:
     '''
 
     def __init__(self,xdim,xbounds,max_time,theta0,theta1,objective_min,objective_function,
-                 alpha=0.95,beta=5,kappa=3,popsize=20,in_parallel=False,min_sample_size=10,perc_cost=0.25,customized_paths=[None,None,None]):
+                 alpha=0.95,beta=5,kappa=3,popsize=20,in_parallel=False,min_sample_size=10,perc_cost=0.25,customized_paths=[None,None,None],
+                 parallel_backend='process',n_jobs=None,objective_function_initializer=None,cache_size=None,cache_memory=None,cache_lookup_cost=None,
+                 n_jobs_seeds=None,budget_clock=None,replay_path=None,objective_function_batch=None,calibration_tolerance=None,calibration_batch_size=10,
+                 calibration_cache=None,objective_version=None,asynchronous=False,speculative_levels=1,warm_start_bisection=False,
+                 results_store=None,problem_name=None,flush_generations=100):
         
         '''         
         To use this library it is required the definition of the following parameters and functions:
@@ -978,7 +1771,65 @@ class OPTECOT:
         `beta`: Number of variances considered to calculate the confidence interval (by default 5).\n
         `kappa`: Number of previous optimal evaluation costs to be compared to assess heuristic interruption (by default 3).\n
         `popsize`: Population size to be considered in the CMA-ES, this value must be greater or equal to 20 (by default 20). \n
-        `in_parallel`: True or False if you want to evaluate the solutions of each population in parallel or sequentially, respectively (by default False).\n
+        `in_parallel`: True or False if you want to evaluate the solutions of each population in parallel or sequentially, respectively (by default False). 
+        When it is True, the evaluations of the initial calibration (used to compute |S| and t^{period}) are also computed in parallel, 
+        measuring the CPU time consumed by each evaluation in its worker.\n
+        `parallel_backend`: Backend used to evaluate the solutions when `in_parallel` is True, `'process'` (persistent pool of processes) or 
+        `'thread'` (pool of threads). By default `'process'`.\n
+        `n_jobs`: Number of workers used to evaluate the solutions in parallel (by default the number of CPUs available).\n
+        `objective_function_initializer`: Function without arguments that returns the objective function. When the solutions are 
+        evaluated in parallel, it is called only once in each worker of the pool, which lives during the whole execution of the 
+        CMA-ES (all generations and seeds). It allows to build the heavy state of the objective function (loaded files, libraries, 
+        models...) once per worker (by default None, the `objective_function` is sent to each worker).\n
+        `cache_size`, `cache_memory`: Maximum number of scores and maximum memory (in bytes) of the cache of scores placed in front 
+        of the objective function. The cache is indexed by the transformed solution and the value of theta, and is only created 
+        if at least one of them is given (by default None, no cache). It should only be used with deterministic objective functions.
+        The hit and miss statistics are available through `cache.statistics()`.\n
+        `cache_lookup_cost`: Time (in seconds) charged against `max_time` each time a score is read from the cache (by default None, 
+        the measured time of the lookup is charged, which is negligible compared to an evaluation).\n
+        `n_jobs_seeds`: Number of processes used to execute in parallel the independent runs (cost, seed) of the analyses with 
+        several seeds (`n_seeds>1`). Each run is executed on its own copy of the instance, so its time counters are isolated, 
+        and evaluates its populations sequentially (by default None, the runs are executed one after another).\n
+        `budget_clock`: Clock used to measure the time consumed from `max_time`, `'wall'` (wall time), `'cpu'` (CPU time 
+        consumed by the evaluations, which is not distorted when several runs share the machine) or `'virtual'` (each evaluation 
+        is charged the time per evaluation modelled in `df_acc_time` for its accuracy, so that the executions are deterministic 
+        and independent of the load and speed of the machine). By default None, `'cpu'` is used if the runs are executed in parallel 
+        (`n_jobs_seeds>1`) and `'wall'` otherwise.\n
+        `replay_path`: Path of the file (SQLite database) in which all the evaluations of the objective function (solution, theta, score 
+        and time) are recorded. When it already contains evaluations of previous executions (for example, with other values of `alpha`, 
+        `beta` or `kappa`), the repeated evaluations are served from the file, charging their recorded time, and the objective function is 
+        only evaluated for the new ones (by default None, the evaluations are not recorded). The hit and miss statistics are available 
+        through `replay.statistics()`.\n
+        `calibration_tolerance`: Tolerance of the adaptive calibration. When it is given, instead of always evaluating 100 random solutions 
+        with 10 accuracies, the solutions are added in batches of `calibration_batch_size` (by default 10) until, for all the accuracies, 
+        the 95% confidence interval of the mean time per evaluation has a half width lower than `calibration_tolerance` times the mean time 
+        per evaluation with the maximum accuracy, and the 95% confidence interval of the Spearman correlation with the maximum accuracy has 
+        a half width lower than `calibration_tolerance` (by default None, the 100 solutions are always evaluated). The number of evaluations 
+        saved is reported at the end of the calibration.\n
+        `calibration_cache`: Path of the directory of the calibration cache (see `CalibrationCache`). When it is given, the results of the 
+        calibration are stored in the cache indexed by a fingerprint of the definition of the problem (`xbounds`, `theta0`, `theta1`, the 
+        objective function, `objective_version` and the settings of the calibration), and the instances created later for the same problem 
+        load them from the cache instead of repeating the calibration (by default None, the calibration is always computed).\n
+        `objective_version`: Version tag of the objective function included in the fingerprint of the calibration cache. It must be changed 
+        when the objective function changes in a way that does not modify its code, for example the data or the simulator it uses (by default None).\n
+        `asynchronous`: True or False if the CMA-ES applying OPTECOT is executed in the asynchronous (steady-state) mode or generation by generation, 
+        respectively. The asynchronous mode is only used when the solutions are evaluated in parallel (`in_parallel=True`), and keeps all the 
+        workers busy when the evaluation times vary between solutions (see `execute_CMAES_with_OPTECOT_seed_asynchronous`). By default False.\n
+        `speculative_levels`: Number of levels of the tree of the bisection method whose midpoints are evaluated at once. With `speculative_levels=k`, 
+        the sample is evaluated in a single parallel step with the (at most) 2^k-1 accuracies that the next k iterations can need, and the path of 
+        the bisection is resolved afterwards, using more evaluations (charged to the budget) to reduce the number of sequential steps of each 
+        readjustment. It is intended for parallel evaluations (`in_parallel=True`). By default 1 (the midpoints are evaluated one after another).\n
+        `warm_start_bisection`: True or False if the readjustments of the accuracy (except the first one) are computed with a bracketing search 
+        that starts from the previous optimal accuracy and expands outwards only when needed (see `BracketSearch`), or with the bisection method 
+        on the whole interval, respectively. When it is True, two columns are added to the databases of the executions with OPTECOT: the number 
+        of evaluations of the sample made in each readjustment (`sample_evaluations`) and the number that the bisection method on the whole 
+        interval would have made (`sample_evaluations_bisection`). By default False.\n
+        `results_store`: Directory (or instance) of a `ResultsStore` where the databases of the executions are appended, partitioned by problem, 
+        experiment, heuristic, cost and seed, instead of being saved as CSV files in the data path. The graphs read the databases from the store 
+        when it is given. It requires pyarrow, unless the format of the store is CSV (by default None, the databases are saved as CSV files).\n
+        `problem_name`: Name of the problem in the partitions of `results_store` (by default None, the name of `objective_function`).\n
+        `flush_generations`: Number of generations of each run of the executions with more than one seed that are buffered before being written 
+        to `results_store` or to the checkpoints of the data path (by default 100).\n
         `min_sample_size`: Minimum value proposed to define the size of the sample of solutions from a population to be 
         considered for estimating the optimal cost using the bisection method (by default 10).\n
         `perc_cost`: Percentage of the total execution time (`max_time`) that we are willing to allow for the application of 
@@ -1001,6 +1852,16 @@ class OPTECOT:
             def objective_function(solution,theta=theta1):
                 ...
             return score
+
+        `objective_function_batch`: Optional function that implements the objective function for a whole set of solutions at once 
+        (for example, with a single vectorized pass). It must have two arguments, `population` (list of solutions) and `theta`, and return 
+        the list of scores of the solutions in the same order. When it is given, it is used to evaluate the populations and the samples 
+        of the bisection method, and the time of each call is split evenly between the solutions evaluated in it. The skeleton of the 
+        structure would be as follows::
+
+            def objective_function_batch(population,theta=theta1):
+                ...
+            return list_scores
         '''
     
         print('\nCreating an instance of OPTECOT:')
@@ -1010,73 +1871,104 @@ class OPTECOT:
 
         # Initialize arguments taking into account giving data.
         self.xdim=xdim
+        self.xbounds=xbounds
+        self.compile_scaled_solution_transformer()
         self.max_time=max_time
         self.theta0=theta0
         self.theta1=theta1
         self.objective_min=objective_min
         self.objective_function=objective_function
+        self.objective_function_batch=objective_function_batch
         self.alpha=alpha
         self.beta=beta
         self.kappa=kappa
         self.popsize=popsize
         self.in_parallel=in_parallel
+        self.parallel_backend=parallel_backend
+        self.n_jobs=n_jobs
+        self.objective_function_initializer=objective_function_initializer
+        self.n_jobs_seeds=n_jobs_seeds
+        self.asynchronous=asynchronous
+        self.speculative_levels=speculative_levels
+        self.warm_start_bisection=warm_start_bisection
+        if results_store is not None and not isinstance(results_store,ResultsStore):
+            results_store=ResultsStore(results_store)
+        self.results_store=results_store
+        self.problem_name=problem_name if problem_name is not None else objective_function.__name__
+        self.flush_generations=flush_generations
+        self.last_bisection_evaluations=[0,0]
+        if budget_clock is None:
+            budget_clock='cpu' if self.runs_in_parallel() else 'wall'
+        if budget_clock not in ['wall','cpu','virtual']:
+            raise ValueError("The budget clock must be 'wall', 'cpu' or 'virtual', but '"+str(budget_clock)+"' was given.")
+        self.budget_clock=budget_clock
+        self.parallel_run=False
+        self.evaluator=None
+        self.bisection_scores={}
+        self.time_reused_scores=0
+        if cache_size is not None or cache_memory is not None:
+            self.cache=ObjectiveCache(max_size=cache_size,max_memory=cache_memory,lookup_cost=cache_lookup_cost)
+        else:
+            self.cache=None
+        if replay_path is not None:
+            self.replay=ReplayStore(replay_path)
+        else:
+            self.replay=None
         self.min_sample_size=min_sample_size
         self.perc_cost=perc_cost
 
+        # Fingerprint of the settings of the runs, stored with the complete runs so that only the runs executed with the same settings are resumed.
+        run_settings={'xdim':xdim,'max_time':max_time,'objective_min':objective_min,'alpha':alpha,'beta':beta,'kappa':kappa,'popsize':popsize,
+                      'min_sample_size':min_sample_size,'perc_cost':perc_cost,'budget_clock':self.budget_clock,'asynchronous':asynchronous,
+                      'speculative_levels':speculative_levels,'warm_start_bisection':warm_start_bisection}
+        self.run_fingerprint=CalibrationCache.fingerprint(xbounds,theta0,theta1,objective_function,objective_version,run_settings)
+
         if customized_paths[0]== None:
             self.auxiliary_data_path=os.path.abspath(__file__).split('/')[-2]+'/results/auxiliary_data'
-            os.makedirs(self.auxiliary_data_path)
+            os.makedirs(self.auxiliary_data_path,exist_ok=True)
         else:
             self.auxiliary_data_path=customized_paths[0]
 
         if customized_paths[1]== None:
             self.data_path=os.path.abspath(__file__).split('/')[-2]+'/results/data'
-            os.makedirs(self.data_path)
+            os.makedirs(self.data_path,exist_ok=True)
         else:
             self.data_path=customized_paths[1]
 
         if customized_paths[2]== None:
             self.figure_path=os.path.abspath(__file__).split('/')[-2]+'/results/figures'
-            os.makedirs(self.figure_path)
+            os.makedirs(self.figure_path,exist_ok=True)
         else:
             self.figure_path=customized_paths[2]
 
-        # Implement scaled solution transformer function.
-        def scaled_solution_transformer(scaled_x):
-            '''Transform the scaled values of a solution to the real values.'''
-
-            # To transform contunuous parameters.
-            def transform_continuous(scaled_value,bounds):
-                return scaled_value*(bounds[1]-bounds[0])+bounds[0]
-
-            # To transform discrete parameters.
-            def transform_discrete(scaled_value,possible_values):
-                discretization=np.arange(0,1+1/len(possible_values),1/len(possible_values))
-                detection_list=discretization>scaled_value
-                return possible_values[list(detection_list).index(True)-1]
-            
-            real_x=[]
-            for i in range(len(xbounds)):
-                bounds=xbounds[i]
-                if type(bounds)==set:
-                    real_x.append(transform_discrete(scaled_x[i],list(bounds)))
-                else:
-                    real_x.append(transform_continuous(scaled_x[i],bounds))
-
-            return real_x
-        self.scaled_solution_transformer=scaled_solution_transformer
-
-
         print('    Setting explicitly indicated parameters'+ colored('    DONE','light_cyan'))
         print('    Computing |S| and t^{period}... ',end='\r')
         sys.stdout.flush()
 
+        # Fingerprint of the calibration, which identifies its evaluations in the cache and in an interrupted calibration to be resumed.
+        calibration_settings={'clock':'cpu' if in_parallel else (self.budget_clock if self.budget_clock!='virtual' else 'wall'),
+                              'tolerance':calibration_tolerance,'batch_size':calibration_batch_size if calibration_tolerance is not None else None}
+        self.calibration_fingerprint=CalibrationCache.fingerprint(xbounds,theta0,theta1,objective_function,objective_version,calibration_settings)
+
+        # Look for the calibration of the problem in the cache.
+        df_acc_time=None
+        if calibration_cache is not None and customized_paths==[None,None,None]:
+            self.calibration_cache=CalibrationCache(calibration_cache)
+            df_acc_time=self.calibration_cache.load_df_acc_time(self.calibration_fingerprint,self.auxiliary_data_path)
+
+            # The evaluations of a calibration not found in the cache are written in its entry, so that an interrupted calibration 
+            # is only resumed for the same problem.
+            calibration_path=self.calibration_cache.entry_path(self.calibration_fingerprint)
+            os.makedirs(calibration_path,exist_ok=True)
+        else:
+            calibration_path=self.auxiliary_data_path
+            self.calibration_cache=None
+
         # Compute the rest of arguments using given data.
         if customized_paths!= [None,None,None]:
             df_acc_time=pd.read_csv(customized_paths[0]+'/df_acc_time.csv',index_col=0)
 
-
-        else: 
+        elif df_acc_time is None: 
             def generate_random_solutions(n_sample=100):   
                 '''Create a random set of solutions.'''
                     
@@ -1097,15 +1989,37 @@ class OPTECOT:
 
                 return set_solutions
         
-            df_acc_time=AuxiliaryFunctions.extract_info_evaluating_set_with_equidistant_accuracies(generate_random_solutions(),objective_function,theta0,theta1,self.auxiliary_data_path)
+            # When the solutions are evaluated in parallel, the calibration is also computed in parallel, measuring the CPU time 
+            # of each evaluation in its worker so that the workers sharing the machine do not distort the times per evaluation.
+            if in_parallel:
+                calibration_evaluator=PopulationEvaluator(objective_function,backend=parallel_backend,n_jobs=n_jobs,initializer=objective_function_initializer,clock='cpu')
+            else:
+                calibration_evaluator=PopulationEvaluator(objective_function,clock=self.budget_clock if self.budget_clock!='virtual' else 'wall')
+            try:
+                df_acc_time=AuxiliaryFunctions.extract_info_evaluating_set_with_equidistant_accuracies(generate_random_solutions(),objective_function,theta0,theta1,calibration_path,evaluator=calibration_evaluator,
+                                                                                                        tolerance=calibration_tolerance,batch_size=calibration_batch_size,
+                                                                                                        fingerprint=self.calibration_fingerprint)
+            finally:
+                calibration_evaluator.close()
+            if self.calibration_cache is not None:
+                df_acc_time=self.calibration_cache.load_df_acc_time(self.calibration_fingerprint,self.auxiliary_data_path)
         
         self.interpolation_acc=list(df_acc_time['accuracy'])
         self.interpolation_time=list(df_acc_time['time_per_eval'])
         self.lower_time=min(self.interpolation_time)
         self.upper_time=max(self.interpolation_time)
 
-        self.sample_size,self.heuristic_freq=AuxiliaryFunctions.SampleSize_TimePeriod_bisection_method(popsize,min_sample_size,perc_cost,df_acc_time)
-        self.interruption_threshold=AuxiliaryFunctions.interruption_threshold(popsize,self.sample_size,df_acc_time,self.auxiliary_data_path)
+        parameters=None
+        if self.calibration_cache is not None:
+            parameters=self.calibration_cache.load_parameters(self.calibration_fingerprint,popsize,min_sample_size,perc_cost)
+        if parameters is not None:
+            self.sample_size,self.heuristic_freq,self.interruption_threshold=parameters
+        else:
+            self.sample_size,self.heuristic_freq=AuxiliaryFunctions.SampleSize_TimePeriod_bisection_method(popsize,min_sample_size,perc_cost,df_acc_time)
+            self.interruption_threshold=AuxiliaryFunctions.interruption_threshold(popsize,self.sample_size,df_acc_time,self.auxiliary_data_path)
+            if self.calibration_cache is not None:
+                self.calibration_cache.store(self.calibration_fingerprint,self.auxiliary_data_path,popsize,min_sample_size,perc_cost,
+                                             self.sample_size,self.heuristic_freq,self.interruption_threshold)
         
         print('    Computing |S| and t^{period}'+ colored('   DONE     ','light_cyan'))
         print(colored('Instance of OPTECOT created.','light_yellow',attrs=["bold"]))
@@ -1128,62 +2042,38 @@ class OPTECOT:
 
         Return
         ======
-        `list_scores`: List with the scores associated to each solution that forms the population.
+        `list_scores`: List with the scores associated to each solution that forms the population. The wall time of each evaluation 
+        is stored in the attribute `last_evaluation_times`.
         '''
 
-        # Obtain scores and times per evaluation.
-        list_scores=[]
-        elapsed_time=0
+        theta=self.accuracy_to_theta(accuracy)
 
-        if self.theta1>self.theta0:
-            theta=int(self.theta1*accuracy)
-        else:
-            theta=int(self.theta1/accuracy)
-
-        if not self.in_parallel:
-            for solution in population:
-                t=time.time()
-                score=objective_function(solution, theta=theta)
-                elapsed_time+=time.time()-t
-                list_scores.append(score)
-
-                if self.print_message is not False:
-                    if self.unique_seed:
-                        if elapsed_time+self.time_acc+self.time_proc>self.max_time:
-                            print("Executing CMA-ES appliying OPTECOT... "+colored('100.00%','light_cyan'),end='\r')
-                            sys.stdout.flush()
-                        else:
-                            print("Executing CMA-ES appliying OPTECOT... "+colored('{:.2f}'.format(((elapsed_time+self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
-                            sys.stdout.flush()
-
-                    else:
-                        if elapsed_time+self.time_acc+self.time_proc>self.max_time:
-                            print("    Processing execution with seed "+str(self.print_message-1)+'...   '+colored('100.00%','light_cyan'),end='\r')
-                            sys.stdout.flush()
-                        else:
-                            print("    Processing execution with seed "+str(self.print_message-1)+'...   '+colored('{:.2f}'.format(((elapsed_time+self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
-                            sys.stdout.flush()
-        
-        if self.in_parallel:
-            n_jobs=cpu_count()
-            os.makedirs(sys.path[0]+'/PopulationScores')
+        # Reuse the scores obtained for the sample of the population during the bisection method.
+        list_scores=[None]*len(population)
+        self.last_evaluation_times=[0]*len(population)
+        ind_eval=[]
+        for i in range(len(population)):
+            key=(AuxiliaryFunctions.solution_key(population[i]),theta)
+            if count_time_gen and key in self.bisection_scores:
+                list_scores[i]=self.bisection_scores[key]
+            else:
+                ind_eval.append(i)
 
-            def parallel_f(solution,index):
-                score=objective_function(solution, theta=theta)
-                np.save(sys.path[0]+'/PopulationScores'+'/'+str(index),score)
+        # Obtain scores and times per evaluation.
+        if objective_function is self.objective_function:
+            new_scores,new_times,elapsed_time=self.evaluate_solutions([population[i] for i in ind_eval],theta,callback=self.print_progress)
+        else:
+            new_scores,new_times,elapsed_time=PopulationEvaluator(objective_function).evaluate([population[i] for i in ind_eval],theta,callback=self.print_progress)
+        for i,score,elapsed in zip(ind_eval,new_scores,new_times):
+            list_scores[i]=score
+            self.last_evaluation_times[i]=elapsed
 
-            t=time.time()
-            Parallel(n_jobs=n_jobs)(delayed(parallel_f)(population[i],i) for i in range(len(population)))
-            elapsed_time+=time.time()-t
-
-            def obtain_score_list(popsize):
-                list_scores=[]
-                for i in range(popsize):
-                    score=float(np.load(sys.path[0]+'/PopulationScores'+'/'+str(i)+'.npy'))
-                    list_scores.append(score) 
-                shutil.rmtree(sys.path[0]+'/PopulationScores',ignore_errors=True)
-                return list_scores
-            list_scores=obtain_score_list(len(population))
+        # The evaluation time of the reused scores (subtracted from time_acc in execute_OPTECOT) is counted as natural time.
+        if count_time_gen:
+            if len(ind_eval)<len(population):
+                elapsed_time+=self.time_reused_scores
+            self.bisection_scores={}
+            self.time_reused_scores=0
 
         # Update time counters.
         if count_time_acc and not count_time_gen:
@@ -1196,56 +2086,512 @@ class OPTECOT:
         return list_scores
 
 
-    def bisection_method(self,population,train_seed):
-        '''Adapted implementation of bisection method.'''
+    def get_evaluator(self):
+        '''Return the evaluator of the populations, built according to the current value of `in_parallel`, `budget_clock` and `objective_function_batch`.'''
+        backend=self.parallel_backend if self.in_parallel else 'serial'
+        clock=self.budget_clock if self.budget_clock!='virtual' else 'wall'
+        if self.evaluator is None or self.evaluator.backend!=backend or self.evaluator.clock!=clock or self.evaluator.batch_function is not self.objective_function_batch:
+            if self.evaluator is not None:
+                self.evaluator.close()
+            self.evaluator=PopulationEvaluator(self.objective_function,backend=backend,n_jobs=self.n_jobs,initializer=self.objective_function_initializer,clock=clock,
+                                               batch_function=self.objective_function_batch)
+        return self.evaluator
 
-        # Initialize lower and upper limit.
-        time0=self.lower_time
-        time1=self.upper_time   
+    def __getstate__(self):
+        # The pool of workers can not be sent to other processes, each copy of the instance builds its own evaluator.
+        state=self.__dict__.copy()
+        state['evaluator']=None
+        return state
 
-        # Midpoint.
-        prev_m=time0
-        m=(time0+time1)/2
+    def runs_in_parallel(self):
+        '''Return True if the independent runs (cost, seed) are executed in parallel.'''
+        return self.n_jobs_seeds is not None and self.n_jobs_seeds>1
 
-        # Function to calculate the correlation between the rankings of the sample_size random solution using the current and maximum accuracy.
-        def similarity_between_current_best_acc(acc,population,train_seed,first_iteration):
-            global time_acc
+    @staticmethod
+    def execute_run_in_worker(optecot,method_name,args):
+        '''Execute a run (cost, seed) in a worker process, on its own copy of the instance and evaluating the populations sequentially.'''
+        optecot.in_parallel=False
+        optecot.parallel_run=True
+        try:
+            return getattr(optecot,method_name)(*args)
+        finally:
+            optecot.close()
+
+    def execute_runs(self,method_name,list_args,callback=None):
+        '''
+        Execute a set of independent runs (cost, seed) of the CMA-ES, sequentially or distributed across `n_jobs_seeds` processes.
 
-            # Randomly select sample_size solutions forming the generation.
-            random.seed(train_seed)
-            ind_sol=random.sample(range(len(population)),self.sample_size)
-            list_solutions=list(np.array(population)[ind_sol])
+        Parameters
+        ==========
+        `method_name`: Name of the method that executes a run and returns the list with its rows of data.\n
+        `list_args`: List with the arguments of each run.\n
+        `callback`: Function called each time a run is completed, which receives as arguments the index of the run and its rows 
+        (by default None).
 
-            # Save the scores associated with each selected solution.
+        Return
+        ======
+        `list_results`: List with the rows returned by each run, in the same order as `list_args`.
+        '''
+        list_results=[None]*len(list_args)
+
+        if not self.runs_in_parallel() or len(list_args)==1:
+            for i in range(len(list_args)):
+                list_results[i]=getattr(self,method_name)(*list_args[i])
+                if self.replay is not None:
+                    self.replay.flush()
+                if callback is not None:
+                    callback(i,list_results[i])
+            return list_results
+
+        # The evaluations recorded by the workers are written in the file of the replay store when each run finishes.
+        if self.replay is not None:
+            self.replay.flush()
+
+        with ProcessPoolExecutor(max_workers=self.n_jobs_seeds) as pool:
+            futures={pool.submit(OPTECOT.execute_run_in_worker,self,method_name,list_args[i]):i for i in range(len(list_args))}
+            for future in as_completed(futures):
+                i=futures[future]
+                list_results[i]=future.result()
+                if callback is not None:
+                    callback(i,list_results[i])
+        if self.replay is not None:
+            self.replay.load()
+        return list_results
+
+    def close(self):
+        '''Shut down the pool of workers used to evaluate the populations in parallel and write the pending evaluations of the replay store.'''
+        if self.evaluator is not None:
+            self.evaluator.close()
+            self.evaluator=None
+        if self.replay is not None:
+            self.replay.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.close()
+
+    def evaluate_solutions(self,population,theta,callback=None):
+        '''
+        Evaluate a set of solutions with the same value of theta, reading from the cache (if it is enabled) the scores 
+        already obtained. Each score read from the cache is charged with the lookup cost of the cache instead of its 
+        evaluation time. The evaluations found in the replay store (if it is enabled) are charged with their recorded 
+        time, and the new evaluations are recorded in it. With the `'virtual'` budget clock, each evaluation is charged 
+        the modelled time per evaluation of its accuracy instead of the measured time.
+
+        Returns
+        =======
+        `list_scores`: List with the scores associated to each solution.\n
+        `list_times`: List with the time charged for each solution.\n
+        `elapsed_time`: Time charged for the whole set.
+        '''
+        if self.budget_clock=='virtual':
+            evaluation_time=self.modelled_evaluation_time(theta)
+            if callback is not None:
+                n_evaluated=[0]
+                def virtual_callback(elapsed_time):
+                    n_evaluated[0]+=1
+                    callback(n_evaluated[0]*evaluation_time)
+            else:
+                virtual_callback=None
+
+        if self.cache is None and self.replay is None:
+            if self.budget_clock=='virtual':
+                list_scores,_,_=self.get_evaluator().evaluate(population,theta,callback=virtual_callback)
+                return list_scores,[evaluation_time]*len(population),sum([evaluation_time]*len(population))
+            return self.get_evaluator().evaluate(population,theta,callback=callback)
+
+        list_scores=[None]*len(population)
+        list_times=[0]*len(population)
+        elapsed_time=0
+
+        # Read the stored scores and group the rest of the solutions, so that repeated solutions are evaluated only once 
+        # when the cache is enabled.
+        ind_eval={}
+        time_function=PopulationEvaluator.clocks[self.budget_clock if self.budget_clock!='virtual' else 'wall']
+        for i in range(len(population)):
+            key=AuxiliaryFunctions.solution_key(population[i])
+
+            if self.cache is not None:
+                t=time_function()
+                found,score=self.cache.get(population[i],theta)
+                if found or key in ind_eval:
+                    if self.cache.lookup_cost is not None:
+                        list_times[i]=self.cache.lookup_cost
+                    elif self.budget_clock=='virtual':
+                        list_times[i]=evaluation_time
+                    else:
+                        list_times[i]=time_function()-t
+                    elapsed_time+=list_times[i]
+                    if found:
+                        list_scores[i]=score
+                    else:
+                        ind_eval[key].append(i)
+                    continue
+
+            if self.replay is not None:
+                found,score,recorded_time=self.replay.get(population[i],theta)
+                if found:
+                    list_scores[i]=score
+                    list_times[i]=evaluation_time if self.budget_clock=='virtual' else recorded_time
+                    elapsed_time+=list_times[i]
+                    if self.cache is not None:
+                        self.cache.put(population[i],theta,score)
+                    continue
+
+            if key in ind_eval:
+                ind_eval[(key,i)]=[i]
+            else:
+                ind_eval[key]=[i]
+
+        # Evaluate the rest of the solutions and store their scores.
+        list_ind=[ind[0] for ind in ind_eval.values()]
+        if self.budget_clock=='virtual':
+            new_scores,new_times,_=self.get_evaluator().evaluate([population[i] for i in list_ind],theta,callback=virtual_callback)
+        else:
+            new_scores,new_times,new_elapsed_time=self.get_evaluator().evaluate([population[i] for i in list_ind],theta,callback=callback)
+        for ind,score,new_time in zip(ind_eval.values(),new_scores,new_times):
+            if self.cache is not None:
+                self.cache.put(population[ind[0]],theta,score)
+            if self.replay is not None:
+                self.replay.record(population[ind[0]],theta,score,new_time)
+            list_times[ind[0]]=new_time if self.budget_clock!='virtual' else evaluation_time
+            for i in ind:
+                list_scores[i]=score
+
+        # With the virtual clock the charged time does not depend on which evaluations were served from the stores.
+        if self.budget_clock=='virtual':
+            return list_scores,list_times,sum(list_times)
+        return list_scores,list_times,elapsed_time+new_elapsed_time
+
+    def evaluate_solution_pairs(self,population,list_theta):
+        '''
+        Evaluate each solution of a set with its own value of theta in a single (parallel) step, reading the stored evaluations from 
+        the cache or the replay store (if they are enabled) and recording the new ones.
+
+        Returns
+        =======
+        `list_scores`: List with the scores associated to each solution.\n
+        `list_times`: List with the time charged for each solution.\n
+        `elapsed_time`: Time charged for the whole set. With the `'wall'` budget clock and a pool of workers it is the wall time of 
+        the step, otherwise the sum of the charged times.
+        '''
+        list_scores=[None]*len(population)
+        list_times=[0]*len(population)
+        ind_eval=[]
+        for i in range(len(population)):
+            found,score,stored_time=self.stored_evaluation(population[i],list_theta[i])
+            if found:
+                list_scores[i]=score
+                list_times[i]=stored_time
+            else:
+                ind_eval.append(i)
+
+        evaluator=self.get_evaluator()
+        t=time.time()
+        new_scores,new_times=evaluator.evaluate_pairs([population[i] for i in ind_eval],[list_theta[i] for i in ind_eval])
+        wall_time=time.time()-t
+        for i,score,new_time in zip(ind_eval,new_scores,new_times):
+            self.record_evaluation(population[i],list_theta[i],score,new_time)
+            list_scores[i]=score
+            list_times[i]=new_time
+
+        if self.budget_clock=='virtual':
+            list_times=[self.modelled_evaluation_time(theta) for theta in list_theta]
+        elif self.budget_clock=='wall' and evaluator.backend!='serial':
+            return list_scores,list_times,wall_time+sum(list_times)-sum(new_times)
+        return list_scores,list_times,sum(list_times)
+
+    def stored_evaluation(self,solution,theta):
+        '''
+        Return True, the score and the time to be charged if the evaluation of `solution` with `theta` is stored in the cache or 
+        in the replay store (if they are enabled), otherwise False, None and None.
+        '''
+        if self.cache is not None:
+            time_function=PopulationEvaluator.clocks[self.budget_clock if self.budget_clock!='virtual' else 'wall']
+            t=time_function()
+            found,score=self.cache.get(solution,theta)
+            if found:
+                return True,score,self.cache.lookup_cost if self.cache.lookup_cost is not None else time_function()-t
+        if self.replay is not None:
+            found,score,recorded_time=self.replay.get(solution,theta)
+            if found:
+                if self.cache is not None:
+                    self.cache.put(solution,theta,score)
+                return True,score,recorded_time
+        return False,None,None
+
+    def record_evaluation(self,solution,theta,score,evaluation_time):
+        '''Store a new evaluation of `solution` with `theta` in the cache and in the replay store (if they are enabled).'''
+        if self.cache is not None:
+            self.cache.put(solution,theta,score)
+        if self.replay is not None:
+            self.replay.record(solution,theta,score,evaluation_time)
+
+    def evaluate_best_solution(self,best_solution):
+        '''Evaluate the best solution found so far with the original objective function (this time is not counted in `max_time`).'''
+        if self.cache is None and self.replay is None:
+            return self.objective_function(best_solution)
+        if self.cache is not None:
+            found,score=self.cache.get(best_solution,self.theta1)
+            if found:
+                return score
+        if self.replay is not None:
+            found,score,_=self.replay.get(best_solution,self.theta1)
+        if self.replay is None or not found:
             t=time.time()
-            best_scores=self.evaluate_population(self.objective_function,list_solutions,1,count_time_acc=first_iteration)# Maximum accuracy. 
-            new_scores=self.evaluate_population(self.objective_function,list_solutions,acc)# new accuracy. 
-            last_time_acc_increase=time.time()-t
+            score=self.objective_function(best_solution,theta=self.theta1)
+            if self.replay is not None:
+                self.replay.record(best_solution,self.theta1,score,time.time()-t)
+        if self.cache is not None:
+            self.cache.put(best_solution,self.theta1,score)
+        return score
+
+    def print_progress(self,elapsed_time):
+        '''Print the percentage of `max_time` consumed while a population is being evaluated.'''
+        if self.print_message is not False and not self.parallel_run:
+            if self.unique_seed:
+                if elapsed_time+self.time_acc+self.time_proc>self.max_time:
+                    print("Executing CMA-ES appliying OPTECOT... "+colored('100.00%','light_cyan'),end='\r')
+                    sys.stdout.flush()
+                else:
+                    print("Executing CMA-ES appliying OPTECOT... "+colored('{:.2f}'.format(((elapsed_time+self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
+                    sys.stdout.flush()
 
-            # Obtain associated rankings.
-            new_ranking=AuxiliaryFunctions.from_scores_to_ranking(new_scores)# New accuracy. 
-            best_ranking=AuxiliaryFunctions.from_scores_to_ranking(best_scores)# Maximum accuracy. 
-                    
-            # Compare two rankings.
-            metric_value=AuxiliaryFunctions.spearman_corr(new_ranking,best_ranking)
+            else:
+                if elapsed_time+self.time_acc+self.time_proc>self.max_time:
+                    print("    Processing execution with seed "+str(self.print_message-1)+'...   '+colored('100.00%','light_cyan'),end='\r')
+                    sys.stdout.flush()
+                else:
+                    print("    Processing execution with seed "+str(self.print_message-1)+'...   '+colored('{:.2f}'.format(((elapsed_time+self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
+                    sys.stdout.flush()
+
+    def accuracy_to_theta(self,accuracy):
+        '''Calculate the value of the theta parameter associated with an accuracy.'''
+        if self.theta1>self.theta0:
+            return int(self.theta1*accuracy)
+        else:
+            return int(self.theta1/accuracy)
 
-            return metric_value,last_time_acc_increase
+    def theta_to_accuracy(self,theta):
+        '''Calculate the accuracy associated with a value of the theta parameter.'''
+        if self.theta1>self.theta0:
+            return theta/self.theta1
+        else:
+            return self.theta1/theta
+
+    def modelled_evaluation_time(self,theta):
+        '''Time per evaluation of the objective function with `theta`, interpolated from the accuracy-time relation (`df_acc_time`).'''
+        return float(np.interp(self.theta_to_accuracy(theta),self.interpolation_acc,self.interpolation_time))
+
+    def compile_scaled_solution_transformer(self):
+        '''
+        Precompute the data used to transform the scaled solutions to the real values: the lower bounds and widths of the 
+        continuous components, and the bin edges and the tables of possible values of the discrete components.
+        '''
+        self.continuous_components=[i for i in range(len(self.xbounds)) if type(self.xbounds[i])!=set]
+        self.continuous_lower=np.array([self.xbounds[i][0] for i in self.continuous_components],dtype=float)
+        self.continuous_width=np.array([self.xbounds[i][1]-self.xbounds[i][0] for i in self.continuous_components],dtype=float)
+
+        self.discrete_components=[]
+        for i in range(len(self.xbounds)):
+            if type(self.xbounds[i])==set:
+                possible_values=list(self.xbounds[i])
+                table=np.empty(len(possible_values),dtype=object)
+                table[:]=possible_values
+                discretization=np.arange(0,1+1/len(possible_values),1/len(possible_values))
+                self.discrete_components.append((i,discretization,table))
+
+    def scaled_population_transformer(self,scaled_population):
+        '''
+        Transform the scaled values of a set of solutions (array of shape (popsize,xdim)) to the real values in a single 
+        vectorized pass. Return an array of floats if all the components are continuous, otherwise an array of objects 
+        that keeps the original type of the possible values of the discrete components.
+        '''
+        scaled_population=np.atleast_2d(np.asarray(scaled_population,dtype=float))
+
+        if len(self.discrete_components)==0:
+            real_population=np.empty(scaled_population.shape,dtype=float)
+        else:
+            real_population=np.empty(scaled_population.shape,dtype=object)
+
+        # To transform continuous parameters.
+        real_population[:,self.continuous_components]=scaled_population[:,self.continuous_components]*self.continuous_width+self.continuous_lower
+
+        # To transform discrete parameters (the possible value is the one of the bin in which the scaled value falls).
+        for i,discretization,table in self.discrete_components:
+            ind=np.searchsorted(discretization,scaled_population[:,i],side='right')-1
+            real_population[:,i]=table[np.clip(ind,0,len(table)-1)]
+
+        return real_population
+
+    def scaled_solution_transformer(self,scaled_x):
+        '''Transform the scaled values of a solution to the real values.'''
+        return self.scaled_population_transformer([scaled_x])[0]
+
+    def bisection_method(self,population,train_seed,previous_accuracy=None):
+        '''
+        Adapted implementation of bisection method. The scores of the sample obtained with the maximum accuracy are 
+        computed only once per call, and the scores obtained with each accuracy are stored in the attribute `bisection_scores` 
+        so that the sample is not evaluated again when the population is evaluated with the selected accuracy. If `warm_start_bisection` 
+        is True and the `previous_accuracy` is given, the bracketing search is started from it instead of using the whole interval.
+        '''
+
+        # Initialize the interval with the lower and upper limit (or the search from the previous optimal accuracy).
+        search=self.get_search(previous_accuracy)
+
+        # Randomly select sample_size solutions forming the generation (the same sample is used in all the iterations).
+        random.seed(train_seed)
+        ind_sol=random.sample(range(len(population)),self.sample_size)
+        list_solutions=list(np.array(population)[ind_sol])
+
+        # Scores obtained for the sample during the bisection, to be reused when the population is evaluated.
+        self.bisection_scores={}
+        def save_bisection_scores(list_scores,accuracy):
+            theta=self.accuracy_to_theta(accuracy)
+            for solution,score in zip(list_solutions,list_scores):
+                self.bisection_scores[(AuxiliaryFunctions.solution_key(solution),theta)]=score
+
+        if self.speculative_levels>1:
+            return self.speculative_bisection_method(search,list_solutions)
+        theta_times={}
+
+        # Ranking of the sample with the maximum accuracy (computed only once per bisection call).
+        t=self.time_acc
+        best_scores=self.evaluate_population(self.objective_function,list_solutions,1)
+        theta_times[self.accuracy_to_theta(1)]=self.time_acc-t
+        best_ranking=rank(best_scores)
+        save_bisection_scores(best_scores,1)
+
+        # Function to calculate the correlation between the rankings of the sample_size random solution using the current and maximum accuracy.
+        def similarity_between_current_best_acc(acc):
+
+            # Save the scores associated with each selected solution (the time charged to time_acc is the evaluation time).
+            t=self.time_acc
+            new_scores=self.evaluate_population(self.objective_function,list_solutions,acc)# new accuracy. 
+            theta_times[self.accuracy_to_theta(acc)]=self.time_acc-t
+            save_bisection_scores(new_scores,acc)
+
+            # Compare the ranking of the new accuracy with the ranking of the maximum accuracy.
+            return spearman(new_scores,best_ranking,method='ordinal')
 
         # Reset interval limits until the interval has a sufficiently small range.
-        first_iteration=True
-        stop_threshold=(time1-time0)*0.1
-        while time1-time0>stop_threshold:
-            metric_value,last_time_acc_increase=similarity_between_current_best_acc(np.interp(m,self.interpolation_time,self.interpolation_acc),population,train_seed,first_iteration)
-            if metric_value>=self.alpha:
-                time1=m
-            else:
-                time0=m
+        n_iterations=0
+        while not search.finished():
+            metric_value=similarity_between_current_best_acc(search.accuracy())
+            search.update(metric_value>=self.alpha)
+            n_iterations+=1
+
+        # The time of the evaluations of the sample with the selected accuracy is returned, as they are reused to evaluate the population.
+        self.count_bisection_evaluations(len(list_solutions)*(1+n_iterations))
+        return search.result(),theta_times.get(self.accuracy_to_theta(search.result()),0)
+
+    def get_search(self,previous_accuracy=None):
+        '''Return the search of the optimal accuracy to be used in a readjustment (`BisectionSearch` or `BracketSearch`).'''
+        if self.warm_start_bisection and previous_accuracy is not None:
+            start_time=np.interp(previous_accuracy,self.interpolation_acc,self.interpolation_time)
+            return BracketSearch(self.lower_time,self.upper_time,start_time,self.interpolation_time,self.interpolation_acc)
+        return BisectionSearch(self.lower_time,self.upper_time,self.interpolation_time,self.interpolation_acc)
+
+    def count_bisection_evaluations(self,n_evaluations):
+        '''
+        Store in `last_bisection_evaluations` the number of evaluations of the sample made in the last readjustment and the number 
+        that the bisection method on the whole interval makes.
+        '''
+        self.last_bisection_evaluations=[n_evaluations,self.sample_size*(1+BisectionSearch.number_of_iterations(self.lower_time,self.upper_time))]
 
-            prev_m=m
-            m=(time0+time1)/2
+    def speculative_bisection_method(self,search,list_solutions):
+        '''
+        Speculative implementation of the bisection method. In each step, the sample is evaluated at once (in parallel, if `in_parallel` 
+        is True) with all the accuracies that the next `speculative_levels` iterations of the bisection method can need (and, in the first 
+        step, with the maximum accuracy), and then the iterations are resolved with the scores obtained. The selected accuracy is the same 
+        as in the sequential implementation, but the sample is also evaluated with the accuracies of the paths not followed. The time of 
+        each step is charged to `time_acc`, and the part of it associated with the selected accuracy is returned as in `bisection_method`.
+        '''
+        best_theta=self.accuracy_to_theta(1)
+        theta_times={}
+        n_evaluations=0
+        while not search.finished():
+
+            # Accuracies of the step whose scores are not known yet.
+            list_theta=[]
+            speculative_theta=[self.accuracy_to_theta(acc) for acc in search.speculative_accuracies(self.speculative_levels)]
+            for theta in [best_theta]+speculative_theta:
+                if theta not in list_theta and (AuxiliaryFunctions.solution_key(list_solutions[0]),theta) not in self.bisection_scores:
+                    list_theta.append(theta)
+
+            # Evaluate the sample with all of them in a single step.
+            list_scores,list_times,elapsed_time=self.evaluate_solution_pairs([solution for theta in list_theta for solution in list_solutions],
+                                                                             [theta for theta in list_theta for solution in list_solutions])
+            self.time_acc+=elapsed_time
+            n_evaluations+=len(list_scores)
+            for j,theta in enumerate(list_theta):
+                scores=list_scores[j*len(list_solutions):(j+1)*len(list_solutions)]
+                for solution,score in zip(list_solutions,scores):
+                    self.bisection_scores[(AuxiliaryFunctions.solution_key(solution),theta)]=score
+
+                # Part of the time of the step associated with each accuracy.
+                theta_times[theta]=elapsed_time*sum(list_times[j*len(list_solutions):(j+1)*len(list_solutions)])/sum(list_times) if sum(list_times)>0 else 0
+
+            # Correlations of all the accuracies of the step with the maximum accuracy (computed at once).
+            list_keys=[AuxiliaryFunctions.solution_key(solution) for solution in list_solutions]
+            step_theta=list(dict.fromkeys(theta for theta in speculative_theta if (list_keys[0],theta) in self.bisection_scores))
+            correlations=spearman([[self.bisection_scores[(key,theta)] for key in list_keys] for theta in step_theta],
+                                  [self.bisection_scores[(key,best_theta)] for key in list_keys],method='ordinal') if step_theta else []
+            correlations=dict(zip(step_theta,correlations))
+
+            # Resolve the iterations of the step (until an accuracy not evaluated in the step is needed).
+            for level in range(self.speculative_levels):
+                theta=self.accuracy_to_theta(search.accuracy())
+                if search.finished() or theta not in correlations:
+                    break
+                search.update(correlations[theta]>=self.alpha)
+
+        self.count_bisection_evaluations(n_evaluations)
+        return search.result(),theta_times.get(self.accuracy_to_theta(search.result()),0)
+
+    def readjustment_decision(self,gen,list_accuracies,list_variances):
+        '''
+        Decide if the accuracy must be readjusted in the generation `gen` (or window, in the asynchronous mode), given the optimal 
+        accuracies and the variances of the scores of the previous ones.
+
+        Returns
+        =======
+        `decision`: `'bisection'` if the bisection method must be applied, `'stop'` if the heuristic is interrupted from now on 
+        (the maximum accuracy is used) or None if the accuracy is kept.
+        '''
+        if gen==0: 
+            return 'bisection'
+
+        # If the last kappa optimal accuracies is equal to the maximum possible optimal cost, the maximum accuracy will be considered as optimal from now on.
+        decision=None
+        if len(list_accuracies)>=self.kappa+1:    
+            if self.stop_heuristic==False:
+                prev_acc=list_accuracies[-self.kappa:]
+                prev_acc_high=np.array(prev_acc)==self.interruption_threshold
+                if sum(prev_acc_high)==self.kappa:
+                    self.stop_heuristic=True
+                    decision='stop'
+        
+        if len(list_variances)>=self.beta+1 and self.stop_heuristic==False:
+            # Compute the confidence interval.
+            variance_q05=np.mean(list_variances[(-1-self.beta):-1])-2*np.std(list_variances[(-1-self.beta):-1])
+            variance_q95=np.mean(list_variances[(-1-self.beta):-1])+2*np.std(list_variances[(-1-self.beta):-1])
+            last_variance=list_variances[-1]
+            
+            # Compute the minimum accuracy with which the maximum quality is obtained.
+            if last_variance<variance_q05 or last_variance>variance_q95:
+
+                if (self.time_proc+self.time_acc)-self.last_time_heuristic_accepted>=self.heuristic_freq:   
+                    self.unused_bisection_executions+=int((self.time_proc+self.time_acc-self.last_time_heuristic_accepted)/self.heuristic_freq)-1
+                    decision='bisection'
+                else:
+                    if self.unused_bisection_executions>0:
+                        self.unused_bisection_executions-=1
+                        decision='bisection'
 
-            first_iteration=False
-        return np.interp(prev_m,self.interpolation_time,self.interpolation_acc),last_time_acc_increase
+        return decision
 
     def execute_OPTECOT(self,gen,acc,population,train_seed,list_accuracies,list_variances):
         '''
@@ -1263,51 +2609,33 @@ class OPTECOT:
         Returns
         =======
         `acc`: Accuracy value of `theta` selected as optimal.\n
-        `time_best_acc`: Evaluation time consumed in the last iteration of the bisection method.
+        `readjustment`: True if the accuracy has been readjusted with the bisection method, False otherwise.
         '''
 
         time_best_acc=0
 
         # Heuristic application: The accuracy is updated when it is detected that the variance of the scores of the last 
         # population is significantly different from the previous ones.
-        if gen==0: 
-            acc,time_best_acc=self.bisection_method(population,train_seed)
-        else:
-            # If the last kappa optimal accuracies is equal to the maximum possible optimal cost, the maximum accuracy will be considered as optimal from now on.
-            if len(list_accuracies)>=self.kappa+1:    
-                if self.stop_heuristic==False:
-                    prev_acc=list_accuracies[-self.kappa:]
-                    prev_acc_high=np.array(prev_acc)==self.interruption_threshold
-                    if sum(prev_acc_high)==self.kappa:
-                        self.stop_heuristic=True
-                        acc=1
-            
-            if len(list_variances)>=self.beta+1 and self.stop_heuristic==False:
-                # Compute the confidence interval.
-                variance_q05=np.mean(list_variances[(-1-self.beta):-1])-2*np.std(list_variances[(-1-self.beta):-1])
-                variance_q95=np.mean(list_variances[(-1-self.beta):-1])+2*np.std(list_variances[(-1-self.beta):-1])
-                last_variance=list_variances[-1]
-                
-                # Compute the minimum accuracy with which the maximum quality is obtained.
-                if last_variance<variance_q05 or last_variance>variance_q95:
-
-                    if (self.time_proc+self.time_acc)-self.last_time_heuristic_accepted>=self.heuristic_freq:   
-                        self.unused_bisection_executions+=int((self.time_proc+self.time_acc-self.last_time_heuristic_accepted)/self.heuristic_freq)-1
-
-                        acc,time_best_acc=self.bisection_method(population,train_seed)
-                    else:
-                        if self.unused_bisection_executions>0:
-                            acc,time_best_acc=self.bisection_method(population,train_seed)
-                            self.unused_bisection_executions-=1
+        decision=self.readjustment_decision(gen,list_accuracies,list_variances)
+        if decision=='bisection':
+            acc,time_best_acc=self.bisection_method(population,train_seed,acc)
+        elif decision=='stop':
+            acc=1
 
         # Subtract population sample evaluation time with optimum accuracy (this time will be counted in time_proc).
         self.time_acc-=time_best_acc
+        self.time_reused_scores=time_best_acc
 
-        return acc,bool(time_best_acc)
+        return acc,decision=='bisection'
     
 
-    def execute_CMAES_with_approximation(self,cost,seed_index,seed,n_seeds,accuracy,df):
-        '''Execute the CMA-ES algorithm with specific seed using approximate objective function defined by specified theta accuracy value.'''
+    def execute_CMAES_with_approximation(self,cost,seed_index,seed,n_seeds,accuracy,df,experiment=None):
+        '''
+        Execute the CMA-ES algorithm with specific seed using approximate objective function defined by specified theta accuracy value. 
+        The rows of data of each generation are added to `df`, which is also returned, or if `experiment` is given, they are streamed 
+        to the partition of the run (see `run_writer`).
+        '''
+        writer=None if experiment is None else self.run_writer(experiment,['accuracy','seed','n_gen','score','elapsed_time'],cost=cost,seed=seed)
 
         # Initialize CMA-ES.
         np.random.seed(seed)
@@ -1316,6 +2644,26 @@ class OPTECOT:
         # Initialize time counters.
         eval_time = 0
 
+        # Print the percentage of the maximum time consumed while a population is being evaluated.
+        def print_progress(elapsed_time):
+            if self.parallel_run:
+                return
+            if n_seeds==1:
+                if eval_time+elapsed_time>self.max_time:
+                    print("Executing CMA-ES using approximate objective function of cost "+str(cost)+'...  '+colored('100.00%' ,'light_cyan'),end='\r')
+                    sys.stdout.flush()
+                else: 
+                    print("Executing CMA-ES using approximate objective function of cost "+str(cost)+'...   '+colored('{:.2f}'.format(round(((eval_time+elapsed_time)/self.max_time)*100,2))+'%','light_cyan'),end='\r')
+                    sys.stdout.flush()
+                
+            else:
+                if eval_time+elapsed_time>self.max_time:
+                    print("    Processing execution with approximation of cost "+str(cost)+'...  '+colored('100.00% of the '+str(seed_index)+'/'+str(n_seeds)+' seed executed','light_cyan'),end='\r')
+                    sys.stdout.flush()
+                else: 
+                    print("    Processing execution with approximation of cost "+str(cost)+'...   '+colored('{:.2f}'.format(round(((eval_time+elapsed_time)/self.max_time)*100,2))+'% of the '+str(seed_index)+'/'+str(n_seeds)+' seed executed','light_cyan'),end='\r')
+                    sys.stdout.flush()
+
         # Continue executing CMA-ES until the maximum time is exhausted.
         n_gen=0
         while eval_time<self.max_time:
@@ -1323,54 +2671,36 @@ class OPTECOT:
             solutions = es.ask()
 
             # Transform the scaled values of the parameters to the real values.
-            list_turb_params=[self.scaled_solution_transformer(x) for x in solutions]
+            list_turb_params=self.scaled_population_transformer(solutions)
 
             # Obtain scores and compute elapsed time.
-            list_scores=[]
-            for turb_params in list_turb_params:
-                if self.theta1>self.theta0:
-                    theta=int(self.theta1*accuracy)
-                else:
-                    theta=int(self.theta1/accuracy)
-                t=time.time()
-                score=self.objective_function(turb_params, theta=theta)
-                eval_time+=time.time()-t
-
-                if n_seeds==1:
-                    if eval_time>self.max_time:
-                        print("Executing CMA-ES using approximate objective function of cost "+str(cost)+'...  '+colored('100.00%' ,'light_cyan'),end='\r')
-                        sys.stdout.flush()
-                    else: 
-                        print("Executing CMA-ES using approximate objective function of cost "+str(cost)+'...   '+colored('{:.2f}'.format(round((eval_time/self.max_time)*100,2))+'%','light_cyan'),end='\r')
-                        sys.stdout.flush()
-                    
-                else:
-                    if eval_time>self.max_time:
-                        print("    Processing execution with approximation of cost "+str(cost)+'...  '+colored('100.00% of the '+str(seed_index)+'/'+str(n_seeds)+' seed executed','light_cyan'),end='\r')
-                        sys.stdout.flush()
-                    else: 
-                        print("    Processing execution with approximation of cost "+str(cost)+'...   '+colored('{:.2f}'.format(round((eval_time/self.max_time)*100,2))+'% of the '+str(seed_index)+'/'+str(n_seeds)+' seed executed','light_cyan'),end='\r')
-                        sys.stdout.flush()
-
-                if self.objective_min:
-                    list_scores.append(score)
-                else:
-                    list_scores.append(-score)
+            theta=self.accuracy_to_theta(accuracy)
+            list_scores,_,elapsed_time=self.evaluate_solutions(list_turb_params,theta,callback=print_progress)
+            eval_time+=elapsed_time
+
+            if not self.objective_min:
+                list_scores=[-score for score in list_scores]
 
             # To build the next generation.
             es.tell(solutions, list_scores)
 
             # Accumulate data of interest.
-            best_solution=self.scaled_solution_transformer(es.result.xbest)
-            test_score=self.objective_function(best_solution)
+            best_solution=list(self.scaled_solution_transformer(es.result.xbest))
+            test_score=self.evaluate_best_solution(best_solution)
             if n_seeds==1:
                 df.append([accuracy,seed,n_gen,best_solution,test_score,eval_time])
+            elif writer is not None:
+                writer.append([accuracy,seed,n_gen,test_score,eval_time])
             else:
                 df.append([accuracy,seed,n_gen,test_score,eval_time])
                 
 
             n_gen+=1
 
+        if writer is not None:
+            writer.close(self.run_fingerprint)
+        return df
+
     def execute_CMAES_with_approximations(self,list_costs,n_seeds=1,seed=2):
         '''
         Execute the CMA-ES algorithm with different seeds using approximate objective functions of different constant costs.
@@ -1385,21 +2715,29 @@ class OPTECOT:
         `n_seeds`: By default takes the value 1, the optimization problem is solved by executing once the CMA-ES (single seed) with the 
         approximate function of the unique cost stored in `list_costs`. Higher values of this parameter will be used to carry out the constant 
         cost analysis. In this case, the parameter indicates the number of times to run the optimization algorithm using a different seed in each 
-        run but the same approximate objective function with a given evaluation cost (a cost in `list_costs`).\n
+        run but the same approximate objective function with a given evaluation cost (a cost in `list_costs`). The rows of each run (cost, seed) 
+        are written while it is executed (see `flush_generations`), and if the same call is made again (for example, after an interruption), only 
+        the runs that were not completed with the same settings are executed. To execute all the runs again, the directory `checkpoints` of the 
+        data path (or the partitions of `results_store`) must be deleted.\n
         `seed`: By default takes the value 2, the seed with which the CMA-ES will be executed to solve the optimization problem using the single 
         cost stored in `list_costs`. In case you want to solve the problem using another seed, you must modify this parameter, taking into account 
         that it must take a value greater than 2.
 
         '''
         if n_seeds==1:
+            # Start the workers that will evaluate the populations.
+            self.get_evaluator().warm_up()
+
             # Initialize database and ejecute CMA-ES.
             df=[]
             acc,_=AuxiliaryFunctions.from_cost_to_theta(list_costs[0],self.theta0,self.theta1)
             self.execute_CMAES_with_approximation(list_costs[0],1,seed,1,acc,df)
+            if self.replay is not None:
+                self.replay.flush()
 
             # Save database.
             df=pd.DataFrame(df,columns=['accuracy','seed','n_gen','xbest','score','elapsed_time'])
-            df.to_csv(self.data_path+'/df_Approximation_cost'+'{:.02f}'.format(list_costs[0])+'_seed'+str(seed)+'.csv')
+            self.save_database(df,'Approximation','df_Approximation_cost'+'{:.02f}'.format(list_costs[0])+'_seed'+str(seed),cost=list_costs[0])
 
             print("Executing CMA-ES using approximate objective function of cost "+str(list_costs[0])+colored('  DONE        ','light_cyan'))
             print(colored('CMA-ES executed with the approximation and execution data saved.','light_yellow',attrs=["bold"]))
@@ -1419,25 +2757,376 @@ class OPTECOT:
                 list_acc.append(round(float(acc),1))
 
             print("Executing CMA-ES using approximate objective functions:")
-            df=[]
-            for i in range(len(list_acc)):
+            sys.stdout.flush()
+
+            # Start the workers that will evaluate the populations of all the seeds (only if the runs are executed in this process).
+            if not self.runs_in_parallel():
+                self.get_evaluator().warm_up()
+
+            # Independent runs (cost, seed), whose rows are streamed to the store (or to the checkpoints of the data path) while they are executed. 
+            # The runs completed with the same settings in a previous call are not executed again, and the database of a cost is saved as soon as 
+            # all its seeds have been executed.
+            store=self.checkpoint_store()
+            list_runs=[(i,j) for i in range(len(list_acc)) for j in range(len(list_seeds)) if self.pending_run(store,'ConstantAnalysis',None,list_costs[i],list_seeds[j])]
+            pending_runs=[sum(1 for run in list_runs if run[0]==i) for i in range(len(list_acc))]
+            if len(list_runs)<len(list_acc)*len(list_seeds):
+                print("    Resuming the execution: "+str(len(list_acc)*len(list_seeds)-len(list_runs))+" of "+str(len(list_acc)*len(list_seeds))+" runs already completed")
                 sys.stdout.flush()
-                df=[]
-                accuracy=list_acc[i]
-                for j in range(len(list_seeds)):
-                    seed=list_seeds[j]
-                    self.execute_CMAES_with_approximation(list_costs[i],j+1,seed,n_seeds,accuracy,df)
-
-                # Save database.
-                df=pd.DataFrame(df,columns=['accuracy','seed','n_gen','score','elapsed_time'])
-                df.to_csv(self.data_path+'/df_ConstantAnalysis_cost'+'{:.02f}'.format(list_costs[i])+'.csv')
+
+            def save_cost_database(i):
+                if self.results_store is None:
+                    self.save_checkpoint_database('ConstantAnalysis','df_ConstantAnalysis_cost'+'{:.02f}'.format(list_costs[i]),['accuracy','seed','n_gen','score','elapsed_time'],list_seeds,cost=list_costs[i])
                 print("    Processing execution with approximation of cost "+str(list_costs[i])+colored('    DONE'+' '*29,'light_cyan'))
                 sys.stdout.flush()
+
+            def run_done(run_index,rows):
+                i=list_runs[run_index][0]
+                pending_runs[i]-=1
+                if pending_runs[i]==0:
+                    save_cost_database(i)
+
+            for i in range(len(list_acc)):
+                if pending_runs[i]==0:
+                    save_cost_database(i)
+            list_args=[(list_costs[i],j+1,list_seeds[j],n_seeds,list_acc[i],[],'ConstantAnalysis') for i,j in list_runs]
+            self.execute_runs('execute_CMAES_with_approximation',list_args,callback=run_done)
             print(colored('CMA-ES executed with all approximations.','light_yellow',attrs=["bold"]))
             sys.stdout.flush()
             print('\n')
 
 
+    def save_database(self,df,experiment,file_name,heuristic=None,cost=None):
+        '''
+        Save the database of an execution, appending it to `results_store` (in the partitions of the problem, `experiment`, `heuristic`, 
+        `cost` and the seeds of the rows, which replace the rows of previous executions of the same runs) if it was given, or as the CSV 
+        file `file_name` of the data path otherwise.
+        '''
+        if self.results_store is not None:
+            for seed in df['seed'].unique():
+                self.results_store.discard(self.problem_name,experiment,heuristic,cost,seed)
+            self.results_store.append(df,self.problem_name,experiment,heuristic=heuristic,cost=cost)
+            for seed in df['seed'].unique():
+                self.results_store.mark_complete(self.problem_name,experiment,heuristic,cost,seed,fingerprint=self.run_fingerprint)
+        else:
+            df.to_csv(self.data_path+'/'+file_name+'.csv')
+
+    def checkpoint_store(self):
+        '''
+        Return the store where the runs of the executions with more than one seed are streamed: `results_store` if it was given, or a 
+        store of CSV files in the directory `checkpoints` of the data path otherwise.
+        '''
+        if self.results_store is not None:
+            return self.results_store
+        return ResultsStore(os.path.join(self.data_path,'checkpoints'),format='csv')
+
+    def run_writer(self,experiment,columns,heuristic=None,cost=None,seed=None):
+        '''Return the `RunWriter` of a run, which writes its rows in batches of `flush_generations` rows.'''
+        return RunWriter(self.checkpoint_store(),columns,self.problem_name,experiment,heuristic=heuristic,cost=cost,seed=seed,batch_size=self.flush_generations)
+
+    def pending_run(self,store,experiment,heuristic,cost,seed):
+        '''
+        Return True if a run must be executed, that is, if it was not completed in a previous call with the same settings (the fingerprint 
+        stored with the run is compared with `run_fingerprint`). The rows left by a previous interrupted run are deleted.
+        '''
+        if store.complete_fingerprint(self.problem_name,experiment,heuristic,cost,seed)==self.run_fingerprint:
+            return False
+        store.discard(self.problem_name,experiment,heuristic,cost,seed)
+        return True
+
+    def save_checkpoint_database(self,experiment,file_name,columns,list_seeds,heuristic=None,cost=None):
+        '''Join the runs of the seeds in `list_seeds` stored in the checkpoints and save them as the CSV file `file_name` of the data path.'''
+        df=self.checkpoint_store().read(sort_by=['seed','n_gen'],complete_only=True,problem=self.problem_name,experiment=experiment,
+                                         heuristic=heuristic,cost=cost,seed=list(list_seeds))
+        df[columns].to_csv(self.data_path+'/'+file_name+'.csv')
+
+    def load_database(self,experiment,file_name,heuristic=None,cost=None,columns=None):
+        '''
+        Read a database saved with `save_database` (with the rows sorted by seed and generation if it is read from `results_store`, 
+        and only with the columns of the database).
+        '''
+        if self.results_store is not None:
+            df=self.results_store.read(columns=columns,sort_by=['seed','n_gen'],complete_only=True,problem=self.problem_name,experiment=experiment,
+                                       heuristic=heuristic,cost=cost)
+            return df.drop(columns=[key for key in ['problem','experiment','heuristic','cost'] if key in df.columns])
+        else:
+            df=pd.read_csv(self.data_path+'/'+file_name+'.csv',index_col=0)
+            return df if columns is None else df[columns]
+
+    def history_columns(self,n_seeds):
+        '''Return the list with the names of the columns of the database of the executions with OPTECOT.'''
+        if n_seeds==1:
+            columns=['seed','n_gen','xbest','score','readjustment','accuracy','variance','elapsed_time_proc','elapsed_time_acc','elapsed_time']
+        else:
+            columns=['seed','n_gen','score','readjustment','accuracy','variance','elapsed_time_proc','elapsed_time_acc','elapsed_time']
+        if self.warm_start_bisection:
+            columns+=['sample_evaluations','sample_evaluations_bisection']
+        return columns
+
+    def execute_CMAES_with_OPTECOT_seed(self,seed,n_seeds,experiment=None):
+        '''
+        Execute the CMA-ES algorithm with a specific seed applying OPTECOT and return the list with the rows of data of each generation 
+        (empty if `experiment` is given, in which case the rows are streamed to the partition of the run, see `run_writer`).
+        '''
+
+        # The asynchronous mode needs a pool of workers.
+        if self.asynchronous and self.in_parallel:
+            return self.execute_CMAES_with_OPTECOT_seed_asynchronous(seed,n_seeds,experiment)
+
+        writer=None if experiment is None else self.run_writer(experiment,self.history_columns(n_seeds),heuristic='OPTECOT',seed=seed)
+        history=RunHistory(self.history_columns(n_seeds),self.kappa+1,self.beta+1,writer)
+
+        self.print_message=seed
+        self.unique_seed=n_seeds==1
+        self.time_proc=0
+        self.time_acc=0
+        self.last_time_heuristic_accepted=0
+        self.stop_heuristic=False
+        self.unused_bisection_executions=0
+        
+        # Initialize CMA-ES.
+        np.random.seed(seed)
+        es = cma.CMAEvolutionStrategy(np.random.random(self.xdim), 0.33,inopts={'bounds': [0, 1],'seed':seed,'popsize':self.popsize,'verbose':-9})
+
+        # Until the maximum time is exhausted continue with CMA-ES execution and stored data of interest per population.
+        n_gen=0
+        while self.time_acc+self.time_proc<self.max_time:
+
+            if n_seeds==1 and not self.parallel_run:
+                print("Executing CMA-ES appliying OPTECOT... "+colored('{:.2f}'.format(((self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
+                sys.stdout.flush()
+            elif not self.parallel_run:
+                print("    Processing execution with seed "+str(seed-1)+'...   '+colored('{:.2f}'.format(((self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
+                sys.stdout.flush()
+
+            # New population.
+            solutions = es.ask()
+
+            # Transform the scaled values of the parameters to the real values.
+            list_turb_params=self.scaled_population_transformer(solutions)
+
+            # Apply OPTECOT to compute the optimal accuracy.
+            if n_gen==0:
+                accuracy=None
+
+            accuracy,readjustment=self.execute_OPTECOT(n_gen,accuracy,list_turb_params,seed,history.last_accuracies(seed),history.last_variances(seed))
+
+            # Evaluate population with the optimal accuracy.
+            list_scores=self.evaluate_population(self.objective_function,list_turb_params,accuracy,count_time_gen=True,readjustment=readjustment)
+
+            if self.objective_min==False:
+                list_scores=[-score for score in list_scores]
+
+            # To build the following population.
+            es.tell(solutions, list_scores)
+
+            # Accumulate data of interest.
+            best_solution=list(self.scaled_solution_transformer(es.result.xbest))
+            test_score=self.evaluate_best_solution(best_solution)
+
+            if n_seeds==1:
+                row=[seed,n_gen,best_solution,test_score,readjustment,accuracy,np.var(list_scores),self.time_proc,self.time_acc,self.time_acc+self.time_proc]
+            else:
+                row=[seed,n_gen,test_score,readjustment,accuracy,np.var(list_scores),self.time_proc,self.time_acc,self.time_acc+self.time_proc]
+            if self.warm_start_bisection:
+                row+=self.last_bisection_evaluations if readjustment else [0,0]
+            history.append(row,seed,accuracy,np.var(list_scores))
+
+            n_gen+=1
+
+        if writer is not None:
+            writer.close(self.run_fingerprint)
+        return history.rows
+
+    def execute_CMAES_with_OPTECOT_seed_asynchronous(self,seed,n_seeds,experiment=None):
+        '''
+        Execute the CMA-ES algorithm with a specific seed applying OPTECOT in the asynchronous (steady-state) mode and return the list 
+        with the rows of data of each window. The workers of the pool are kept busy: a new candidate solution is submitted as soon as an 
+        evaluation is completed, and the evaluations of the bisection method are submitted to the same pool (before the candidates), while 
+        the candidates continue being evaluated with the current accuracy. Each time `popsize` candidates are completed, they are passed to 
+        the CMA-ES (whatever the generation they were sampled in) and form a window, that plays the role of the population in the heuristic: 
+        the variance of its scores is used to decide the readjustments, and the last `sample_size` completed candidates are the sample of 
+        the bisection method. The time is charged as in the generational mode: with the `'wall'` budget clock, the wall time elapsed since 
+        the previous evaluations were completed is split between the evaluations completed (the evaluations of the best solution found are 
+        not counted), and with the `'cpu'` and `'virtual'` clocks each evaluation is charged its own time. Until the first bisection is 
+        completed, the candidates are evaluated with the maximum accuracy. If `experiment` is given, the rows are streamed to the partition 
+        of the run (see `run_writer`).
+        '''
+
+        writer=None if experiment is None else self.run_writer(experiment,self.history_columns(n_seeds),heuristic='OPTECOT',seed=seed)
+        history=RunHistory(self.history_columns(n_seeds),self.kappa+1,self.beta+1,writer)
+
+        self.print_message=seed
+        self.unique_seed=n_seeds==1
+        self.time_proc=0
+        self.time_acc=0
+        self.last_time_heuristic_accepted=0
+        self.stop_heuristic=False
+        self.unused_bisection_executions=0
+
+        # Initialize CMA-ES.
+        np.random.seed(seed)
+        es = cma.CMAEvolutionStrategy(np.random.random(self.xdim), 0.33,inopts={'bounds': [0, 1],'seed':seed,'popsize':self.popsize,'verbose':-9})
+
+        evaluator=self.get_evaluator()
+        pending={} # Submitted evaluations (future: task).
+        candidates=deque() # Candidates (scaled values) sampled by the CMA-ES and not submitted yet.
+        bisection_tasks=deque() # Evaluations of the bisection method not submitted yet.
+        window=[] # Candidates (scaled values and scores) completed since the last window.
+        last_completed=deque(maxlen=self.sample_size) # Candidates (real values, scores and theta) last completed.
+        bisection=None # State of the bisection method in progress.
+        accuracy=1
+        readjustment=False
+        n_gen=0
+        time_not_counted=0 # Wall time of the evaluations of the best solution found, which is not counted in max_time.
+
+        def request_bisection_scores(theta):
+            '''Queue the evaluations of the sample with `theta` that are not known yet.'''
+            for i in range(len(bisection['sample'])):
+                if (i,theta) not in bisection['scores'] and (i,theta) not in bisection['requested']:
+                    bisection['requested'].add((i,theta))
+                    bisection_tasks.append(('bisection',bisection['sample'][i],theta,i))
+
+        def start_bisection(sample):
+            '''Start the bisection method with a sample of solutions (real values, scores and theta).'''
+            nonlocal bisection
+            bisection={'sample':[solution for solution,score,theta in sample],'search':self.get_search(accuracy if n_gen>0 else None),
+                       'scores':{(i,sample[i][2]):sample[i][1] for i in range(len(sample)) if sample[i][1] is not None},'requested':set()}
+            request_bisection_scores(self.theta1)
+            for acc in bisection['search'].speculative_accuracies(self.speculative_levels):
+                request_bisection_scores(self.accuracy_to_theta(acc))
+
+        def advance_bisection():
+            '''Resolve the midpoints whose scores are already known and finish the bisection method when the interval is small enough.'''
+            nonlocal bisection,accuracy,readjustment
+            search=bisection['search']
+            while not search.finished():
+                theta=self.accuracy_to_theta(search.accuracy())
+                list_i=range(len(bisection['sample']))
+                if not all((i,theta) in bisection['scores'] and (i,self.theta1) in bisection['scores'] for i in list_i):
+                    return
+                search.update(spearman([bisection['scores'][(i,theta)] for i in list_i],[bisection['scores'][(i,self.theta1)] for i in list_i],method='ordinal')>=self.alpha)
+                if not search.finished():
+                    for acc in search.speculative_accuracies(self.speculative_levels):
+                        request_bisection_scores(self.accuracy_to_theta(acc))
+
+            accuracy=search.result()
+            readjustment=True
+            self.last_time_heuristic_accepted=self.time_proc+self.time_acc
+            self.count_bisection_evaluations(len(bisection['requested']))
+            bisection=None
+
+        def complete_window():
+            '''Pass the first `popsize` completed candidates to the CMA-ES and decide if the accuracy must be readjusted.'''
+            nonlocal window,accuracy,readjustment,n_gen,time_not_counted
+            solutions=[solution for solution,score in window[:self.popsize]]
+            list_scores=[score for solution,score in window[:self.popsize]]
+            window=window[self.popsize:]
+
+            if self.objective_min==False:
+                list_scores=[-score for score in list_scores]
+
+            # To build the following candidates. The candidates sampled before the last update are repaired (check_points) so that 
+            # their steps are consistent with the current distribution, and the ones not submitted yet are replaced by new ones.
+            es.tell(solutions, list_scores, check_points=True)
+            candidates.clear()
+            candidates.extend(es.ask())
+
+            # Accumulate data of interest.
+            t=time.time()
+            best_solution=list(self.scaled_solution_transformer(es.result.xbest))
+            test_score=self.evaluate_best_solution(best_solution)
+            time_not_counted+=time.time()-t
+
+            if n_seeds==1:
+                row=[seed,n_gen,best_solution,test_score,readjustment,accuracy,np.var(list_scores),self.time_proc,self.time_acc,self.time_acc+self.time_proc]
+            else:
+                row=[seed,n_gen,test_score,readjustment,accuracy,np.var(list_scores),self.time_proc,self.time_acc,self.time_acc+self.time_proc]
+            if self.warm_start_bisection:
+                row+=self.last_bisection_evaluations if readjustment else [0,0]
+            history.append(row,seed,accuracy,np.var(list_scores))
+            readjustment=False
+            n_gen+=1
+
+            if n_seeds==1 and not self.parallel_run:
+                print("Executing CMA-ES appliying OPTECOT... "+colored('{:.2f}'.format(((self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
+                sys.stdout.flush()
+            elif not self.parallel_run:
+                print("    Processing execution with seed "+str(seed-1)+'...   '+colored('{:.2f}'.format(((self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
+                sys.stdout.flush()
+
+            # Apply OPTECOT on the window (a bisection method is not started while another one is in progress).
+            if bisection is None:
+                decision=self.readjustment_decision(n_gen,history.last_accuracies(seed),history.last_variances(seed))
+                if decision=='bisection':
+                    start_bisection(list(last_completed))
+                elif decision=='stop':
+                    accuracy=1
+
+        def complete(task,score,charged_time):
+            '''Charge the time of a completed evaluation and use its score.'''
+            kind,solution,theta,info=task
+            if self.budget_clock=='virtual':
+                charged_time=self.modelled_evaluation_time(theta)
+            if kind=='bisection':
+                self.time_acc+=charged_time
+                if bisection is not None:
+                    bisection['scores'][(info,theta)]=score
+                    advance_bisection()
+            else:
+                self.time_proc+=charged_time
+                window.append((info,score))
+                last_completed.append((solution,score,theta))
+                if len(window)>=self.popsize:
+                    complete_window()
+
+        def submit(task):
+            '''Submit an evaluation to the pool, or complete it directly if it is stored in the cache or in the replay store.'''
+            kind,solution,theta,info=task
+            found,score,stored_time=self.stored_evaluation(solution,theta)
+            if found:
+                complete(task,score,stored_time)
+            else:
+                pending[evaluator.submit(solution,theta)]=task
+
+        # The sample of the first bisection is selected randomly from the first candidates.
+        candidates.extend(es.ask())
+        random.seed(seed)
+        ind_sol=random.sample(range(len(candidates)),self.sample_size)
+        start_bisection([(self.scaled_solution_transformer(candidates[i]),None,None) for i in ind_sol])
+
+        # Until the maximum time is exhausted keep all the workers busy and store data of interest per window.
+        last_time=time.time()
+        while self.time_acc+self.time_proc<self.max_time:
+            while len(pending)<evaluator.n_jobs and self.time_acc+self.time_proc<self.max_time:
+                if len(bisection_tasks)>0:
+                    submit(bisection_tasks.popleft())
+                else:
+                    if len(candidates)==0:
+                        candidates.extend(es.ask())
+                    scaled_solution=candidates.popleft()
+                    submit(('candidate',self.scaled_solution_transformer(scaled_solution),self.accuracy_to_theta(accuracy),scaled_solution))
+
+            if len(pending)==0:
+                continue
+            done,_=wait(pending,return_when=FIRST_COMPLETED)
+            wall_time=time.time()-last_time-time_not_counted
+            last_time+=wall_time+time_not_counted
+            time_not_counted=0
+            for future in done:
+                task=pending.pop(future)
+                score,evaluation_time=future.result()
+                self.record_evaluation(task[1],task[2],score,evaluation_time)
+                complete(task,score,wall_time/len(done) if self.budget_clock=='wall' else evaluation_time)
+
+        # The evaluations not started are cancelled, and the running ones are finished before the next execution.
+        for future in pending:
+            future.cancel()
+        wait(pending)
+
+        if writer is not None:
+            writer.close(self.run_fingerprint)
+        return history.rows
+
     def execute_CMAES_with_OPTECOT(self,n_seeds=1,seed=2,info_data_file_name=None):
         '''
         Execute the CMA-ES algorithm with different seeds applying OPTECOT. 
@@ -1446,7 +3135,10 @@ class OPTECOT:
         ==========
         `n_seeds`: By default takes the value 1, the optimization problem is solved by executing once the CMA-ES (single seed) applying OPTECOT. 
         Higher values of this parameter will be used to carry out the OPTECOT benefits analysis (the third experiment described above). In this 
-        case, the parameter indicates the number of times to run the optimization algorithm using different seeds.
+        case, the parameter indicates the number of times to run the optimization algorithm using different seeds. The rows of each run are 
+        written while it is executed (see `flush_generations`), and if the same call is made again (for example, after an interruption), only 
+        the runs that were not completed with the same settings are executed. To execute all the runs again, the directory `checkpoints` of the 
+        data path (or the partitions of `results_store`) must be deleted.\n
         `seed`: By default takes the value 2, the seed with which the CMA-ES will be executed to solve the optimization problem applying OPTECOT. 
         In case you want to solve the problem using another seed, you must modify this parameter, taking into account that it must take a value 
         greater than 2.\n
@@ -1466,83 +3158,36 @@ class OPTECOT:
             self.unique_seed=False
             list_seeds=range(2,2+n_seeds,1) 
 
-        df=[] 
-
-        for seed in list_seeds:
-            self.print_message=seed
-            self.time_proc=0
-            self.time_acc=0
-            self.last_time_heuristic_accepted=0
-            self.stop_heuristic=False
-            self.unused_bisection_executions=0
-            
-            # Initialize CMA-ES.
-            np.random.seed(seed)
-            es = cma.CMAEvolutionStrategy(np.random.random(self.xdim), 0.33,inopts={'bounds': [0, 1],'seed':seed,'popsize':self.popsize,'verbose':-9})
-
-            # Until the maximum time is exhausted continue with CMA-ES execution and stored data of interest per population.
-            n_gen=0
-            while self.time_acc+self.time_proc<self.max_time:
-
-                if n_seeds==1:
-                    print("Executing CMA-ES appliying OPTECOT... "+colored('{:.2f}'.format(((self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
-                    sys.stdout.flush()
-                else:
-                    print("    Processing execution with seed "+str(seed-1)+'...   '+colored('{:.2f}'.format(((self.time_acc+self.time_proc)/self.max_time)*100)+'%','light_cyan'),end='\r')
-                    sys.stdout.flush()
-
-                # New population.
-                solutions = es.ask()
-
-                # Transform the scaled values of the parameters to the real values.
-                list_turb_params=[self.scaled_solution_transformer(x) for x in solutions]
-
-                # Apply OPTECOT to compute the optimal accuracy.
-                if n_gen==0:
-                    list_accuracies=[]
-                    list_variances=[]
-                    accuracy=None
-                else:
-                    df_seed=pd.DataFrame(df)
-                    df_seed=df_seed[df_seed[0]==seed]
-                    list_accuracies=list(df_seed[4])
-                    list_variances=list(df_seed[5])
-
-                accuracy,readjustment=self.execute_OPTECOT(n_gen,accuracy,list_turb_params,seed,list_accuracies,list_variances)
+        # Start the workers that will evaluate the populations of all the seeds (only if the runs are executed in this process).
+        if not self.runs_in_parallel() or n_seeds==1:
+            self.get_evaluator().warm_up()
 
-                # Evaluate population with the optimal accuracy.
-                list_scores=self.evaluate_population(self.objective_function,list_turb_params,accuracy,count_time_gen=True,readjustment=readjustment)
-
-                if self.objective_min==False:
-                    list_scores=[-score for score in list_scores]
-
-                # To build the following population.
-                es.tell(solutions, list_scores)
-
-                # Accumulate data of interest.
-                best_solution=self.scaled_solution_transformer(es.result.xbest)
-                test_score= self.objective_function(best_solution)
-
-                if n_seeds==1:
-                    df.append([seed,n_gen,best_solution,test_score,readjustment,accuracy,np.var(list_scores),self.time_proc,self.time_acc,self.time_acc+self.time_proc])
-                else:
-                    df.append([seed,n_gen,test_score,readjustment,accuracy,np.var(list_scores),self.time_proc,self.time_acc,self.time_acc+self.time_proc])
-
-                n_gen+=1
+        # Independent runs (one per seed). With more than one seed, the rows of each run are streamed to the store (or to the checkpoints 
+        # of the data path) while it is executed, and the runs completed with the same settings in a previous call are not executed again.
+        if n_seeds==1:
+            list_args=[(seed,n_seeds)]
+        else:
+            store=self.checkpoint_store()
+            list_args=[(run_seed,n_seeds,'OPTECOT_Analysis') for run_seed in list_seeds if self.pending_run(store,'OPTECOT_Analysis','OPTECOT',None,run_seed)]
+            if len(list_args)<n_seeds:
+                print("    Resuming the execution: "+str(n_seeds-len(list_args))+" of "+str(n_seeds)+" runs already completed")
+                sys.stdout.flush()
 
+        def print_seed_done(run_index,rows):
             if n_seeds==1:
                 print("Executing CMA-ES appliying OPTECOT"+colored('    DONE   ','light_cyan'))
-                sys.stdout.flush()
             else:
-                print("    Processing execution with seed "+str(seed-1)+colored('    DONE       ','light_cyan'))
-                sys.stdout.flush()
+                print("    Processing execution with seed "+str(list_args[run_index][0]-1)+colored('    DONE       ','light_cyan'))
+            sys.stdout.flush()
+
+        list_rows=self.execute_runs('execute_CMAES_with_OPTECOT_seed',list_args,callback=print_seed_done)
 
         if n_seeds==1:
-            df=pd.DataFrame(df,columns=['seed','n_gen','xbest','score','readjustment','accuracy','variance','elapsed_time_proc','elapsed_time_acc','elapsed_time'])
+            df=pd.DataFrame(list_rows[0],columns=self.history_columns(n_seeds))
             if info_data_file_name==None:
-                df.to_csv(self.data_path+'/df_OPTECOT_seed'+str(seed)+'.csv')
+                self.save_database(df,'OPTECOT','df_OPTECOT_seed'+str(seed),heuristic='OPTECOT')
             else:
-                df.to_csv(self.data_path+'/'+info_data_file_name+'.csv')
+                self.save_database(df,info_data_file_name,info_data_file_name,heuristic='OPTECOT')
             print(colored('CMA-ES executed appliying OPTECOT and execution data saved.','light_yellow',attrs=["bold"]))
             sys.stdout.flush()
 
@@ -1550,8 +3195,8 @@ class OPTECOT:
             idx=df['score'].idxmax()
             return df.iloc[idx]['xbest'], df.iloc[idx]['score']
         else:
-            df=pd.DataFrame(df,columns=['seed','n_gen','score','readjustment','accuracy','variance','elapsed_time_proc','elapsed_time_acc','elapsed_time'])
-            df.to_csv(self.data_path+'/df_OPTECOT_Analisys.csv')
+            if self.results_store is None:
+                self.save_checkpoint_database('OPTECOT_Analysis','df_OPTECOT_Analysis',self.history_columns(n_seeds),list_seeds,heuristic='OPTECOT')
             print(colored('CMA-ES executed appliying OPTECOT with all seeds.','light_yellow',attrs=["bold"]))
             sys.stdout.flush()
         print('\n')
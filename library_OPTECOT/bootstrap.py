@@ -0,0 +1,162 @@
+'''
+This module defines the bootstrap engine used by `ExperimentalGraphs` and by the scripts that build the figures of the paper.
+Instead of drawing the resamples one by one, all the resamples of the data are drawn as one index matrix and their means
+are computed in one vectorized reduction, and many groups of data (for example, the scores of the seeds at each train
+time) can be processed at once.
+
+Functions and classes
+=====================
+`bootstrap_mean_and_confidence_interval`: Mean and bootstrap percentiles (5% and 95%) of the mean of a data sample. \n
+`bootstrap_groups`: The same for many data samples (groups) at once. \n
+`bootstrap_groupby`: The same for the groups of a column of a data frame. \n
+`BootstrapCache`: Optional cache (in memory or persistent) of the results, indexed by a hash of the data.
+
+Only NumPy (and pandas for `bootstrap_groupby`) is needed, so the module can be imported from the figure scripts
+without importing the whole library: ::
+
+    from bootstrap import bootstrap_mean_and_confidence_interval, bootstrap_groups
+
+    mean,q05,q95=bootstrap_mean_and_confidence_interval(scores,rng=0)
+
+    # One call for all the train times.
+    all_mean,all_q05,all_q95=bootstrap_groups([scores_per_train_time[t] for t in list_train_times],rng=0)
+'''
+
+#==================================================================================================
+# LIBRARIES
+#==================================================================================================
+import numpy as np
+import hashlib
+import json
+import os
+
+#==================================================================================================
+# CLASSES
+#==================================================================================================
+class BootstrapCache:
+
+    '''
+    This class defines a cache of the bootstrap results, indexed by a hash of the data (and the number of resamples). If
+    `path` is given, the results are also stored in a JSON file, so that they are reused when the figures are built again.
+    The result of a data sample is the one computed the first time, whatever the generator used later.
+    '''
+
+    def __init__(self,path=None):
+        self.path=path
+        self.results={}
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                self.results=json.load(file)
+
+    @staticmethod
+    def key(data,bootstrap_iterations):
+        '''Hash of the data sample (as an array of floats) and the number of resamples.'''
+        data=np.ascontiguousarray(data,dtype=float)
+        return hashlib.sha256(data.tobytes()).hexdigest()+'_'+str(len(data))+'_'+str(bootstrap_iterations)
+
+    def get(self,key):
+        '''Return the stored (mean,q05,q95) tuple or None.'''
+        result=self.results.get(key)
+        return None if result is None else tuple(result)
+
+    def update(self,new_results):
+        '''Store a dictionary of results and, if the cache is persistent, rewrite the file (atomically).'''
+        if not new_results:
+            return
+        self.results.update({key:[float(value) for value in result] for key,result in new_results.items()})
+        if self.path is not None:
+            aux_path=self.path+'.tmp'
+            with open(aux_path,'w') as file:
+                json.dump(self.results,file)
+            os.replace(aux_path,self.path)
+
+#==================================================================================================
+# FUNCTIONS
+#==================================================================================================
+def bootstrap_mean_and_confidence_interval(data,bootstrap_iterations=1000,rng=None,cache=None):
+    '''
+    The 95% confidence interval of a given data sample is calculated.
+
+    Parameters
+    ==========
+    `data` (list): Data on which the range between percentiles will be calculated.
+    `bootstrap_iterations` (int): Number of subsamples of data to be considered to calculate the percentiles of their means.
+    `rng`: Generator ("np.random.Generator") or seed used to draw the subsamples (by default, a generator with a random seed).
+    `cache`: Optional `BootstrapCache` where the result is searched and stored.
+
+    Return
+    ======
+    The mean of the original data together with the percentiles of the means obtained from the subsampling of the data.
+    '''
+    all_mean,all_q05,all_q95=bootstrap_groups([data],bootstrap_iterations,rng,cache)
+    return all_mean[0],all_q05[0],all_q95[0]
+
+def bootstrap_groups(groups,bootstrap_iterations=1000,rng=None,cache=None,max_elements=10**7):
+    '''
+    Calculate the mean and the bootstrap percentiles of the mean of many data samples at once. The groups with the same size
+    are resampled together: the indexes of all their subsamples form one matrix of shape (n_groups,bootstrap_iterations,size),
+    drawn in blocks of at most `max_elements` elements to limit the memory used.
+
+    Parameters
+    ==========
+    `groups`: List of data samples (of any sizes).
+    `bootstrap_iterations`, `rng`, `cache`: As in `bootstrap_mean_and_confidence_interval`.
+    `max_elements`: Maximum number of elements of each block of the index matrix.
+
+    Returns
+    =======
+    Three arrays of shape (n_groups,) with the mean of each group and the 5% and 95% percentiles of the means of its subsamples
+    (nan for the empty groups).
+    '''
+    rng=rng if isinstance(rng,np.random.Generator) else np.random.default_rng(rng)
+    groups=[np.asarray(group,dtype=float).ravel() for group in groups]
+    results=np.full((len(groups),3),np.nan)
+
+    # Results already stored in the cache.
+    pending=list(range(len(groups)))
+    if cache is not None:
+        keys=[BootstrapCache.key(group,bootstrap_iterations) for group in groups]
+        pending=[]
+        for i in range(len(groups)):
+            result=cache.get(keys[i])
+            if result is None:
+                pending.append(i)
+            else:
+                results[i]=result
+
+    # Group the pending data samples by size.
+    sizes={}
+    for i in pending:
+        if len(groups[i])>0:
+            sizes.setdefault(len(groups[i]),[]).append(i)
+
+    for size,list_i in sizes.items():
+        data=np.array([groups[i] for i in list_i])
+        block=max(1,max_elements//(bootstrap_iterations*size))
+        for start in range(0,len(list_i),block):
+            block_data=data[start:start+block]
+            indexes=rng.integers(0,size,size=(len(block_data),bootstrap_iterations,size))
+            means=np.take_along_axis(block_data[:,None,:],indexes,axis=2).mean(axis=2)
+            results[list_i[start:start+block],0]=block_data.mean(axis=1)
+            results[list_i[start:start+block],1:]=np.quantile(means,[0.05,0.95],axis=1).T
+
+    if cache is not None:
+        cache.update({keys[i]:results[i] for i in pending if len(groups[i])>0})
+
+    return results[:,0],results[:,1],results[:,2]
+
+def bootstrap_groupby(df,by,column,bootstrap_iterations=1000,rng=None,cache=None):
+    '''
+    Apply `bootstrap_groups` to the values of `column` of each group of `df.groupby(by)` (for example, a groupby over time
+    buckets), returning a data frame indexed by the groups with the columns 'mean', 'q05' and 'q95'.
+    '''
+    import pandas as pd
+
+    grouped=df.groupby(by)[column]
+    list_keys=[]
+    groups=[]
+    for key,values in grouped:
+        list_keys.append(key)
+        groups.append(values.to_numpy())
+    all_mean,all_q05,all_q95=bootstrap_groups(groups,bootstrap_iterations,rng,cache)
+    return pd.DataFrame({'mean':all_mean,'q05':all_q05,'q95':all_q95},index=pd.Index(list_keys,name=by if isinstance(by,str) else None))
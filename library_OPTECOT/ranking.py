@@ -0,0 +1,144 @@
+'''
+This module defines the rank utilities used by OPTECOT and by the scripts that build the figures. All the functions
+work on whole score matrices at once (one ranking per row, the last axis being the solutions), instead of looping over
+lists of scores.
+
+Functions
+=========
+`rank`: Convert scores into rankings (positions from 0, the lowest score having position 0), with different ways of handling ties. \n
+`rank_from_argsort`: Convert the output of "np.argsort" into rankings. \n
+`sort_by_reference`: Reorder the rankings according to the order established by a reference ranking. \n
+`spearman`: Spearman correlation between many rankings and a reference ranking. \n
+`kendall`: Kendall correlation (tau-b) between many rankings and a reference ranking.
+
+Only NumPy is needed, so the module can be imported from the figure scripts without importing the whole library: ::
+
+    from ranking import rank, spearman
+
+    # Rankings of the scores of 100 solutions obtained with 10 accuracies (matrix of shape (10,100)).
+    ranking_matrix=rank(score_matrix)
+
+    # Spearman correlation between the ranking of each accuracy and the ranking of the maximum accuracy.
+    correlations=spearman(score_matrix,score_matrix[-1])
+'''
+
+#==================================================================================================
+# LIBRARIES
+#==================================================================================================
+import numpy as np
+
+#==================================================================================================
+# FUNCTIONS
+#==================================================================================================
+def rank(scores,method='ordinal'):
+    '''
+    Convert scores into rankings along the last axis (the position of each solution when the scores are sorted from lowest
+    to highest, starting from 0).
+
+    Parameters
+    ==========
+    `scores`: Array (or list) of scores, of shape (n_solutions,) or (n_rankings,n_solutions).
+    `method`: How the ties are handled. With 'ordinal' (the ranking that the library has always used) each solution gets a
+    different position, the ties being broken as "np.argsort" does. With 'average', 'min' and 'max' the tied solutions get
+    the mean, the lowest and the highest of their positions, respectively, and with 'dense' the positions of the groups of
+    tied solutions are consecutive.
+
+    Returns
+    =======
+    `ranking`: Array with the same shape as `scores` (of integers, except with the method 'average').
+    '''
+    scores=np.asarray(scores)
+    if method=='ordinal':
+        return rank_from_argsort(np.argsort(scores,axis=-1))
+
+    order=np.argsort(scores,axis=-1,kind='stable')
+    sorted_scores=np.take_along_axis(scores,order,axis=-1)
+    n=scores.shape[-1]
+    positions=np.broadcast_to(np.arange(n),scores.shape)
+
+    # Limits of the groups of tied solutions in the sorted scores.
+    group_start=np.ones(scores.shape,dtype=bool)
+    group_start[...,1:]=sorted_scores[...,1:]!=sorted_scores[...,:-1]
+    group_end=np.ones(scores.shape,dtype=bool)
+    group_end[...,:-1]=group_start[...,1:]
+
+    if method=='dense':
+        sorted_ranking=np.cumsum(group_start,axis=-1)-1
+    else:
+        first=np.maximum.accumulate(np.where(group_start,positions,0),axis=-1)
+        last=np.flip(np.minimum.accumulate(np.flip(np.where(group_end,positions,n),axis=-1),axis=-1),axis=-1)
+        if method=='average':
+            sorted_ranking=(first+last)/2
+        elif method=='min':
+            sorted_ranking=first
+        elif method=='max':
+            sorted_ranking=last
+        else:
+            raise ValueError("method must be 'ordinal', 'average', 'min', 'max' or 'dense', not "+repr(method))
+
+    ranking=np.empty(scores.shape,dtype=sorted_ranking.dtype)
+    np.put_along_axis(ranking,order,sorted_ranking,axis=-1)
+    return ranking
+
+def rank_from_argsort(argsort):
+    '''Obtain the rankings from the output of applying "np.argsort" along the last axis (the inverse permutations).'''
+    argsort=np.asarray(argsort)
+    ranking=np.empty(argsort.shape,dtype=int)
+    np.put_along_axis(ranking,argsort,np.broadcast_to(np.arange(argsort.shape[-1]),argsort.shape),axis=-1)
+    return ranking
+
+def sort_by_reference(rankings,reference):
+    '''Reorder the columns of `rankings` (one ranking per row) so that the `reference` ranking is sorted from lowest to highest.'''
+    return np.asarray(rankings)[...,np.argsort(reference)]
+
+def spearman(scores,reference,method='average'):
+    '''
+    Calculate the Spearman correlation between the rankings of the rows of `scores` and the ranking of `reference`.
+
+    Parameters
+    ==========
+    `scores`: Array of scores (or rankings) of shape (n_solutions,) or (n_rankings,n_solutions).
+    `reference`: Array of scores (or ranking) of shape (n_solutions,).
+    `method`: Method of `rank` used to rank both inputs. With 'average' the result is the same as with "scipy.stats.spearmanr",
+    and with 'ordinal' the same as applying "scipy.stats.spearmanr" to the rankings obtained by `AuxiliaryFunctions.from_scores_to_ranking`.
+
+    Returns
+    =======
+    `correlation`: A float if `scores` has one dimension and an array of shape (n_rankings,) otherwise (nan for the constant rankings).
+    '''
+    ranking=rank(scores,method).astype(float)
+    reference_ranking=rank(reference,method).astype(float)
+
+    ranking-=ranking.mean(axis=-1,keepdims=True)
+    reference_ranking-=reference_ranking.mean()
+    with np.errstate(divide='ignore',invalid='ignore'):
+        correlation=(ranking@reference_ranking)/np.sqrt(np.sum(ranking**2,axis=-1)*np.sum(reference_ranking**2))
+    correlation=np.clip(correlation,-1,1)
+    return float(correlation) if correlation.ndim==0 else correlation
+
+def kendall(scores,reference):
+    '''
+    Calculate the Kendall correlation (tau-b, the variant that accounts for ties, as "scipy.stats.kendalltau") between the
+    rankings of the rows of `scores` and the ranking of `reference`. The pairs of solutions are compared at once, so the
+    memory used grows with n_rankings*n_solutions**2.
+
+    Parameters
+    ==========
+    `scores`: Array of scores (or rankings) of shape (n_solutions,) or (n_rankings,n_solutions).
+    `reference`: Array of scores (or ranking) of shape (n_solutions,).
+
+    Returns
+    =======
+    `correlation`: A float if `scores` has one dimension and an array of shape (n_rankings,) otherwise (nan for the constant rankings).
+    '''
+    scores=np.asarray(scores,dtype=float)
+    reference=np.asarray(reference,dtype=float)
+
+    # Order of each pair of solutions (1, -1 or 0 if they are tied).
+    pair_signs=np.sign(scores[...,:,None]-scores[...,None,:])
+    reference_pair_signs=np.sign(reference[:,None]-reference[None,:])
+
+    with np.errstate(divide='ignore',invalid='ignore'):
+        correlation=np.sum(pair_signs*reference_pair_signs,axis=(-2,-1))/np.sqrt(np.sum(pair_signs**2,axis=(-2,-1))*np.sum(reference_pair_signs**2))
+    correlation=np.clip(correlation,-1,1)
+    return float(correlation) if correlation.ndim==0 else correlation
@@ -0,0 +1,423 @@
+'''
+This module defines the columnar store of the results of the experiments, an alternative to writing (and parsing again)
+one CSV file per run. The databases are stored as Parquet (or Arrow IPC) files with typed columns, partitioned in directories
+by problem, experiment, heuristic, cost and seed (hive layout, `problem=.../experiment=.../heuristic=.../cost=.../seed=...`): ::
+
+    from results_store import ResultsStore
+
+    store=ResultsStore('results/store')
+
+    # Append the rows of a run (a new file is written in the partition of each seed, the existing files are never rewritten).
+    store.append(df,problem='WindFLO',experiment='OptimalAccuracyAnalysis',heuristic='II')
+
+    # Read only the partitions and rows of interest (the filters are pushed down to the files, which are memory-mapped).
+    df=store.read(problem='WindFLO',experiment='OptimalAccuracyAnalysis',heuristic='II',filters=[('heuristic_param','==','[5, 3]')])
+
+The runs can also be streamed to the store with `RunWriter`, which writes the rows of a run in batches while it is executed 
+and marks its partition as complete when it finishes, so that an interrupted experiment can be resumed executing only the 
+runs that were not completed: ::
+
+    writer=RunWriter(store,columns,problem='WindFLO',experiment='ConstantAnalysis',cost=0.5,seed=2)
+    for n_gen in range(n_generations):
+        writer.append(row)
+    writer.close(fingerprint)
+
+    # Later, only the runs without a complete partition are executed again.
+    if store.complete_fingerprint('WindFLO','ConstantAnalysis',cost=0.5,seed=2)!=fingerprint:
+        store.discard('WindFLO','ConstantAnalysis',cost=0.5,seed=2)
+        ...
+
+The Parquet and Arrow IPC formats need pyarrow, which is only imported when they are used (the rest of the library does not 
+depend on it). The CSV format (used by OPTECOT for the checkpoints of the executions when no store is given) only needs pandas.
+'''
+
+#==================================================================================================
+# LIBRARIES
+#==================================================================================================
+import os
+import time
+import uuid
+import operator
+from urllib.parse import quote, unquote
+import numpy as np
+import pandas as pd
+
+#==================================================================================================
+# CLASSES
+#==================================================================================================
+class ResultsStore:
+
+    '''
+    This class defines a columnar store of databases partitioned by problem, experiment, heuristic, cost and seed. The writes
+    are append-only (each call writes new files, atomically renamed when complete) and the reads select the partitions by their
+    path, push down the rest of the filters to the scan of the files and memory-map them. A partition can be marked as complete 
+    (with a fingerprint of the settings that produced it), which allows to resume the experiments that were interrupted.
+    '''
+
+    partition_keys=['problem','experiment','heuristic','cost','seed']
+    null_partition='__HIVE_DEFAULT_PARTITION__'
+    extensions={'parquet':'.parquet','ipc':'.arrow','csv':'.csv'}
+    complete_marker='_COMPLETE'
+    operators={'==':operator.eq,'!=':operator.ne,'<':operator.lt,'<=':operator.le,'>':operator.gt,'>=':operator.ge}
+
+    def __init__(self,root,format='parquet'):
+        '''
+        Parameters
+        ==========
+        `root`: Directory of the store (it is created if it does not exist).\n
+        `format`: Format of the files, `'parquet'` (compressed), `'ipc'` (Arrow IPC, uncompressed, read without copies when it is
+        memory-mapped) or `'csv'` (without pyarrow, the filters are applied after reading the files). By default `'parquet'`.
+        '''
+        if format not in ResultsStore.extensions:
+            raise ValueError("The format of the results store must be 'parquet', 'ipc' or 'csv', but '"+str(format)+"' was given.")
+        self.root=os.path.abspath(root)
+        self.format=format
+        os.makedirs(self.root,exist_ok=True)
+
+    @staticmethod
+    def import_pyarrow():
+        '''Import pyarrow (only when the store is used).'''
+        try:
+            import pyarrow
+            import pyarrow.dataset
+            import pyarrow.fs
+            import pyarrow.parquet
+            import pyarrow.feather
+            import pyarrow.ipc
+        except ImportError as error:
+            raise ImportError('The results store requires pyarrow, which can be installed with "pip install pyarrow".') from error
+        return pyarrow
+
+    @staticmethod
+    def partition_schema():
+        '''Types of the partition keys.'''
+        pa=ResultsStore.import_pyarrow()
+        return pa.schema([('problem',pa.string()),('experiment',pa.string()),('heuristic',pa.string()),('cost',pa.float64()),('seed',pa.int64())])
+
+    @staticmethod
+    def partition_value(key,value):
+        '''Text of the value of a partition key in the name of its directory.'''
+        if value is None or (isinstance(value,float) and np.isnan(value)):
+            return ResultsStore.null_partition
+        if key=='cost':
+            return quote(repr(float(value)),safe='')
+        if key=='seed':
+            return str(int(value))
+        return quote(str(value),safe='')
+
+    def partition_path(self,problem,experiment,heuristic=None,cost=None,seed=None):
+        '''Directory of a partition.'''
+        values={'problem':problem,'experiment':experiment,'heuristic':heuristic,'cost':cost,'seed':seed}
+        return os.path.join(self.root,*[key+'='+ResultsStore.partition_value(key,values[key]) for key in ResultsStore.partition_keys])
+
+    def append(self,df,problem,experiment,heuristic=None,cost=None,seed=None,seed_column='seed'):
+        '''
+        Append the rows of a database to the store.
+
+        Parameters
+        ==========
+        `df`: Database (data frame) to be appended.\n
+        `problem`, `experiment`, `heuristic`, `cost`: Values of the partition keys of all the rows (`heuristic` and `cost` can be None).\n
+        `seed`: Seed of all the rows. By default None, the rows are split by the values of the column `seed_column` (if the database has it),
+        which is stored as the partition key `seed`.\n
+        `seed_column`: Name of the column with the seed of each row (by default `'seed'`).
+
+        Return
+        ======
+        List with the paths of the files written.
+        '''
+        if seed is None and seed_column in df.columns:
+            groups=[(group_seed,df_seed.drop(columns=[seed_column])) for group_seed,df_seed in df.groupby(seed_column,sort=True)]
+        else:
+            groups=[(seed,df.drop(columns=[seed_column]) if seed_column in df.columns else df)]
+
+        list_paths=[]
+        for group_seed,df_seed in groups:
+            path,aux_path=self.new_file_path(problem,experiment,heuristic,cost,group_seed)
+            if self.format=='csv':
+                df_seed.to_csv(aux_path,index=False)
+            else:
+                pa=ResultsStore.import_pyarrow()
+                table=pa.Table.from_pandas(ResultsStore.typed_columns(df_seed),preserve_index=False)
+                if self.format=='parquet':
+                    pa.parquet.write_table(table,aux_path)
+                else:
+                    pa.feather.write_feather(table,aux_path,compression='uncompressed')
+            os.replace(aux_path,path)
+            list_paths.append(path)
+
+        return list_paths
+
+    def new_file_path(self,problem,experiment,heuristic=None,cost=None,seed=None):
+        '''
+        Return the path of a new file of a partition and the hidden path where it is written. The file is renamed when it is complete, 
+        so an interrupted write is never read. The names start with the time of the write, so the files of a partition are read in the 
+        order in which they were appended.
+        '''
+        directory=self.partition_path(problem,experiment,heuristic,cost,seed)
+        os.makedirs(directory,exist_ok=True)
+        name='part-'+str(time.time_ns())+'-'+uuid.uuid4().hex[:8]+ResultsStore.extensions[self.format]
+        return os.path.join(directory,name),os.path.join(directory,'.'+name+'.tmp')
+
+    def mark_complete(self,problem,experiment,heuristic=None,cost=None,seed=None,fingerprint=''):
+        '''Mark a partition as complete, storing the `fingerprint` of the settings with which its rows were obtained.'''
+        directory=self.partition_path(problem,experiment,heuristic,cost,seed)
+        os.makedirs(directory,exist_ok=True)
+        aux_path=os.path.join(directory,'.'+ResultsStore.complete_marker+'.tmp')
+        with open(aux_path,'w') as file:
+            file.write(fingerprint)
+        os.replace(aux_path,os.path.join(directory,ResultsStore.complete_marker))
+
+    def complete_fingerprint(self,problem,experiment,heuristic=None,cost=None,seed=None):
+        '''Return the fingerprint stored when the partition was marked as complete (None if it is not complete).'''
+        path=os.path.join(self.partition_path(problem,experiment,heuristic,cost,seed),ResultsStore.complete_marker)
+        if not os.path.isfile(path):
+            return None
+        with open(path) as file:
+            return file.read()
+
+    def discard(self,problem,experiment,heuristic=None,cost=None,seed=None):
+        '''
+        Delete the files of a partition (including the ones being written and the mark of complete partition). It is used to remove 
+        the rows of an interrupted run before executing it again.
+        '''
+        directory=self.partition_path(problem,experiment,heuristic,cost,seed)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if os.path.isfile(os.path.join(directory,name)):
+                    os.remove(os.path.join(directory,name))
+
+    def append_csv(self,path,problem,experiment,heuristic=None,cost=None,seed_column='seed',**kwargs):
+        '''Append the database of a CSV file (read with `pd.read_csv(path,index_col=0,**kwargs)`) to the store, see `append`.'''
+        return self.append(pd.read_csv(path,index_col=0,**kwargs),problem,experiment,heuristic=heuristic,cost=cost,seed_column=seed_column)
+
+    @staticmethod
+    def typed_columns(df):
+        '''Convert the columns with values of different types (which have no column type) to text.'''
+        df=df.copy()
+        for column in df.columns:
+            if df[column].dtype==object:
+                types=set(type(value) for value in df[column] if value is not None)
+                if len(types)>1 and not types<={int,float,np.int64,np.float64}:
+                    df[column]=df[column].map(lambda value: None if value is None else str(value))
+        return df
+
+    def files(self,complete_only=False,**partition):
+        '''
+        List the files of the partitions selected by `partition` (values of the partition keys, given as a value, a list of values or
+        None for the rows without value). Only the directories that match the filter are traversed. If `complete_only` is True, only 
+        the files of the partitions marked as complete are listed.
+        '''
+        directories=[self.root]
+        for key in ResultsStore.partition_keys:
+            if key in partition:
+                values=partition[key] if isinstance(partition[key],(list,tuple,set)) else [partition[key]]
+                names=[key+'='+ResultsStore.partition_value(key,value) for value in values]
+                directories=[os.path.join(directory,name) for directory in directories for name in names if os.path.isdir(os.path.join(directory,name))]
+            else:
+                directories=[os.path.join(directory,name) for directory in directories if os.path.isdir(directory)
+                             for name in sorted(os.listdir(directory)) if name.startswith(key+'=')]
+
+        if complete_only:
+            directories=[directory for directory in directories if os.path.isfile(os.path.join(directory,ResultsStore.complete_marker))]
+        extension=ResultsStore.extensions[self.format]
+        return [os.path.join(directory,name) for directory in directories for name in sorted(os.listdir(directory))
+                if name.endswith(extension) and not name.startswith('.')]
+
+    def partition_values(self,directory):
+        '''Return the dictionary with the values of the partition keys of a directory of the store.'''
+        values={}
+        for name in os.path.relpath(directory,self.root).split(os.sep):
+            key,value=name.split('=',1)
+            values[key]=None if value==ResultsStore.null_partition else unquote(value)
+        for key,type_value in [('cost',float),('seed',int)]:
+            if values[key] is not None:
+                values[key]=type_value(values[key])
+        return values
+
+    def partitions(self,complete_only=False,**partition):
+        '''
+        Return a data frame with the values of the partition keys of the partitions (with at least one file) selected by `partition`, 
+        and a column `complete` that indicates if they are marked as complete.
+        '''
+        rows=[]
+        for directory in sorted(set(os.path.dirname(path) for path in self.files(complete_only,**partition))):
+            row=self.partition_values(directory)
+            row['complete']=os.path.isfile(os.path.join(directory,ResultsStore.complete_marker))
+            rows.append(row)
+        df=pd.DataFrame(rows,columns=ResultsStore.partition_keys+['complete'])
+        df['cost']=df['cost'].astype(float)
+        df['seed']=pd.array(df['seed'].astype(float),dtype='Int64')
+        return df
+
+    def dataset(self,complete_only=False,**partition):
+        '''Return the pyarrow dataset formed by the files (memory-mapped) of the partitions selected by `partition`.'''
+        pa=ResultsStore.import_pyarrow()
+        return pa.dataset.dataset(self.files(complete_only,**partition),format='parquet' if self.format=='parquet' else 'ipc',
+                                  filesystem=pa.fs.LocalFileSystem(use_mmap=True),partition_base_dir=self.root,
+                                  partitioning=pa.dataset.partitioning(ResultsStore.partition_schema(),flavor='hive'))
+
+    @staticmethod
+    def filter_mask(df,filters):
+        '''Compute the mask of the rows of a data frame that satisfy a list of filters `(column, operator, value)`, see `filter_expression`.'''
+        mask=pd.Series(True,index=df.index)
+        for column,operator_name,value in filters:
+            if operator_name in ['in','not in']:
+                condition=df[column].isin(list(value))
+                condition=condition if operator_name=='in' else ~condition
+            elif operator_name not in ResultsStore.operators:
+                raise ValueError("Unknown operator '"+str(operator_name)+"' in the filters of the results store.")
+            elif value is None and operator_name in ['==','!=']:
+                condition=df[column].isna() if operator_name=='==' else df[column].notna()
+            else:
+                condition=ResultsStore.operators[operator_name](df[column],value)
+            mask&=condition
+        return mask
+
+    @staticmethod
+    def filter_expression(filters):
+        '''Build the pyarrow expression of a list of filters `(column, operator, value)` (the operators are ==, !=, <, <=, >, >=, in and not in).'''
+        pa=ResultsStore.import_pyarrow()
+        expression=None
+        for column,operator,value in filters:
+            field=pa.dataset.field(column)
+            if operator=='==':
+                condition=field.is_null() if value is None else field==value
+            elif operator=='!=':
+                condition=field.is_valid() if value is None else field!=value
+            elif operator=='<':
+                condition=field<value
+            elif operator=='<=':
+                condition=field<=value
+            elif operator=='>':
+                condition=field>value
+            elif operator=='>=':
+                condition=field>=value
+            elif operator=='in':
+                condition=field.isin(list(value))
+            elif operator=='not in':
+                condition=~field.isin(list(value))
+            else:
+                raise ValueError("Unknown operator '"+str(operator)+"' in the filters of the results store.")
+            expression=condition if expression is None else expression&condition
+        return expression
+
+    def read(self,columns=None,filters=None,sort_by=None,seed_column='seed',complete_only=False,**partition):
+        '''
+        Read a database from the store.
+
+        Parameters
+        ==========
+        `columns`: List of the columns to be read (by default None, all the columns, including the partition keys).\n
+        `filters`: List of filters `(column, operator, value)` on the rows, or a pyarrow expression, pushed down to the scan of the
+        files (by default None).\n
+        `sort_by`: Column or list of columns by which the rows are sorted (by default None, the rows are returned partition by partition,
+        in the order in which they were appended).\n
+        `seed_column`: Name given to the partition key `seed` in the database returned (by default `'seed'`).\n
+        `complete_only`: True or False if only the partitions marked as complete are read or all of them (by default False).\n
+        `partition`: Values of the partition keys of the partitions to be read (a value, a list of values or None), for example
+        `problem='WindFLO',cost=[0.5,1.0]`.
+
+        Return
+        ======
+        The database (data frame), with a new index (empty if there is no file in the partitions).
+        '''
+        if columns is not None:
+            columns=['seed' if column==seed_column else column for column in columns]
+
+        if self.format=='csv':
+            files=self.files(complete_only,**partition)
+            if len(files)==0:
+                return pd.DataFrame(columns=columns)
+            df=pd.concat([pd.read_csv(path,float_precision='round_trip').assign(**self.partition_values(os.path.dirname(path))) for path in files],ignore_index=True)
+            if filters is not None:
+                df=df[ResultsStore.filter_mask(df,filters)]
+            if columns is not None:
+                df=df[columns]
+        else:
+            pa=ResultsStore.import_pyarrow()
+            dataset=self.dataset(complete_only,**partition)
+            if len(dataset.files)==0:
+                return pd.DataFrame(columns=columns)
+            if filters is not None and not isinstance(filters,pa.dataset.Expression):
+                filters=ResultsStore.filter_expression(filters)
+            df=dataset.to_table(columns=columns,filter=filters).to_pandas()
+
+        if seed_column!='seed':
+            df=df.rename(columns={'seed':seed_column})
+        if sort_by is not None:
+            df=df.sort_values(sort_by,kind='stable')
+        return df.reset_index(drop=True)
+
+
+class RunWriter:
+
+    '''
+    This class defines the streaming writer of the rows of a run (a partition of a `ResultsStore`). The rows are buffered and 
+    written in batches of `batch_size` rows to a single file (a row group per batch in Parquet, a record batch in Arrow IPC and 
+    appended lines in CSV), which keeps a hidden name until the run is closed. When it is closed, the file is renamed and the 
+    partition is marked as complete, so the rows of an interrupted run are never read as if it had finished.
+    '''
+
+    def __init__(self,store,columns,problem,experiment,heuristic=None,cost=None,seed=None,batch_size=100,seed_column='seed'):
+        '''
+        Parameters
+        ==========
+        `store`: `ResultsStore` where the rows are written.\n
+        `columns`: List with the names of the columns of the rows (the column `seed_column`, if it is among them, is not written, 
+        since it is the partition key `seed`).\n
+        `problem`, `experiment`, `heuristic`, `cost`, `seed`: Values of the partition keys of the run.\n
+        `batch_size`: Number of rows buffered before being written (by default 100).
+        '''
+        self.store=store
+        self.columns=columns
+        self.partition=(problem,experiment,heuristic,cost,seed)
+        self.batch_size=batch_size
+        self.seed_column=seed_column
+        self.rows=[]
+        self.path=None
+        self.aux_path=None
+        self.file_writer=None
+        self.schema=None
+        self.n_written=0
+
+    def append(self,row):
+        '''Add the row of a generation, writing the buffered rows if the batch is complete.'''
+        self.rows.append(row)
+        if len(self.rows)>=self.batch_size:
+            self.flush()
+
+    def flush(self):
+        '''Write the buffered rows.'''
+        if len(self.rows)==0:
+            return
+        df=pd.DataFrame(self.rows,columns=self.columns)
+        if self.seed_column in df.columns:
+            df=df.drop(columns=[self.seed_column])
+        self.rows=[]
+
+        if self.path is None:
+            self.path,self.aux_path=self.store.new_file_path(*self.partition)
+        if self.store.format=='csv':
+            df.to_csv(self.aux_path,mode='a',header=self.n_written==0,index=False)
+        else:
+            # The types of the columns are the ones of the first batch.
+            pa=ResultsStore.import_pyarrow()
+            table=pa.Table.from_pandas(ResultsStore.typed_columns(df),schema=self.schema,preserve_index=False)
+            if self.file_writer is None:
+                self.schema=table.schema
+                if self.store.format=='parquet':
+                    self.file_writer=pa.parquet.ParquetWriter(self.aux_path,self.schema)
+                else:
+                    self.file_writer=pa.ipc.new_file(self.aux_path,self.schema)
+            self.file_writer.write_table(table)
+        self.n_written+=len(df)
+
+    def close(self,fingerprint=''):
+        '''Write the remaining rows, rename the file and mark the partition as complete with `fingerprint`.'''
+        self.flush()
+        if self.file_writer is not None:
+            self.file_writer.close()
+        if self.path is not None:
+            os.replace(self.aux_path,self.path)
+        self.store.mark_complete(*self.partition,fingerprint=fingerprint)